@@ -1,8 +1,9 @@
 import argparse
-import os
 from loguru import logger
 
+from src.aws.s3_helpers.dataset_packer import PackedDatasetStore
 from src.aws.s3_helpers.s3_helper import S3Helpers
+from src.aws.s3_helpers.s3_sync import S3SyncEngine
 
 BUCKET_NAME = "gata-matrix-data"
 RAW_DATA_PREFIX = "raw_data"
@@ -26,30 +27,42 @@ class GetDataFromS3:
         self.local_directory = local_directory
 
     def get(self):
-        bucket_objects = self.s3_helper.s3_client.list_objects_v2(
-            Bucket=BUCKET_NAME, Prefix=self.s3_helper.prefix
+        sync_engine = S3SyncEngine(
+            self.s3_helper.bucket,
+            self.s3_helper.prefix,
+            s3_client=self.s3_helper.s3_client,
         )
-        for obj in bucket_objects.get("Contents", []):
-            logger.info(f"Downloading {obj['Key']}")
-            file_name = os.path.basename(obj["Key"])
-            self.s3_helper.download_file_if_not_local(file_name, self.local_directory)
+        result = sync_engine.download(self.local_directory)
+        logger.info(
+            f"Downloaded {len(result.transferred)} files, "
+            f"skipped {len(result.skipped)} up-to-date files"
+        )
+        if result.failed:
+            raise RuntimeError(f"Failed to download {len(result.failed)} files")
 
 
-def orchestrate_data_fetching(data_folder):
+def orchestrate_data_fetching(data_folder, packed=False, pattern=None):
     if data_folder == "data":
         logger.info(f"Fetching data from data folder raw_data and processed_data")
-        fetch_data(s3_helpers_raw_data, PATH_TO_RAW)
-        fetch_data(s3_helpers_processed_data, PATH_TO_PROCESSED)
+        fetch_data(s3_helpers_raw_data, PATH_TO_RAW, packed, pattern)
+        fetch_data(s3_helpers_processed_data, PATH_TO_PROCESSED, packed, pattern)
     elif data_folder == "data2":
         logger.info("Fetching data from data2 folder raw_data_2 and processed_data_2")
-        fetch_data(s3_helpers_raw_data_2, PATH_TO_RAW_2)
-        fetch_data(s3_helpers_processed_data_2, PATH_TO_PROCESSED_2)
+        fetch_data(s3_helpers_raw_data_2, PATH_TO_RAW_2, packed, pattern)
+        fetch_data(s3_helpers_processed_data_2, PATH_TO_PROCESSED_2, packed, pattern)
 
 
-def fetch_data(s3_helper, local_directory):
+def fetch_data(s3_helper, local_directory, packed=False, pattern=None):
     logger.info(
         f"Fetching raw data from S3 to {local_directory} from s3 bucket {s3_helper.prefix}"
     )
+    if packed:
+        store = PackedDatasetStore(
+            s3_helper.bucket, s3_helper.prefix, s3_client=s3_helper.s3_client
+        )
+        store.pull(local_directory, pattern=pattern)
+        return
+
     data_fetcher = GetDataFromS3(s3_helper, local_directory)
     data_fetcher.get()
 
@@ -61,8 +74,18 @@ def main():
         choices=["data", "data2"],
         help="The folder to fetch data from. Options: data, data2",
     )
+    parser.add_argument(
+        "--packed",
+        action="store_true",
+        help="Fetch compressed shards instead of individual objects",
+    )
+    parser.add_argument(
+        "--pattern",
+        default=None,
+        help="Only fetch files matching this glob, e.g. 'fall_*' (packed mode)",
+    )
     args = parser.parse_args()
-    orchestrate_data_fetching(args.data_folder)
+    orchestrate_data_fetching(args.data_folder, args.packed, args.pattern)
 
 
 if __name__ == "__main__":
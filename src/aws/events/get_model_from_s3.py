@@ -4,6 +4,7 @@ import re
 from typing import List
 from loguru import logger
 
+from src.aws.s3_helpers.model_registry import ModelRegistry
 from src.aws.s3_helpers.s3_helper import S3Helpers
 
 
@@ -15,9 +16,16 @@ class GetDataFromS3:
         self.local_model_directory = "models/model"
         self.local_scaler_directory = "models/scaler"
         self.s3_helper = S3Helpers(self.bucket, self.model_prefix)
+        self.model_registry = ModelRegistry(
+            self.bucket, s3_client=self.s3_helper.s3_client
+        )
 
     def get(self) -> None:
         try:
+            logger.info("Fetching current model version from the model registry")
+            if self.model_registry.fetch_current() is not None:
+                return
+
             logger.info("Fetching model data from S3")
             model_contents = self._fetch_bucket_objects(self.model_prefix)
             if model_contents:
@@ -1,8 +1,12 @@
 import os
 import argparse
+from typing import Optional
+
 from loguru import logger
 
+from src.aws.s3_helpers.dataset_packer import PackedDatasetStore
 from src.aws.s3_helpers.s3_helper import S3Helpers
+from src.aws.s3_helpers.s3_sync import RemoteIndex, S3SyncEngine, UploadPlanner
 
 BUCKET_NAME = "gata-matrix-data"
 RAW_DATA_PREFIX = "raw_data"
@@ -20,42 +24,83 @@ s3_helpers_processed_data_2 = S3Helpers(BUCKET_NAME, PROCESSED_DATA_2_PREFIX)
 
 
 class SaveDataToS3:
-    def __init__(self, data_path, s3_helper: S3Helpers):
+    def __init__(
+        self,
+        data_path,
+        s3_helper: S3Helpers,
+        remote_index: Optional[RemoteIndex] = None,
+    ):
         self.data_path = data_path
         self.s3_helper = s3_helper
+        self.remote_index = remote_index
 
     def save(self):
         filename = os.path.basename(self.data_path)
-        if not self.s3_helper.check_file_exists_in_s3_bucket(filename):
+        sync_engine = S3SyncEngine(
+            self.s3_helper.bucket,
+            self.s3_helper.prefix,
+            s3_client=self.s3_helper.s3_client,
+        )
+        if self.remote_index is None:
+            self.remote_index = sync_engine.build_remote_index()
+
+        plan = UploadPlanner(self.remote_index).plan(
+            {sync_engine.key_for(filename): self.data_path}
+        )
+        if plan.uploads:
             logger.info(f"Uploading {filename} to S3")
-            self.s3_helper.upload_file(self.data_path, filename)
+            result = sync_engine.execute_upload_plan(plan)
+            if result.failed:
+                raise RuntimeError(f"Failed to upload {filename}")
         else:
             logger.info(f"{filename} already exists in S3")
 
 
-def process_data(path_to_raw, path_to_processed, s3_helpers_raw, s3_helpers_processed):
+def sync_directory(
+    local_directory: str, s3_helper: S3Helpers, packed: bool = False
+) -> None:
+    if packed:
+        store = PackedDatasetStore(
+            s3_helper.bucket, s3_helper.prefix, s3_client=s3_helper.s3_client
+        )
+        result = store.push(local_directory)
+        if result.failed:
+            raise RuntimeError(f"Failed to upload {len(result.failed)} shards")
+        return
+
+    sync_engine = S3SyncEngine(
+        s3_helper.bucket, s3_helper.prefix, s3_client=s3_helper.s3_client
+    )
+    result = sync_engine.upload(local_directory)
+    logger.info(
+        f"Uploaded {len(result.transferred)} files from {local_directory}, "
+        f"skipped {len(result.skipped)} unchanged files"
+    )
+    if result.failed:
+        raise RuntimeError(f"Failed to upload {len(result.failed)} files")
+
+
+def process_data(
+    path_to_raw,
+    path_to_processed,
+    s3_helpers_raw,
+    s3_helpers_processed,
+    packed=False,
+):
     try:
         logger.info("Saving data to S3")
-        for file_name in os.listdir(path_to_raw):
-            logger.info(f"Uploading {file_name} to S3")
-            file_path = os.path.join(path_to_raw, file_name)
-            save_data_to_s3 = SaveDataToS3(file_path, s3_helpers_raw)
-            save_data_to_s3.save()
+        sync_directory(path_to_raw, s3_helpers_raw, packed)
     except Exception as e:
         logger.error(f"Error saving data to S3: {e}")
 
     try:
         logger.info("Saving processed data to S3")
-        for file_name in os.listdir(path_to_processed):
-            logger.info(f"Uploading {file_name} to S3")
-            file_path = os.path.join(path_to_processed, file_name)
-            save_data_to_s3 = SaveDataToS3(file_path, s3_helpers_processed)
-            save_data_to_s3.save()
+        sync_directory(path_to_processed, s3_helpers_processed, packed)
     except Exception as e:
         logger.error(f"Error saving processed data to S3: {e}")
 
 
-def main(folder):
+def main(folder, packed=False):
     logger.info("Saving data to S3")
 
     if folder == "data":
@@ -64,6 +109,7 @@ def main(folder):
             PATH_TO_PROCESSED,
             s3_helpers_raw_data,
             s3_helpers_processed_data,
+            packed,
         )
     elif folder == "data2":
         process_data(
@@ -71,6 +117,7 @@ def main(folder):
             PATH_TO_PROCESSED_2,
             s3_helpers_raw_data_2,
             s3_helpers_processed_data_2,
+            packed,
         )
 
     logger.info("Data saving process completed successfully")
@@ -79,5 +126,10 @@ def main(folder):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Upload data to S3")
     parser.add_argument("folder", help="Folder to process ('data' or 'data2')")
+    parser.add_argument(
+        "--packed",
+        action="store_true",
+        help="Upload compressed, size-bounded shards instead of individual files",
+    )
     args = parser.parse_args()
-    main(args.folder)
+    main(args.folder, args.packed)
@@ -1,7 +1,10 @@
+import json
 import os
 from loguru import logger
 
+from src.aws.s3_helpers.model_registry import ModelRegistry
 from src.aws.s3_helpers.s3_helper import S3Helpers
+from src.aws.s3_helpers.s3_sync import S3SyncEngine, UploadPlanner
 
 
 class SaveModelToS3:
@@ -12,6 +15,12 @@ class SaveModelToS3:
         self.model_prefix = "model"
         self.scaler_prefix = "scaler"
         self.s3_helper = S3Helpers(self.bucket, self.model_prefix)
+        self.sync_engine = S3SyncEngine(
+            self.bucket, self.model_prefix, s3_client=self.s3_helper.s3_client
+        )
+        self.model_registry = ModelRegistry(
+            self.bucket, s3_client=self.s3_helper.s3_client
+        )
 
     def save(self) -> None:
         try:
@@ -21,10 +30,26 @@ class SaveModelToS3:
             local_model_path = self._get_path(
                 self.model_directory, "fall_detection_model.keras", formatted_date
             )
-            self._upload_file(local_model_path, self.model_prefix, formatted_date)
-
             local_scaler_path = self._get_path(self.scaler_directory, "scaler.pkl", "")
-            self._upload_file(local_scaler_path, self.scaler_prefix, "")
+            self._upload_files(
+                {
+                    self._get_s3_key(
+                        local_model_path, self.model_prefix, formatted_date
+                    ): local_model_path,
+                    self._get_s3_key(
+                        local_scaler_path, self.scaler_prefix, ""
+                    ): local_scaler_path,
+                }
+            )
+            schema_path = os.path.join(
+                os.path.dirname(local_model_path), "feature_schema.json"
+            )
+            self.model_registry.publish(
+                local_model_path,
+                local_scaler_path,
+                metrics=self._load_metrics(os.path.dirname(local_model_path)),
+                schema_path=schema_path if os.path.exists(schema_path) else None,
+            )
         except Exception as e:
             logger.error(f"Error saving to S3: {e}")
             raise e
@@ -38,20 +63,33 @@ class SaveModelToS3:
         )
         return path
 
-    def _upload_file(self, local_path: str, prefix: str, formatted_date: str) -> None:
+    def _load_metrics(self, model_directory: str) -> dict:
+        metrics_path = os.path.join(model_directory, "metrics.json")
+        if not os.path.exists(metrics_path):
+            logger.warning(f"No metrics found at {metrics_path}")
+            return {}
+        with open(metrics_path, "r") as file:
+            return json.load(file)
+
+    def _get_s3_key(self, local_path: str, prefix: str, formatted_date: str) -> str:
         filename = os.path.basename(local_path)
         file_path_to_s3 = (
             f"{prefix}/{formatted_date}/{filename}"
             if formatted_date
             else f"{prefix}/{filename}"
         )
+        return self.sync_engine.key_for(file_path_to_s3)
+
+    def _upload_files(self, files: dict) -> None:
+        logger.info(f"Checking which of {len(files)} files already exist in S3")
+        remote_index = self.sync_engine.build_remote_index()
+        plan = UploadPlanner(remote_index).plan(files)
+        for key in plan.unchanged:
+            logger.info(f"{key} already exists in S3")
 
-        logger.info(f"Checking if {file_path_to_s3} exists in S3")
-        if not self.s3_helper.check_file_exists_in_s3_bucket(file_path_to_s3):
-            logger.info(f"Uploading {filename} to S3")
-            self.s3_helper.upload_file(local_path, file_path_to_s3)
-        else:
-            logger.info(f"{file_path_to_s3} already exists in S3")
+        result = self.sync_engine.execute_upload_plan(plan)
+        if result.failed:
+            raise RuntimeError(f"Failed to upload {result.failed} to S3")
 
 
 def main():
@@ -0,0 +1,306 @@
+import fnmatch
+import gzip
+import hashlib
+import io
+import json
+import math
+import os
+import tarfile
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from loguru import logger
+
+from src.aws.s3_helpers.s3_helper import get_s3_client
+from src.aws.s3_helpers.s3_sync import DEFAULT_MAX_WORKERS, S3SyncEngine, SyncResult
+
+INDEX_FILE_NAME = "index.json"
+PACKED_ROOT_PREFIX = "packed"
+DEFAULT_MAX_SHARD_BYTES = 64 * 1024 * 1024
+COMPRESS_LEVEL = 6
+MAX_KEYS_PER_DELETE = 1000
+
+
+def packed_prefix_for(prefix: str) -> str:
+    return f"{PACKED_ROOT_PREFIX}/{prefix.strip('/')}"
+
+
+def _sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _shard_count(total_bytes: int, max_shard_bytes: int) -> int:
+    needed = max(1, math.ceil(total_bytes / max_shard_bytes))
+    return 1 << (needed - 1).bit_length()
+
+
+def _shard_of(file_name: str, shard_count: int) -> int:
+    digest = hashlib.blake2b(file_name.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shard_count
+
+
+class DatasetPacker:
+    """Bundles the files of a directory into gzip-compressed tar shards.
+
+    Each file goes to the shard picked by a hash of its name, so adding,
+    changing or removing a file only rewrites the shard holding it. The shard
+    count is the power of two that keeps the average shard within
+    ``max_shard_bytes``; when it grows, each file either stays or moves to one
+    new shard. Shards are byte-for-byte reproducible, so re-packing an
+    unchanged directory produces shards with the same ETag and the sync
+    engine skips them.
+    """
+
+    def __init__(
+        self,
+        local_directory: str,
+        staging_directory: str,
+        max_shard_bytes: int = DEFAULT_MAX_SHARD_BYTES,
+    ):
+        self.local_directory = local_directory
+        self.staging_directory = staging_directory
+        self.max_shard_bytes = max_shard_bytes
+
+    def pack(self) -> dict:
+        os.makedirs(self.staging_directory, exist_ok=True)
+        self._clear_staging_directory()
+
+        shards = [
+            self._write_shard(f"shard-{shard_number:05d}.tar.gz", file_names)
+            for shard_number, file_names in sorted(self._group_files().items())
+        ]
+
+        index = {"version": 1, "shards": shards}
+        index_path = os.path.join(self.staging_directory, INDEX_FILE_NAME)
+        with open(index_path, "w") as file:
+            json.dump(index, file, indent=2, sort_keys=True)
+
+        total_files = sum(len(shard["files"]) for shard in shards)
+        logger.info(
+            f"Packed {total_files} files from {self.local_directory} "
+            f"into {len(shards)} shards"
+        )
+        return index
+
+    def _clear_staging_directory(self) -> None:
+        for file_name in os.listdir(self.staging_directory):
+            if file_name.startswith("shard-") or file_name == INDEX_FILE_NAME:
+                os.remove(os.path.join(self.staging_directory, file_name))
+
+    def _group_files(self) -> dict[int, list[str]]:
+        sizes = {}
+        for file_name in sorted(os.listdir(self.local_directory)):
+            local_path = os.path.join(self.local_directory, file_name)
+            if not os.path.isfile(local_path) or file_name.startswith("."):
+                continue
+            sizes[file_name] = os.path.getsize(local_path)
+
+        shard_count = _shard_count(sum(sizes.values()), self.max_shard_bytes)
+        groups = {}
+        for file_name in sizes:
+            groups.setdefault(_shard_of(file_name, shard_count), []).append(file_name)
+        return groups
+
+    def _write_shard(self, shard_name: str, file_names: list[str]) -> dict:
+        shard_path = os.path.join(self.staging_directory, shard_name)
+        files = []
+        with open(shard_path, "wb") as raw_file, gzip.GzipFile(
+            fileobj=raw_file, mode="wb", compresslevel=COMPRESS_LEVEL, mtime=0
+        ) as compressed_file, tarfile.open(
+            fileobj=compressed_file, mode="w", format=tarfile.PAX_FORMAT
+        ) as tar:
+            for file_name in file_names:
+                local_path = os.path.join(self.local_directory, file_name)
+                with open(local_path, "rb") as file:
+                    content = file.read()
+                tar_info = tarfile.TarInfo(name=file_name)
+                tar_info.size = len(content)
+                tar_info.mode = 0o644
+                tar.addfile(tar_info, io.BytesIO(content))
+                files.append(
+                    {
+                        "name": file_name,
+                        "size": len(content),
+                        "sha256": hashlib.sha256(content).hexdigest(),
+                    }
+                )
+
+        return {
+            "name": shard_name,
+            "size": os.path.getsize(shard_path),
+            "sha256": _sha256(shard_path),
+            "files": files,
+        }
+
+
+class PackedDatasetStore:
+    """Uploads packed shards to S3 and fetches only the shards a client needs."""
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str,
+        s3_client=None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ):
+        self.bucket = bucket
+        self.packed_prefix = packed_prefix_for(prefix)
+        self.s3_client = s3_client or get_s3_client()
+        self.max_workers = max_workers
+        self.sync_engine = S3SyncEngine(
+            bucket,
+            self.packed_prefix,
+            s3_client=self.s3_client,
+            max_workers=max_workers,
+        )
+
+    def push(
+        self,
+        local_directory: str,
+        max_shard_bytes: int = DEFAULT_MAX_SHARD_BYTES,
+    ) -> SyncResult:
+        """Packs ``local_directory`` and uploads the changed shards.
+
+        The index is uploaded on its own once every shard is in place, so a
+        client never sees an index naming shards that failed to upload. Shards
+        the new index no longer names are deleted only after it is published.
+        """
+        staging_directory = self._staging_directory_for(local_directory)
+        index = DatasetPacker(
+            local_directory, staging_directory, max_shard_bytes
+        ).pack()
+        result = self.sync_engine.upload(
+            staging_directory, lambda file_name: file_name != INDEX_FILE_NAME
+        )
+        if result.failed:
+            raise ValueError(
+                f"Shards {sorted(result.failed)} failed to upload, "
+                f"{INDEX_FILE_NAME} was not published"
+            )
+        index_result = self.sync_engine.upload(
+            staging_directory, lambda file_name: file_name == INDEX_FILE_NAME
+        )
+        if index_result.failed:
+            raise ValueError(f"Failed to upload {INDEX_FILE_NAME}")
+        result.transferred += index_result.transferred
+        result.skipped += index_result.skipped
+        self._delete_unreferenced_shards(index)
+        logger.info(
+            f"Uploaded {len(result.transferred)} shards to {self.packed_prefix}, "
+            f"skipped {len(result.skipped)} unchanged"
+        )
+        return result
+
+    def _delete_unreferenced_shards(self, index: dict) -> list[str]:
+        referenced = {shard["name"] for shard in index["shards"]}
+        stale = sorted(
+            file_name
+            for file_name in self.sync_engine.list_remote_objects()
+            if file_name.startswith("shard-") and file_name not in referenced
+        )
+        for start in range(0, len(stale), MAX_KEYS_PER_DELETE):
+            batch = stale[start : start + MAX_KEYS_PER_DELETE]
+            response = self.s3_client.delete_objects(
+                Bucket=self.bucket,
+                Delete={
+                    "Objects": [
+                        {"Key": self.sync_engine.key_for(name)} for name in batch
+                    ],
+                    "Quiet": True,
+                },
+            )
+            for error in response.get("Errors", []):
+                logger.warning(
+                    f"Could not delete stale shard {error['Key']}: {error['Message']}"
+                )
+        if stale:
+            logger.info(f"Deleted {len(stale)} shards no longer in {INDEX_FILE_NAME}")
+        return stale
+
+    def fetch_index(self) -> dict:
+        response = self.s3_client.get_object(
+            Bucket=self.bucket, Key=f"{self.packed_prefix}/{INDEX_FILE_NAME}"
+        )
+        return json.loads(response["Body"].read())
+
+    def pull(self, local_directory: str, pattern: Optional[str] = None) -> list[str]:
+        """Downloads and unpacks the shards holding missing or changed files.
+
+        Only files whose name matches ``pattern`` (an fnmatch glob) are
+        considered when given.
+        """
+        os.makedirs(local_directory, exist_ok=True)
+        index = self.fetch_index()
+
+        wanted_shards = []
+        for shard in index["shards"]:
+            wanted = [
+                entry["name"]
+                for entry in shard["files"]
+                if (pattern is None or fnmatch.fnmatch(entry["name"], pattern))
+                and not self._is_local_copy_current(local_directory, entry)
+            ]
+            if wanted:
+                wanted_shards.append((shard, set(wanted)))
+
+        logger.info(
+            f"Fetching {len(wanted_shards)} of {len(index['shards'])} shards "
+            f"from {self.packed_prefix}"
+        )
+        extracted = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for names in executor.map(
+                lambda item: self._fetch_shard(*item, local_directory), wanted_shards
+            ):
+                extracted.extend(names)
+        logger.info(f"Unpacked {len(extracted)} files into {local_directory}")
+        return extracted
+
+    def _is_local_copy_current(self, local_directory: str, entry: dict) -> bool:
+        local_path = os.path.join(local_directory, entry["name"])
+        if not os.path.exists(local_path):
+            return False
+        if os.path.getsize(local_path) != entry["size"]:
+            return False
+        return _sha256(local_path) == entry["sha256"]
+
+    def _fetch_shard(self, shard: dict, wanted: set, local_directory: str) -> list[str]:
+        key = f"{self.packed_prefix}/{shard['name']}"
+        with tempfile.TemporaryDirectory(dir=local_directory) as temporary_directory:
+            shard_path = os.path.join(temporary_directory, shard["name"])
+            self.s3_client.download_file(
+                self.bucket, key, shard_path, Config=self.sync_engine.transfer_config
+            )
+            if _sha256(shard_path) != shard["sha256"]:
+                raise ValueError(f"Checksum mismatch for shard {key}")
+
+            extracted = []
+            with tarfile.open(shard_path, mode="r:gz") as tar:
+                for member in tar:
+                    if (
+                        member.name not in wanted
+                        or os.path.basename(member.name) != member.name
+                    ):
+                        continue
+                    temporary_path = os.path.join(temporary_directory, member.name)
+                    with tar.extractfile(member) as source, open(
+                        temporary_path, "wb"
+                    ) as target:
+                        target.write(source.read())
+                    os.replace(
+                        temporary_path, os.path.join(local_directory, member.name)
+                    )
+                    extracted.append(member.name)
+        return extracted
+
+    @staticmethod
+    def _staging_directory_for(local_directory: str) -> str:
+        directory = os.path.normpath(local_directory)
+        return os.path.join(
+            os.path.dirname(directory), f".{os.path.basename(directory)}_packed"
+        )
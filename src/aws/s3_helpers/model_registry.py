@@ -0,0 +1,210 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from typing import Optional
+
+import botocore
+from loguru import logger
+
+from src.aws.s3_helpers.s3_helper import get_s3_client
+
+REGISTRY_KEY = "model/registry.json"
+OBJECTS_PREFIX = "model/objects"
+LOCAL_MODELS_DIRECTORY = "models"
+ARTIFACT_NAMES = ("model", "scaler", "schema")
+
+
+def sha256_of_file(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """Versioned model artefacts behind a single manifest object in S3.
+
+    Artefacts are stored once under ``model/objects/<sha256>`` and every
+    version in ``model/registry.json`` records the model, its paired scaler
+    and feature schema, their checksums and sizes, and the evaluation metrics
+    of the run.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        s3_client=None,
+        local_directory: str = LOCAL_MODELS_DIRECTORY,
+    ):
+        self.bucket = bucket
+        self.s3_client = s3_client or get_s3_client()
+        self.local_directory = local_directory
+        self.cache_directory = os.path.join(local_directory, "cache")
+        self.versions_directory = os.path.join(local_directory, "versions")
+        self.current_link = os.path.join(local_directory, "current")
+        self.local_manifest_path = os.path.join(local_directory, "registry.json")
+        self.local_etag_path = os.path.join(local_directory, "registry.etag")
+
+    def publish(
+        self,
+        model_path: str,
+        scaler_path: str,
+        metrics: Optional[dict] = None,
+        schema_path: Optional[str] = None,
+    ) -> str:
+        model_artifact = self._upload_artifact(model_path)
+        scaler_artifact = self._upload_artifact(scaler_path)
+        created_at = datetime.now(timezone.utc)
+        version = f"{created_at.strftime('%Y-%m-%d')}-{model_artifact['sha256'][:12]}"
+
+        manifest = self.read_remote_manifest() or {"current": None, "versions": {}}
+        manifest["versions"][version] = {
+            "version": version,
+            "created_at": created_at.isoformat(),
+            "model": model_artifact,
+            "scaler": scaler_artifact,
+            "metrics": metrics or {},
+        }
+        if schema_path is not None:
+            manifest["versions"][version]["schema"] = self._upload_artifact(schema_path)
+        manifest["current"] = version
+        self.s3_client.put_object(
+            Bucket=self.bucket,
+            Key=REGISTRY_KEY,
+            Body=json.dumps(manifest, indent=2, sort_keys=True).encode(),
+            ContentType="application/json",
+        )
+        logger.info(f"Published model version {version}")
+        return version
+
+    def read_remote_manifest(self) -> Optional[dict]:
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=REGISTRY_KEY)
+        except botocore.exceptions.ClientError as e:
+            if e.response["Error"]["Code"] in ("NoSuchKey", "404"):
+                return None
+            raise e
+        return json.loads(response["Body"].read())
+
+    def fetch_current(self) -> Optional[str]:
+        """Makes ``models/current`` point at the registry's current version.
+
+        Returns the local version directory, or None when the bucket has no
+        registry yet. When nothing changed this costs one conditional GET.
+        """
+        manifest = self._fetch_manifest()
+        if manifest is None or not manifest.get("current"):
+            return None
+
+        version = manifest["versions"][manifest["current"]]
+        version_directory = os.path.join(self.versions_directory, version["version"])
+        for artifact_name in ARTIFACT_NAMES:
+            if artifact_name not in version:
+                continue
+            artifact = version[artifact_name]
+            cached_path = self._ensure_cached(artifact)
+            self._link(
+                cached_path, os.path.join(version_directory, artifact["file_name"])
+            )
+
+        with open(os.path.join(version_directory, "metrics.json"), "w") as file:
+            json.dump(version["metrics"], file, indent=2, sort_keys=True)
+
+        self._link(version_directory, self.current_link)
+        logger.info(f"{self.current_link} now points at version {version['version']}")
+        return version_directory
+
+    def _upload_artifact(self, local_path: str) -> dict:
+        sha256 = sha256_of_file(local_path)
+        key = f"{OBJECTS_PREFIX}/{sha256}"
+        try:
+            self.s3_client.head_object(Bucket=self.bucket, Key=key)
+            logger.info(f"{local_path} already stored as {key}")
+        except botocore.exceptions.ClientError:
+            logger.info(f"Uploading {local_path} to {key}")
+            self.s3_client.upload_file(local_path, self.bucket, key)
+        return {
+            "key": key,
+            "file_name": os.path.basename(local_path),
+            "sha256": sha256,
+            "size": os.path.getsize(local_path),
+        }
+
+    def _fetch_manifest(self) -> Optional[dict]:
+        os.makedirs(self.local_directory, exist_ok=True)
+        request = {"Bucket": self.bucket, "Key": REGISTRY_KEY}
+        cached_etag = self._read_cached_etag()
+        if cached_etag:
+            request["IfNoneMatch"] = cached_etag
+
+        try:
+            response = self.s3_client.get_object(**request)
+        except botocore.exceptions.ClientError as e:
+            error_code = e.response["Error"]["Code"]
+            if error_code in ("304", "NotModified"):
+                logger.info("Model registry unchanged since last fetch")
+                with open(self.local_manifest_path, "r") as file:
+                    return json.load(file)
+            if error_code in ("NoSuchKey", "404"):
+                logger.warning(f"No model registry found at {REGISTRY_KEY}")
+                return None
+            raise e
+
+        manifest = json.loads(response["Body"].read())
+        self._write_atomically(
+            self.local_manifest_path, json.dumps(manifest, indent=2).encode()
+        )
+        self._write_atomically(self.local_etag_path, response["ETag"].encode())
+        return manifest
+
+    def _read_cached_etag(self) -> Optional[str]:
+        if not (
+            os.path.exists(self.local_etag_path)
+            and os.path.exists(self.local_manifest_path)
+        ):
+            return None
+        with open(self.local_etag_path, "r") as file:
+            return file.read().strip()
+
+    def _ensure_cached(self, artifact: dict) -> str:
+        cached_path = os.path.join(
+            self.cache_directory, artifact["sha256"], artifact["file_name"]
+        )
+        if os.path.exists(cached_path):
+            if (
+                os.path.getsize(cached_path) == artifact["size"]
+                and sha256_of_file(cached_path) == artifact["sha256"]
+            ):
+                logger.info(f"{artifact['file_name']} already cached at {cached_path}")
+                return cached_path
+            logger.warning(f"Cached {cached_path} is corrupt, downloading it again")
+            os.remove(cached_path)
+
+        os.makedirs(os.path.dirname(cached_path), exist_ok=True)
+        temporary_path = f"{cached_path}.part"
+        logger.info(f"Downloading {artifact['key']} to {cached_path}")
+        self.s3_client.download_file(self.bucket, artifact["key"], temporary_path)
+        if sha256_of_file(temporary_path) != artifact["sha256"]:
+            os.remove(temporary_path)
+            raise ValueError(f"Checksum mismatch for {artifact['key']}")
+        os.replace(temporary_path, cached_path)
+        return cached_path
+
+    @staticmethod
+    def _link(target: str, link_path: str) -> None:
+        os.makedirs(os.path.dirname(link_path), exist_ok=True)
+        relative_target = os.path.relpath(target, os.path.dirname(link_path))
+        temporary_link = f"{link_path}.tmp-{os.getpid()}"
+        if os.path.lexists(temporary_link):
+            os.remove(temporary_link)
+        os.symlink(relative_target, temporary_link)
+        os.replace(temporary_link, link_path)
+
+    @staticmethod
+    def _write_atomically(path: str, content: bytes) -> None:
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(content)
+        os.replace(temporary_path, path)
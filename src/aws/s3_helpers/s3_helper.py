@@ -1,11 +1,57 @@
 from datetime import datetime
 import os
 import re
+import threading
+from typing import Optional
 
 import boto3
 import botocore
+from botocore.config import Config
 from loguru import logger
 
+MAX_POOL_CONNECTIONS = 32
+
+_s3_clients = {}
+_s3_clients_lock = threading.Lock()
+
+
+def get_s3_client(
+    aws_access_key_id: Optional[str] = None,
+    aws_secret_access_key: Optional[str] = None,
+    aws_session_token: Optional[str] = None,
+    region_name: Optional[str] = None,
+):
+    """Returns a process-wide S3 client, created on first use per credential set."""
+    cache_key = (
+        aws_access_key_id,
+        aws_secret_access_key,
+        aws_session_token,
+        region_name,
+    )
+    client = _s3_clients.get(cache_key)
+    if client is not None:
+        return client
+
+    with _s3_clients_lock:
+        client = _s3_clients.get(cache_key)
+        if client is None:
+            logger.info("Creating shared S3 client")
+            session = boto3.session.Session(
+                aws_access_key_id=aws_access_key_id,
+                aws_secret_access_key=aws_secret_access_key,
+                aws_session_token=aws_session_token,
+                region_name=region_name,
+            )
+            client = session.client(
+                "s3",
+                config=Config(
+                    max_pool_connections=MAX_POOL_CONNECTIONS,
+                    retries={"max_attempts": 5, "mode": "adaptive"},
+                ),
+            )
+            _s3_clients[cache_key] = client
+    return client
+
 
 class S3Helpers:
     def __init__(self, bucket: str, prefix: str):
@@ -14,13 +60,31 @@ class S3Helpers:
         self.aws_access_key_id = os.environ.get("AWS_ACCESS_KEY_ID")
         self.aws_secret_access_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
         self.aws_session_token = os.environ.get("AWS_SESSION_TOKEN")
-        self.s3_client = boto3.client(
-            "s3",
+        self.region_name = os.environ.get("AWS_REGION") or os.environ.get(
+            "AWS_DEFAULT_REGION"
+        )
+        self._s3_resource = None
+
+    @property
+    def s3_client(self):
+        return get_s3_client(
             aws_access_key_id=self.aws_access_key_id,
             aws_secret_access_key=self.aws_secret_access_key,
             aws_session_token=self.aws_session_token,
+            region_name=self.region_name,
         )
-        self.s3_resource = boto3.resource("s3")
+
+    @property
+    def s3_resource(self):
+        if self._s3_resource is None:
+            session = boto3.session.Session(
+                aws_access_key_id=self.aws_access_key_id,
+                aws_secret_access_key=self.aws_secret_access_key,
+                aws_session_token=self.aws_session_token,
+                region_name=self.region_name,
+            )
+            self._s3_resource = session.resource("s3")
+        return self._s3_resource
 
     def check_file_exists_in_s3_bucket(self, filename: str) -> bool:
         try:
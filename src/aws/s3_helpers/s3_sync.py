@@ -0,0 +1,327 @@
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from boto3.s3.transfer import TransferConfig
+from loguru import logger
+
+from src.aws.s3_helpers.s3_helper import MAX_POOL_CONNECTIONS, get_s3_client
+
+MANIFEST_SUFFIX = ".s3_manifest.json"
+DEFAULT_MAX_WORKERS = 8
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+MULTIPART_CHUNKSIZE = 8 * 1024 * 1024
+
+
+@dataclass
+class RemoteObject:
+    key: str
+    size: int
+    etag: str
+
+
+@dataclass
+class UploadItem:
+    local_path: str
+    key: str
+    etag: str
+
+
+@dataclass
+class UploadPlan:
+    uploads: list = field(default_factory=list)
+    unchanged: list = field(default_factory=list)
+
+
+@dataclass
+class SyncResult:
+    transferred: list = field(default_factory=list)
+    skipped: list = field(default_factory=list)
+    failed: list = field(default_factory=list)
+
+
+def compute_etag(
+    file_path: str,
+    threshold: int = MULTIPART_THRESHOLD,
+    chunk_size: int = MULTIPART_CHUNKSIZE,
+) -> str:
+    """Computes the ETag S3 assigns to the file when uploaded with TransferConfig."""
+    if os.path.getsize(file_path) < threshold:
+        with open(file_path, "rb") as file:
+            return hashlib.md5(file.read()).hexdigest()
+
+    part_digests = []
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            part_digests.append(hashlib.md5(chunk).digest())
+    combined = hashlib.md5(b"".join(part_digests)).hexdigest()
+    return f"{combined}-{len(part_digests)}"
+
+
+class SyncManifest:
+    """Keeps track of the size and ETag of every file last synced to a directory."""
+
+    def __init__(self, local_directory: str):
+        directory = os.path.normpath(local_directory)
+        self.path = os.path.join(
+            os.path.dirname(directory),
+            f".{os.path.basename(directory)}{MANIFEST_SUFFIX}",
+        )
+        self._lock = threading.Lock()
+        self.entries = self._load()
+
+    def _load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r") as file:
+                return json.load(file)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable manifest {self.path}: {e}")
+            return {}
+
+    def get(self, file_name: str) -> Optional[dict]:
+        return self.entries.get(file_name)
+
+    def record(self, file_name: str, local_path: str, etag: str) -> None:
+        stat = os.stat(local_path)
+        with self._lock:
+            self.entries[file_name] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "etag": etag,
+            }
+
+    def local_etag(self, file_name: str, local_path: str) -> str:
+        """Returns the recorded ETag when the file is untouched, hashing otherwise."""
+        entry = self.get(file_name)
+        stat = os.stat(local_path)
+        if (
+            entry is not None
+            and entry["size"] == stat.st_size
+            and entry.get("mtime_ns") == stat.st_mtime_ns
+        ):
+            return entry["etag"]
+        return compute_etag(local_path)
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temporary_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(temporary_path, "w") as file:
+                json.dump(self.entries, file, indent=2, sort_keys=True)
+        os.replace(temporary_path, self.path)
+
+
+class RemoteIndex:
+    """Keys, sizes and ETags under a prefix, built from one paginated listing."""
+
+    def __init__(self, objects: dict):
+        self.objects = objects
+
+    @classmethod
+    def build(cls, s3_client, bucket: str, prefix: str) -> "RemoteIndex":
+        logger.info(f"Listing s3://{bucket}/{prefix}")
+        paginator = s3_client.get_paginator("list_objects_v2")
+        objects = {}
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                objects[obj["Key"]] = RemoteObject(
+                    key=obj["Key"], size=obj["Size"], etag=obj["ETag"].strip('"')
+                )
+        logger.info(f"Found {len(objects)} objects under {prefix}")
+        return cls(objects)
+
+    def get(self, key: str) -> Optional[RemoteObject]:
+        return self.objects.get(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.objects
+
+    def __len__(self) -> int:
+        return len(self.objects)
+
+
+class UploadPlanner:
+    """Diffs local files against a RemoteIndex and lists what needs uploading."""
+
+    def __init__(
+        self, remote_index: RemoteIndex, manifest: Optional[SyncManifest] = None
+    ):
+        self.remote_index = remote_index
+        self.manifest = manifest
+
+    def plan(self, files: dict) -> UploadPlan:
+        """Plans uploads for a mapping of destination key to local path."""
+        plan = UploadPlan()
+        for key, local_path in sorted(files.items()):
+            etag = self._local_etag(local_path)
+            remote = self.remote_index.get(key)
+            if (
+                remote is not None
+                and remote.size == os.path.getsize(local_path)
+                and remote.etag == etag
+            ):
+                plan.unchanged.append(key)
+            else:
+                plan.uploads.append(UploadItem(local_path, key, etag))
+        logger.info(
+            f"Upload plan: {len(plan.uploads)} to upload, "
+            f"{len(plan.unchanged)} unchanged"
+        )
+        return plan
+
+    def _local_etag(self, local_path: str) -> str:
+        if self.manifest is None:
+            return compute_etag(local_path)
+        return self.manifest.local_etag(os.path.basename(local_path), local_path)
+
+
+class S3SyncEngine:
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str,
+        s3_client=None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ):
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.max_workers = max_workers
+        self.s3_client = s3_client or get_s3_client()
+        self.transfer_config = TransferConfig(
+            multipart_threshold=MULTIPART_THRESHOLD,
+            multipart_chunksize=MULTIPART_CHUNKSIZE,
+            max_concurrency=max(1, MAX_POOL_CONNECTIONS // max_workers),
+        )
+
+    def key_for(self, file_name: str) -> str:
+        return f"{self.prefix}/{file_name}" if self.prefix else file_name
+
+    def build_remote_index(self) -> RemoteIndex:
+        list_prefix = f"{self.prefix}/" if self.prefix else ""
+        return RemoteIndex.build(self.s3_client, self.bucket, list_prefix)
+
+    def list_remote_objects(self) -> dict[str, RemoteObject]:
+        list_prefix = f"{self.prefix}/" if self.prefix else ""
+        remote_objects = {}
+        for key, remote in self.build_remote_index().objects.items():
+            file_name = key[len(list_prefix) :]
+            if file_name and "/" not in file_name:
+                remote_objects[file_name] = remote
+        return remote_objects
+
+    def download(self, local_directory: str) -> SyncResult:
+        os.makedirs(local_directory, exist_ok=True)
+        manifest = SyncManifest(local_directory)
+        remote_objects = self.list_remote_objects()
+
+        pending, skipped = [], []
+        for file_name, remote in remote_objects.items():
+            local_path = os.path.join(local_directory, file_name)
+            if self._is_local_copy_current(local_path, remote, manifest):
+                skipped.append(file_name)
+            else:
+                pending.append(remote)
+
+        logger.info(f"{len(pending)} objects to download, {len(skipped)} up to date")
+        result = self._run_transfers(
+            pending,
+            lambda remote: self._download_object(remote, local_directory, manifest),
+            lambda remote: os.path.basename(remote.key),
+        )
+        result.skipped = skipped
+        manifest.save()
+        return result
+
+    def upload(
+        self,
+        local_directory: str,
+        file_filter: Optional[Callable[[str], bool]] = None,
+    ) -> SyncResult:
+        manifest = SyncManifest(local_directory)
+        files = {}
+        for file_name in os.listdir(local_directory):
+            local_path = os.path.join(local_directory, file_name)
+            if not os.path.isfile(local_path) or file_name.endswith(".part"):
+                continue
+            if file_filter is not None and not file_filter(file_name):
+                continue
+            files[self.key_for(file_name)] = local_path
+
+        plan = UploadPlanner(self.build_remote_index(), manifest).plan(files)
+        result = self.execute_upload_plan(plan, manifest)
+        manifest.save()
+        return result
+
+    def execute_upload_plan(
+        self, plan: UploadPlan, manifest: Optional[SyncManifest] = None
+    ) -> SyncResult:
+        result = self._run_transfers(
+            plan.uploads,
+            lambda item: self._upload_item(item, manifest),
+            lambda item: os.path.basename(item.key),
+        )
+        result.skipped = [os.path.basename(key) for key in plan.unchanged]
+        return result
+
+    def _is_local_copy_current(
+        self, local_path: str, remote: RemoteObject, manifest: SyncManifest
+    ) -> bool:
+        if not os.path.exists(local_path):
+            return False
+        if os.path.getsize(local_path) != remote.size:
+            return False
+        file_name = os.path.basename(local_path)
+        if manifest.local_etag(file_name, local_path) != remote.etag:
+            return False
+        manifest.record(file_name, local_path, remote.etag)
+        return True
+
+    def _download_object(
+        self, remote: RemoteObject, local_directory: str, manifest: SyncManifest
+    ) -> None:
+        file_name = os.path.basename(remote.key)
+        local_path = os.path.join(local_directory, file_name)
+        temporary_path = f"{local_path}.part"
+        logger.info(f"Downloading {remote.key} to {local_path}")
+        self.s3_client.download_file(
+            self.bucket, remote.key, temporary_path, Config=self.transfer_config
+        )
+        os.replace(temporary_path, local_path)
+        manifest.record(file_name, local_path, remote.etag)
+
+    def _upload_item(
+        self, item: UploadItem, manifest: Optional[SyncManifest] = None
+    ) -> None:
+        logger.info(f"Uploading {item.local_path} to s3://{self.bucket}/{item.key}")
+        self.s3_client.upload_file(
+            item.local_path, self.bucket, item.key, Config=self.transfer_config
+        )
+        if manifest is not None:
+            manifest.record(
+                os.path.basename(item.local_path), item.local_path, item.etag
+            )
+
+    def _run_transfers(
+        self, items: list, transfer: Callable, describe: Callable
+    ) -> SyncResult:
+        result = SyncResult()
+        if not items:
+            return result
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(transfer, item): item for item in items}
+            for future in as_completed(futures):
+                name = describe(futures[future])
+                try:
+                    future.result()
+                    result.transferred.append(name)
+                except Exception as e:
+                    logger.error(f"Error transferring {name}: {e}")
+                    result.failed.append(name)
+        return result
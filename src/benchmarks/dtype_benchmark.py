@@ -0,0 +1,120 @@
+import argparse
+import glob
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from src.processing.dtypes import memory_bytes, pyarrow_available, read_csv_with_schema
+
+FEATURE_COLUMNS = (
+    "ax",
+    "ay",
+    "az",
+    "vx",
+    "vy",
+    "vz",
+    "dx",
+    "dy",
+    "dz",
+    "angle_xy",
+    "angle_yz",
+    "angle_zx",
+    "g_force",
+    "jerk",
+    "magnitude_acceleration",
+)
+
+
+def synthetic_processed_file(path: str, rows: int, seed: int = 0) -> None:
+    """A processed recording with the usual column mix."""
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame(
+        {"timestamp": np.arange(rows, dtype=np.int64) * 75_000_000}
+        | {column: rng.normal(size=rows) for column in FEATURE_COLUMNS}
+        | {
+            "fall_state": rng.integers(0, 2, rows),
+            "impact_detection": rng.integers(0, 2, rows),
+        }
+    )
+    data.to_csv(path, index=False)
+
+
+def time_read(function, path: str, repeats: int) -> tuple[float, pd.DataFrame]:
+    timings = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        data = function(path)
+        timings.append(time.perf_counter() - start_time)
+    return min(timings), data
+
+
+def benchmark(path: str, repeats: int) -> dict:
+    inferred_seconds, inferred = time_read(pd.read_csv, path, repeats)
+    schema_seconds, schema = time_read(read_csv_with_schema, path, repeats)
+    return {
+        "file": path,
+        "rows": len(inferred),
+        "inferred_seconds": round(inferred_seconds, 5),
+        "schema_seconds": round(schema_seconds, 5),
+        "inferred_bytes": memory_bytes(inferred),
+        "schema_bytes": memory_bytes(schema),
+    }
+
+
+def summarise(reports: list[dict]) -> dict:
+    totals = {
+        key: sum(report[key] for report in reports)
+        for key in (
+            "inferred_seconds",
+            "schema_seconds",
+            "inferred_bytes",
+            "schema_bytes",
+        )
+    }
+    return {
+        "files": len(reports),
+        "engine": "pyarrow" if pyarrow_available() else "c",
+        "memory_reduction": round(
+            1 - totals["schema_bytes"] / totals["inferred_bytes"], 4
+        ),
+        "parse_time_reduction": round(
+            1 - totals["schema_seconds"] / totals["inferred_seconds"], 4
+        ),
+        **totals,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare memory and parse time of inferred and schema dtypes"
+    )
+    parser.add_argument(
+        "--files", help="Glob of CSV files, e.g. 'data/processed/*.csv'"
+    )
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = sorted(glob.glob(args.files)) if args.files else []
+        if not paths:
+            paths = [os.path.join(directory, "synthetic.csv")]
+            synthetic_processed_file(paths[0], args.rows)
+        reports = [benchmark(path, args.repeats) for path in paths]
+
+    summary = summarise(reports)
+    logger.info(f"{summary}")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"summary": summary, "files": reports}, file, indent=2)
+        logger.info(f"Benchmark results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
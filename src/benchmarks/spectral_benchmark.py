@@ -0,0 +1,70 @@
+import argparse
+import json
+import time
+
+import numpy as np
+from loguru import logger
+
+from src.processing.spectral_features import (
+    DEFAULT_WINDOW,
+    power_spectra,
+    trailing_windows,
+)
+
+
+def per_window_spectra(values: np.ndarray, window: int) -> np.ndarray:
+    """One rfft per window, as a straightforward loop would compute it."""
+    taper = np.hanning(window + 1)[:-1]
+    spectra = []
+    for segment in trailing_windows(np.asarray(values, dtype=np.float64), window):
+        spectra.append(np.abs(np.fft.rfft((segment - segment.mean()) * taper)) ** 2)
+    return np.array(spectra)
+
+
+def time_call(function, values: np.ndarray, window: int, repeats: int) -> tuple:
+    timings = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        result = function(values, window)
+        timings.append(time.perf_counter() - start_time)
+    return min(timings), result
+
+
+def benchmark(rows: int, window: int, repeats: int, seed: int = 0) -> dict:
+    values = np.random.default_rng(seed).normal(1.0, 0.3, rows)
+    loop_seconds, loop_result = time_call(per_window_spectra, values, window, repeats)
+    batched_seconds, batched_result = time_call(power_spectra, values, window, repeats)
+    report = {
+        "rows": rows,
+        "window": window,
+        "per_window_seconds": round(loop_seconds, 5),
+        "batched_seconds": round(batched_seconds, 5),
+        "speedup": round(loop_seconds / batched_seconds, 2),
+        "max_abs_difference": float(np.max(np.abs(loop_result - batched_result))),
+    }
+    logger.info(f"{report}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark batched against per-window spectral features"
+    )
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    reports = [benchmark(rows, args.window, args.repeats) for rows in args.rows]
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(reports, file, indent=2)
+        logger.info(f"Benchmark results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+import glob
+import json
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from src.processing.timestamps import interval_seconds, to_epoch_ns
+
+
+def legacy_time_interval(timestamps: pd.Series) -> np.ndarray:
+    """The parse-and-interval step as MotionFeatureCalculator used to run it."""
+    parsed = pd.to_datetime(timestamps)
+    interval = parsed.diff().fillna(pd.Timedelta(seconds=0))
+    return interval.dt.total_seconds().to_numpy()
+
+
+def vectorized_time_interval(timestamps: pd.Series) -> np.ndarray:
+    return interval_seconds(to_epoch_ns(timestamps.to_numpy()))
+
+
+def synthetic_timestamps(rows: int, seed: int = 0) -> pd.Series:
+    """Local timestamps as the sensors write them, at roughly 13 Hz."""
+    rng = np.random.default_rng(seed)
+    start = datetime(2024, 2, 6, 10, 0, 42, 430037)
+    offsets = np.cumsum(rng.normal(75_000, 500, rows).astype(np.int64))
+    return pd.Series(
+        [str(start + timedelta(microseconds=int(offset))) for offset in offsets]
+    )
+
+
+def time_call(function, timestamps: pd.Series, repeats: int) -> dict:
+    timings = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        try:
+            result = function(timestamps)
+        except ValueError as e:
+            return {"error": str(e).splitlines()[0]}
+        timings.append(time.perf_counter() - start_time)
+    best = min(timings)
+    return {
+        "seconds": round(best, 5),
+        "rows_per_second": round(len(timestamps) / best),
+        "result": result,
+    }
+
+
+def benchmark(name: str, timestamps: pd.Series, repeats: int) -> dict:
+    legacy = time_call(legacy_time_interval, timestamps, repeats)
+    vectorized = time_call(vectorized_time_interval, timestamps, repeats)
+    report = {"source": name, "rows": len(timestamps)}
+    if "result" in legacy and "result" in vectorized:
+        report["max_abs_difference"] = float(
+            np.max(np.abs(legacy["result"] - vectorized["result"]), initial=0.0)
+        )
+        report["speedup"] = round(legacy["seconds"] / vectorized["seconds"], 2)
+    legacy.pop("result", None)
+    vectorized.pop("result", None)
+    report["legacy"] = legacy
+    report["vectorized"] = vectorized
+    logger.info(f"{report}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark timestamp parsing and interval computation"
+    )
+    parser.add_argument(
+        "--files", help="Glob of raw CSV files with a timestamp_local column"
+    )
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    if args.files:
+        reports = [
+            benchmark(
+                path,
+                pd.read_csv(path, usecols=["timestamp_local"])["timestamp_local"],
+                args.repeats,
+            )
+            for path in sorted(glob.glob(args.files))
+        ]
+    else:
+        reports = [
+            benchmark("synthetic", synthetic_timestamps(args.rows), args.repeats)
+        ]
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(reports, file, indent=2)
+        logger.info(f"Benchmark results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+import argparse
+import dataclasses
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import queue as queue_module
+import time
+
+import numpy as np
+from loguru import logger
+
+from src.modelling.training_config import TRAINING_CONFIG_PATH, TrainingConfig
+
+RESULTS_PATH = "hyperparameters/training_config_benchmark.json"
+DEFAULT_TIMEOUT_SECONDS = 1800
+# The TrainingConfig fields the grid sweeps; --write-best changes only these.
+BENCHMARKED_FIELDS = (
+    "batch_size",
+    "jit_compile",
+    "steps_per_execution",
+    "mixed_precision_policy",
+    "intra_op_threads",
+    "inter_op_threads",
+)
+
+
+@dataclasses.dataclass
+class BenchmarkResult:
+    config: dict
+    epochs_per_second: float
+    final_loss: float
+    stable: bool
+    error: str = ""
+
+
+def failed_result(config: dict, error: str) -> BenchmarkResult:
+    return BenchmarkResult(
+        config=config,
+        epochs_per_second=0.0,
+        final_loss=float("nan"),
+        stable=False,
+        error=error,
+    )
+
+
+def build_grid(
+    batch_sizes: list[int],
+    jit_compile: list[bool],
+    steps_per_execution: list[int],
+    policies: list[str],
+    threads: list[tuple[int, int]],
+) -> list[TrainingConfig]:
+    return [
+        TrainingConfig(
+            batch_size=batch_size,
+            jit_compile=jit,
+            steps_per_execution=steps,
+            mixed_precision_policy=policy,
+            intra_op_threads=intra_op,
+            inter_op_threads=inter_op,
+        )
+        for batch_size, jit, steps, policy, (intra_op, inter_op) in itertools.product(
+            batch_sizes, jit_compile, steps_per_execution, policies, threads
+        )
+    ]
+
+
+def synthetic_data(
+    sequences: int, timesteps: int, features: int, seed: int = 0
+) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    data = rng.standard_normal((sequences, timesteps, features)).astype(np.float32)
+    labels = rng.integers(0, 2, size=sequences)
+    return data, labels
+
+
+def _run_config(config: dict, data_shape: tuple, epochs: int, queue) -> None:
+    """Trains one configuration in a fresh process; thread pools and the
+    precision policy are process-wide and cannot be changed once set."""
+    try:
+        from src.modelling.model_training import ModelTraining
+
+        training_config = TrainingConfig(**config)
+        model_training = ModelTraining(training_config=training_config)
+        data, labels = synthetic_data(*data_shape)
+        model = model_training._create_model(data.shape[1:])
+
+        # The first epoch pays for tracing and XLA compilation.
+        model.fit(data, labels, epochs=1, batch_size=training_config.batch_size)
+        start_time = time.perf_counter()
+        history = model.fit(
+            data, labels, epochs=epochs, batch_size=training_config.batch_size
+        )
+        elapsed = time.perf_counter() - start_time
+
+        losses = history.history["loss"]
+        stable = all(math.isfinite(loss) for loss in losses)
+        queue.put(
+            BenchmarkResult(
+                config=config,
+                epochs_per_second=round(epochs / elapsed, 4),
+                final_loss=float(losses[-1]),
+                stable=stable,
+            )
+        )
+    except Exception as e:
+        queue.put(failed_result(config, str(e)))
+
+
+def _wait_for_result(process, queue, timeout_seconds: float):
+    """The result the process puts on ``queue``, or None when it exits
+    without one or runs past ``timeout_seconds``."""
+    deadline = time.perf_counter() + timeout_seconds
+    while time.perf_counter() < deadline:
+        try:
+            return queue.get(timeout=1.0)
+        except queue_module.Empty:
+            if not process.is_alive():
+                break
+    try:
+        return queue.get(timeout=1.0)
+    except queue_module.Empty:
+        return None
+
+
+def run_benchmark(
+    configs: list[TrainingConfig],
+    data_shape: tuple,
+    epochs: int,
+    timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+    target=_run_config,
+) -> list[BenchmarkResult]:
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for config in configs:
+        settings = dataclasses.asdict(config)
+        queue = context.Queue()
+        process = context.Process(
+            target=target, args=(settings, data_shape, epochs, queue)
+        )
+        process.start()
+        result = _wait_for_result(process, queue, timeout_seconds)
+        if result is not None:
+            process.join(timeout=10)
+        timed_out = process.is_alive()
+        if timed_out:
+            process.terminate()
+            process.join()
+        if timed_out and result is None:
+            result = failed_result(settings, f"No result after {timeout_seconds}s")
+        elif result is None or process.exitcode != 0:
+            result = failed_result(
+                settings, f"Process exited with code {process.exitcode}"
+            )
+        logger.info(
+            f"{result.config}: {result.epochs_per_second} epochs/s, "
+            f"stable={result.stable}"
+        )
+        results.append(result)
+    return results
+
+
+def fastest_stable(results: list[BenchmarkResult]) -> BenchmarkResult:
+    stable_results = [result for result in results if result.stable]
+    if not stable_results:
+        raise ValueError("No configuration trained stably")
+    return max(stable_results, key=lambda result: result.epochs_per_second)
+
+
+def write_best(
+    best: BenchmarkResult, path: str = TRAINING_CONFIG_PATH
+) -> TrainingConfig:
+    """Updates the benchmarked fields of the saved config, keeping the rest."""
+    training_config = dataclasses.replace(
+        TrainingConfig.load(path),
+        **{field: best.config[field] for field in BENCHMARKED_FIELDS},
+    )
+    training_config.save(path)
+    return training_config
+
+
+def save_results(results: list[BenchmarkResult], path: str = RESULTS_PATH) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    ordered = sorted(results, key=lambda result: -result.epochs_per_second)
+    with open(path, "w") as file:
+        json.dump([dataclasses.asdict(result) for result in ordered], file, indent=2)
+    logger.info(f"Benchmark results saved to {path}")
+
+
+def _parse_threads(value: str) -> tuple[int, int]:
+    intra_op, inter_op = value.split(":")
+    return int(intra_op), int(inter_op)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark training configurations on CPU in epochs/second"
+    )
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[32, 64, 128])
+    parser.add_argument("--steps-per-execution", type=int, nargs="+", default=[1, 16])
+    parser.add_argument("--policies", nargs="+", default=["float32", "mixed_bfloat16"])
+    parser.add_argument(
+        "--threads",
+        type=_parse_threads,
+        nargs="+",
+        default=[(0, 0)],
+        help="intra_op:inter_op thread pool sizes, 0 lets TensorFlow decide",
+    )
+    parser.add_argument("--no-jit", action="store_true", help="Skip XLA runs")
+    parser.add_argument("--epochs", type=int, default=3)
+    parser.add_argument("--sequences", type=int, default=512)
+    parser.add_argument("--timesteps", type=int, default=110)
+    parser.add_argument("--features", type=int, default=9)
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT_SECONDS,
+        help="Seconds to wait for one configuration before recording it as failed",
+    )
+    parser.add_argument(
+        "--write-best",
+        action="store_true",
+        help=f"Write the fastest stable configuration to {TRAINING_CONFIG_PATH}",
+    )
+    args = parser.parse_args()
+
+    configs = build_grid(
+        args.batch_sizes,
+        [False] if args.no_jit else [False, True],
+        args.steps_per_execution,
+        args.policies,
+        args.threads,
+    )
+    results = run_benchmark(
+        configs,
+        (args.sequences, args.timesteps, args.features),
+        args.epochs,
+        args.timeout,
+    )
+    save_results(results)
+
+    best = fastest_stable(results)
+    logger.info(f"Fastest stable configuration: {best.config}")
+    if args.write_best:
+        write_best(best)
+        logger.info(f"Training config written to {TRAINING_CONFIG_PATH}")
+
+
+if __name__ == "__main__":
+    main()
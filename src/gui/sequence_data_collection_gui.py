@@ -20,6 +20,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 
 import time
+from src.processing.timestamps import interval_seconds, to_epoch_ns
 from src.tools.acceleration import Acceleration
 
 """Annotate Acceleration Data From Accelerometer And Save data as CSV file"""
@@ -140,13 +141,11 @@ class SequenceDataCollectionGui(QMainWindow):
         if accelerations is not None and len(accelerations) > 1:
             dicts = [asdict(acceleration) for acceleration in accelerations]
             df = pd.DataFrame(dicts)
-            df["timestamp_local"] = pd.to_datetime(df["timestamp_local"])
+            time_divisor = 1000
             df["time_interval"] = (
-                df["timestamp_local"].diff().fillna(pd.Timedelta(seconds=0))
+                interval_seconds(to_epoch_ns(df["timestamp_local"].to_numpy()))
+                / time_divisor
             )
-            df["time_interval"] = df["time_interval"].dt.total_seconds()
-            time_divisor = 1000
-            df["time_interval"] /= time_divisor
             df["g_force"] = np.sqrt(df["ax"] ** 2 + df["ay"] ** 2 + df["az"] ** 2)
             df["jerk"] = df["g_force"].diff().fillna(9.8) / df["time_interval"]
             # Print the max value of the jerk column
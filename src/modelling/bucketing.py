@@ -0,0 +1,120 @@
+import math
+from typing import Optional
+
+import numpy as np
+import tensorflow as tf
+from keras.preprocessing.sequence import pad_sequences
+
+DEFAULT_NUM_BUCKETS = 4
+# Three Conv1D/MaxPooling1D stages need a few timesteps left to convolve.
+MIN_BUCKET_LENGTH = 32
+
+
+def bucket_boundaries(
+    lengths: list[int],
+    num_buckets: int = DEFAULT_NUM_BUCKETS,
+    min_length: int = MIN_BUCKET_LENGTH,
+) -> list[int]:
+    """Padded lengths of the buckets, taken at equal-count quantiles of ``lengths``."""
+    quantiles = np.quantile(lengths, np.linspace(0, 1, num_buckets + 1)[1:])
+    boundaries = sorted({max(int(math.ceil(value)), min_length) for value in quantiles})
+    boundaries[-1] = max(boundaries[-1], max(lengths))
+    return boundaries
+
+
+def assign_buckets(lengths: list[int], boundaries: list[int]) -> np.ndarray:
+    return np.searchsorted(boundaries, lengths, side="left")
+
+
+def padding_report(
+    lengths: list[int],
+    boundaries: list[int],
+    global_length: Optional[int] = None,
+) -> dict:
+    """Compares the timesteps computed with global padding and with buckets.
+
+    Conv1D and LSTM cost grows linearly with the sequence length, so the
+    timestep ratio is the expected FLOP and time saving per epoch.
+    """
+    global_length = global_length or max(lengths)
+    buckets = assign_buckets(lengths, boundaries)
+    global_timesteps = global_length * len(lengths)
+    bucketed_timesteps = int(sum(boundaries[bucket] for bucket in buckets))
+    return {
+        "sequences": len(lengths),
+        "real_timesteps": int(sum(lengths)),
+        "global_padded_timesteps": int(global_timesteps),
+        "bucketed_padded_timesteps": bucketed_timesteps,
+        "bucket_lengths": boundaries,
+        "bucket_sizes": np.bincount(buckets, minlength=len(boundaries)).tolist(),
+        "estimated_compute_saved": round(1 - bucketed_timesteps / global_timesteps, 4),
+    }
+
+
+class BucketedSequence(tf.keras.utils.Sequence):
+    """Batches of similar-length sequences, each padded only to its bucket length.
+
+    Sequences are padded with raw zeros and then scaled, matching what
+    ``ModelUtilities.pad_sequences`` followed by ``scale_sequences`` produce.
+    Without labels the batches keep their order so predictions can be mapped
+    back with ``order``.
+    """
+
+    def __init__(
+        self,
+        sequences: list,
+        labels: Optional[list],
+        scaler,
+        boundaries: list[int],
+        batch_size: int = 32,
+        shuffle: bool = False,
+        seed: int = 42,
+    ):
+        super().__init__()
+        self.sequences = sequences
+        self.labels = None if labels is None else np.asarray(labels)
+        self.scaler = scaler
+        self.boundaries = boundaries
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.rng = np.random.default_rng(seed)
+
+        lengths = [len(sequence) for sequence in sequences]
+        self.buckets = assign_buckets(lengths, boundaries)
+        self.batches = self._make_batches()
+        self.order = np.concatenate([indices for _, indices in self.batches])
+
+    def _make_batches(self) -> list[tuple[int, np.ndarray]]:
+        batches = []
+        for bucket in range(len(self.boundaries)):
+            indices = np.flatnonzero(self.buckets == bucket)
+            if self.shuffle:
+                indices = self.rng.permutation(indices)
+            for start in range(0, len(indices), self.batch_size):
+                batches.append((bucket, indices[start : start + self.batch_size]))
+        if self.shuffle:
+            batches = [batches[i] for i in self.rng.permutation(len(batches))]
+        return batches
+
+    def __len__(self) -> int:
+        return len(self.batches)
+
+    def __getitem__(self, index: int):
+        bucket, indices = self.batches[index]
+        padded = pad_sequences(
+            [self.sequences[i] for i in indices],
+            maxlen=self.boundaries[bucket],
+            dtype="float32",
+            padding="post",
+            truncating="post",
+        )
+        scaled = self.scaler.transform(padded.reshape(-1, padded.shape[-1])).reshape(
+            padded.shape
+        )
+        if self.labels is None:
+            return scaled
+        return scaled, self.labels[indices]
+
+    def on_epoch_end(self) -> None:
+        if self.shuffle:
+            self.batches = self._make_batches()
@@ -0,0 +1,290 @@
+import argparse
+import dataclasses
+import json
+import os
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.helper_functions.model_helper_functions import ModelHelpingFunctions
+from src.processing.motion_features import IMPACT_JERK_THRESHOLD
+from src.processing.rolling_features import trailing_sums
+
+STANDARD_GRAVITY = 9.81
+CASCADE_REPORT_PATH = "models/cascade_report.json"
+
+
+@dataclasses.dataclass
+class ImpactPrefilter:
+    """Cheap first stage run on every sample.
+
+    A sample is a candidate when any configured criterion fires: jerk or
+    g-force above its threshold, or the trailing-window energy of g-force
+    around 1 g above its threshold. Each run of candidates yields one
+    trigger at its maximum jerk, and triggers closer than ``refractory``
+    samples to the previous one are suppressed.
+    """
+
+    jerk_threshold: Optional[float] = IMPACT_JERK_THRESHOLD
+    g_force_threshold: Optional[float] = None
+    energy_threshold: Optional[float] = None
+    energy_window: int = 16
+    refractory: int = 100
+
+    def candidate_mask(self, data: pd.DataFrame) -> np.ndarray:
+        mask = np.zeros(len(data), dtype=bool)
+        if self.jerk_threshold is not None:
+            mask |= data["jerk"].to_numpy() > self.jerk_threshold
+        if self.g_force_threshold is not None:
+            mask |= data["g_force"].to_numpy() > self.g_force_threshold
+        if self.energy_threshold is not None:
+            deviation = (data["g_force"].to_numpy(np.float64) - STANDARD_GRAVITY) ** 2
+            sums, counts = trailing_sums(deviation, self.energy_window)
+            mask |= sums / counts > self.energy_threshold
+        return mask
+
+    def required_columns(self) -> tuple[str, ...]:
+        """The columns the enabled criteria read; jerk always places triggers."""
+        columns = ("jerk",)
+        if self.g_force_threshold is not None or self.energy_threshold is not None:
+            columns += ("g_force",)
+        return columns
+
+    def trigger_indices(self, data: pd.DataFrame) -> np.ndarray:
+        mask = self.candidate_mask(data)
+        if not mask.any():
+            return np.array([], dtype=int)
+        edges = np.diff(mask.astype(np.int8), prepend=0, append=0)
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        jerk = np.nan_to_num(data["jerk"].to_numpy(np.float64), nan=-np.inf)
+        peaks = [
+            start + int(np.argmax(jerk[start:end])) for start, end in zip(starts, ends)
+        ]
+
+        triggers = []
+        for peak in peaks:
+            if not triggers or peak - triggers[-1] >= self.refractory:
+                triggers.append(peak)
+        return np.array(triggers, dtype=int)
+
+
+class CascadeDetector:
+    """Runs the network only on windows the prefilter triggers.
+
+    ``predictor`` is a ``FallPrediction``: its ``crop_bounds`` centres the
+    crop configurations on each trigger, as ``crop_data`` does on the max
+    jerk, and its ``predict_batch`` scores all crops in one call.
+    """
+
+    def __init__(self, predictor, prefilter: ImpactPrefilter = None):
+        self.predictor = predictor
+        self.prefilter = prefilter or ImpactPrefilter()
+        self.model_helper = ModelHelpingFunctions()
+
+    def score_centres(self, features: np.ndarray, centres) -> tuple[np.ndarray, int]:
+        """The highest probability over the crops around each centre, and how
+        many windows the network scored."""
+        crops = [
+            [
+                features[start_index:end_index]
+                for start_index, end_index in self.predictor.crop_bounds(
+                    len(features), int(centre)
+                )
+            ]
+            for centre in centres
+        ]
+        windows = [crop for centre_crops in crops for crop in centre_crops]
+        if not windows:
+            return np.array([], dtype=np.float32), 0
+        probabilities = np.asarray(self.predictor.predict_batch(windows))
+        offsets = np.cumsum([0] + [len(centre_crops) for centre_crops in crops])
+        return (
+            np.maximum.reduceat(probabilities, offsets[:-1]),
+            len(windows),
+        )
+
+    def detect(self, data: pd.DataFrame, features: np.ndarray) -> list[dict]:
+        triggers = self.prefilter.trigger_indices(data)
+        probabilities, _ = self.score_centres(features, triggers)
+        threshold = self.predictor.probability_threshold
+        detections = [
+            {"index": int(index), "probability": float(probability)}
+            for index, probability in zip(triggers, probabilities)
+            if probability > threshold
+        ]
+        self.model_helper.log_info(
+            f"{len(triggers)} prefilter triggers, {len(detections)} falls detected"
+        )
+        return detections
+
+
+def fall_events(labels: np.ndarray) -> list[tuple[int, int]]:
+    """(start, end) of every run of ``fall_state == 1``."""
+    edges = np.diff((np.asarray(labels) == 1).astype(np.int8), prepend=0, append=0)
+    return list(zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)))
+
+
+def detected_events(
+    events: list, centres, probabilities, threshold: float, tolerance: int
+) -> int:
+    hits = np.asarray(centres)[np.asarray(probabilities) > threshold]
+    return sum(
+        bool(np.any((hits >= start - tolerance) & (hits < end + tolerance)))
+        for start, end in events
+    )
+
+
+def evaluate_replay(
+    detector: CascadeDetector,
+    recordings: list,
+    dense_stride: int = 10,
+    tolerance: int = 20,
+) -> dict:
+    """Compares the cascade with scoring every ``dense_stride``-th sample.
+
+    ``recordings`` holds (data, features) pairs where ``data`` has the
+    columns the prefilter reads and fall_state, and ``features`` is the model input
+    array with the same rows. An event counts as detected when a positive
+    centre lies within ``tolerance`` samples of it.
+    """
+    threshold = detector.predictor.probability_threshold
+    totals = dict.fromkeys(
+        [
+            "events",
+            "dense_detected",
+            "cascade_detected",
+            "prefilter_detected",
+            "dense_windows",
+            "cascade_windows",
+            "triggers",
+            "samples",
+        ],
+        0,
+    )
+    for data, features in recordings:
+        events = fall_events(data["fall_state"].to_numpy())
+        dense_centres = np.arange(0, len(data), dense_stride)
+        dense_probabilities, dense_windows = detector.score_centres(
+            features, dense_centres
+        )
+        triggers = detector.prefilter.trigger_indices(data)
+        cascade_probabilities, cascade_windows = detector.score_centres(
+            features, triggers
+        )
+
+        totals["events"] += len(events)
+        totals["samples"] += len(data)
+        totals["triggers"] += len(triggers)
+        totals["dense_windows"] += dense_windows
+        totals["cascade_windows"] += cascade_windows
+        totals["dense_detected"] += detected_events(
+            events, dense_centres, dense_probabilities, threshold, tolerance
+        )
+        totals["cascade_detected"] += detected_events(
+            events, triggers, cascade_probabilities, threshold, tolerance
+        )
+        totals["prefilter_detected"] += detected_events(
+            events, triggers, np.ones(len(triggers)), 0.5, tolerance
+        )
+
+    events = max(totals["events"], 1)
+    report = {
+        **totals,
+        "dense_recall": round(totals["dense_detected"] / events, 4),
+        "cascade_recall": round(totals["cascade_detected"] / events, 4),
+        "prefilter_recall": round(totals["prefilter_detected"] / events, 4),
+        "compute_saved": round(
+            1 - totals["cascade_windows"] / max(totals["dense_windows"], 1), 4
+        ),
+        "prefilter": dataclasses.asdict(detector.prefilter),
+    }
+    report["recall_loss"] = round(report["dense_recall"] - report["cascade_recall"], 4)
+    detector.model_helper.log_info(f"Cascade replay report: {report}")
+    return report
+
+
+def load_replay_set(
+    directory: str, predictor, prefilter: ImpactPrefilter = None
+) -> list:
+    """Processed recordings with their model inputs, row-aligned.
+
+    Only the columns ``prefilter`` reads are loaded next to the labels. Rows
+    holding an infinite or missing value are dropped from both, as
+    ``CSVPreprocessor.clean`` does for the training data.
+    """
+    schema = predictor.feature_schema
+    replay_columns = (prefilter or ImpactPrefilter()).required_columns() + (
+        "fall_state",
+    )
+    recordings = []
+    for file in sorted(os.listdir(directory)):
+        if not file.endswith(".csv"):
+            continue
+        features, columns = schema.read_columns(
+            os.path.join(directory, file), replay_columns
+        )
+        complete = np.isfinite(features).all(axis=1)
+        for values in columns.values():
+            complete &= np.isfinite(values)
+        recordings.append(
+            (
+                pd.DataFrame(
+                    {name: values[complete] for name, values in columns.items()}
+                ),
+                features[complete],
+            )
+        )
+    return recordings
+
+
+def main():
+    from src.modelling.prediction import FallPrediction, get_model_and_scaler_paths
+
+    parser = argparse.ArgumentParser(
+        description="Replay labelled recordings through the impact-gated cascade"
+    )
+    parser.add_argument("--replay", default="data/processed/")
+    parser.add_argument("--jerk-threshold", type=float, default=IMPACT_JERK_THRESHOLD)
+    parser.add_argument("--g-force-threshold", type=float)
+    parser.add_argument("--energy-threshold", type=float)
+    parser.add_argument("--energy-window", type=int, default=16)
+    parser.add_argument("--refractory", type=int, default=100)
+    parser.add_argument("--dense-stride", type=int, default=10)
+    parser.add_argument("--output", default=CASCADE_REPORT_PATH)
+    args = parser.parse_args()
+
+    model_path, scaler_path = get_model_and_scaler_paths()
+    first_file = next(
+        file for file in sorted(os.listdir(args.replay)) if file.endswith(".csv")
+    )
+    predictor = FallPrediction(
+        model_path, scaler_path, os.path.join(args.replay, first_file)
+    )
+    if predictor.feature_schema is None:
+        raise ValueError("The cascade replay needs a model saved with a feature schema")
+    detector = CascadeDetector(
+        predictor,
+        ImpactPrefilter(
+            jerk_threshold=args.jerk_threshold,
+            g_force_threshold=args.g_force_threshold,
+            energy_threshold=args.energy_threshold,
+            energy_window=args.energy_window,
+            refractory=args.refractory,
+        ),
+    )
+    report = evaluate_replay(
+        detector,
+        load_replay_set(args.replay, predictor, detector.prefilter),
+        args.dense_stride,
+    )
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    detector.model_helper.log_info(f"Cascade report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
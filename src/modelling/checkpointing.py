@@ -0,0 +1,200 @@
+import json
+import os
+import random
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import tensorflow as tf
+from loguru import logger
+
+CHECKPOINT_ROOT = "models/checkpoints"
+HISTORY_FILE_NAME = "history.json"
+EARLY_STOPPING_STATE = ("wait", "best", "stopped_epoch", "best_epoch")
+
+
+def new_run_id() -> str:
+    return os.environ.get(
+        "AIRFLOW_CTX_DAG_RUN_ID", datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
+    )
+
+
+def latest_run_id(checkpoint_root: str = CHECKPOINT_ROOT) -> Optional[str]:
+    if not os.path.isdir(checkpoint_root):
+        return None
+    run_directories = [
+        os.path.join(checkpoint_root, name)
+        for name in os.listdir(checkpoint_root)
+        if os.path.isdir(os.path.join(checkpoint_root, name))
+    ]
+    if not run_directories:
+        return None
+    return os.path.basename(max(run_directories, key=os.path.getmtime))
+
+
+def capture_rng_state() -> dict:
+    numpy_state = np.random.get_state()
+    python_state = random.getstate()
+    return {
+        "numpy": [
+            numpy_state[0],
+            numpy_state[1].tolist(),
+            *[float(value) for value in numpy_state[2:]],
+        ],
+        "python": [python_state[0], list(python_state[1]), python_state[2]],
+        "tensorflow": tf.random.get_global_generator().state.numpy().tolist(),
+    }
+
+
+def restore_rng_state(state: dict) -> None:
+    name, keys, position, has_gauss, cached_gaussian = state["numpy"]
+    np.random.set_state(
+        (
+            name,
+            np.array(keys, dtype=np.uint32),
+            int(position),
+            int(has_gauss),
+            cached_gaussian,
+        )
+    )
+    version, internal_state, gauss_next = state["python"]
+    random.setstate((version, tuple(internal_state), gauss_next))
+    tf.random.get_global_generator().reset(
+        np.array(state["tensorflow"], dtype=np.int64)
+    )
+
+
+class TrainingCheckpointer(tf.keras.callbacks.Callback):
+    """Periodically checkpoints a training phase so an interrupted run can resume.
+
+    The model weights, optimizer state and epoch go into a tf.train.Checkpoint
+    written asynchronously. A JSON sidecar per checkpoint holds the RNG state,
+    the per-epoch history so far and the state of ``early_stopping``, so a
+    resumed phase reports and stops on all of its epochs. Only the latest
+    ``max_to_keep`` checkpoints are retained.
+
+    ``early_stopping`` must come before the checkpointer in the callbacks.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_to_keep: int = 3,
+        save_every_epochs: int = 1,
+        early_stopping: Optional[tf.keras.callbacks.EarlyStopping] = None,
+    ):
+        super().__init__()
+        self.directory = directory
+        self.max_to_keep = max_to_keep
+        self.save_every_epochs = save_every_epochs
+        self.early_stopping = early_stopping
+        self.epoch = tf.Variable(0, dtype=tf.int64, trainable=False)
+        self.last_epoch = 0
+        self.history = {}
+        self.restored_early_stopping = None
+        self.checkpoint = None
+        self.manager = None
+        self.options = tf.train.CheckpointOptions(
+            experimental_enable_async_checkpoint=True
+        )
+
+    def attach(self, model: tf.keras.Model) -> None:
+        if self.checkpoint is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self.checkpoint = tf.train.Checkpoint(
+            model=model, optimizer=model.optimizer, epoch=self.epoch
+        )
+        self.manager = tf.train.CheckpointManager(
+            self.checkpoint, self.directory, max_to_keep=self.max_to_keep
+        )
+
+    def restore(self, model: tf.keras.Model) -> int:
+        """Restores the latest checkpoint and returns the epoch to resume from."""
+        self.attach(model)
+        latest_checkpoint = self.manager.latest_checkpoint
+        if latest_checkpoint is None:
+            logger.info(f"No checkpoint in {self.directory}, starting from epoch 0")
+            return 0
+
+        self.checkpoint.restore(latest_checkpoint).expect_partial()
+        state_path = self._state_path(latest_checkpoint)
+        if os.path.exists(state_path):
+            with open(state_path, "r") as file:
+                state = json.load(file)
+            restore_rng_state(state["rng"])
+            self.history = state["history"]
+            self.restored_early_stopping = state["early_stopping"]
+        initial_epoch = int(self.epoch.numpy())
+        self.last_epoch = initial_epoch
+        logger.info(f"Resumed from {latest_checkpoint} at epoch {initial_epoch}")
+        return initial_epoch
+
+    def completed_history(self) -> Optional[dict]:
+        """The history of the phase when it already ran to completion."""
+        history_path = os.path.join(self.directory, HISTORY_FILE_NAME)
+        if not os.path.exists(history_path):
+            return None
+        with open(history_path, "r") as file:
+            return json.load(file)
+
+    def set_model(self, model: tf.keras.Model) -> None:
+        super().set_model(model)
+        self.attach(model)
+
+    def on_train_begin(self, logs: dict = None) -> None:
+        # EarlyStopping resets itself when training begins, so its restored
+        # state is applied afterwards.
+        if self.early_stopping is not None and self.restored_early_stopping:
+            for name, value in self.restored_early_stopping.items():
+                setattr(self.early_stopping, name, value)
+
+    def on_epoch_end(self, epoch: int, logs: dict = None) -> None:
+        for name, value in (logs or {}).items():
+            self.history.setdefault(name, []).append(float(value))
+        self.last_epoch = epoch + 1
+        if self.last_epoch % self.save_every_epochs == 0:
+            self._save(self.last_epoch)
+
+    def on_train_end(self, logs: dict = None) -> None:
+        if self.last_epoch != int(self.epoch.numpy()):
+            self._save(self.last_epoch)
+        # Waits for the asynchronous writes before the phase is marked complete.
+        self.checkpoint.sync()
+        with open(os.path.join(self.directory, HISTORY_FILE_NAME), "w") as file:
+            json.dump(self.history, file, indent=2)
+
+    def _save(self, epoch: int) -> None:
+        self.epoch.assign(epoch)
+        saved_path = self.manager.save(checkpoint_number=epoch, options=self.options)
+        with open(self._state_path(saved_path), "w") as file:
+            json.dump(
+                {
+                    "rng": capture_rng_state(),
+                    "history": self.history,
+                    "early_stopping": self._early_stopping_state(),
+                },
+                file,
+            )
+        self._prune_states()
+        logger.info(f"Checkpoint for epoch {epoch} written to {saved_path}")
+
+    def _early_stopping_state(self) -> Optional[dict]:
+        if self.early_stopping is None:
+            return None
+        return {
+            name: (float if name == "best" else int)(getattr(self.early_stopping, name))
+            for name in EARLY_STOPPING_STATE
+            if hasattr(self.early_stopping, name)
+        }
+
+    def _prune_states(self) -> None:
+        kept = {self._state_path(path) for path in self.manager.checkpoints}
+        for file_name in os.listdir(self.directory):
+            path = os.path.join(self.directory, file_name)
+            if file_name.endswith(".state.json") and path not in kept:
+                os.remove(path)
+
+    @staticmethod
+    def _state_path(checkpoint_path: str) -> str:
+        return f"{checkpoint_path}.state.json"
@@ -0,0 +1,131 @@
+import csv
+import dataclasses
+import json
+import os
+from typing import Optional
+
+import numpy as np
+
+from src.processing.dtypes import pyarrow_available
+from src.processing.feature_selection import NON_FEATURE_COLUMNS
+
+SCHEMA_FILE_NAME = "feature_schema.json"
+SCHEMA_VERSION = 1
+
+
+@dataclasses.dataclass
+class FeatureSchema:
+    """Names, order and source dtypes of the columns the scaler and model expect.
+
+    Readers map the names onto each file's header and load the columns by
+    integer index, so files whose columns are reordered or carry extra
+    columns still produce arrays in the trained order.
+    """
+
+    names: list
+    dtypes: list
+    version: int = SCHEMA_VERSION
+
+    @classmethod
+    def from_header(
+        cls,
+        header: list[str],
+        dtypes: dict,
+        exclude: tuple = NON_FEATURE_COLUMNS,
+        features: Optional[list] = None,
+    ) -> "FeatureSchema":
+        names = features or [name for name in header if name not in exclude]
+        return cls(names=list(names), dtypes=[str(dtypes[name]) for name in names])
+
+    @classmethod
+    def load(cls, path: str) -> Optional["FeatureSchema"]:
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as file:
+            return cls(**json.load(file))
+
+    @classmethod
+    def load_next_to(cls, artifact_path: str) -> Optional["FeatureSchema"]:
+        return cls.load(schema_path_next_to(artifact_path))
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as file:
+            json.dump(dataclasses.asdict(self), file, indent=2)
+
+    def column_indices(self, header: list[str]) -> list[int]:
+        positions = {name: index for index, name in enumerate(header)}
+        missing = [name for name in self.names if name not in positions]
+        if missing:
+            raise ValueError(f"Columns {missing} required by the feature schema")
+        return [positions[name] for name in self.names]
+
+    def read_columns(
+        self, path: str, extra_columns: tuple = ()
+    ) -> tuple[np.ndarray, dict]:
+        """Loads the schema columns into a float32 array and each of
+        ``extra_columns`` into its own float32 array, in one parse.
+
+        Columns are read by their index in the header straight into arrays,
+        without building a DataFrame, and empty fields become NaN.
+        """
+        header = read_header(path)
+        missing = [name for name in extra_columns if name not in header]
+        if missing:
+            raise ValueError(f"Columns {missing} not found in {path}")
+        extra = [name for name in extra_columns if name not in self.names]
+        indices = self.column_indices(header) + [header.index(name) for name in extra]
+        data = read_float32_columns(path, header, indices)
+        positions = {name: index for index, name in enumerate(self.names + extra)}
+        features = data[:, : len(self.names)]
+        return features, {
+            name: data[:, positions[name]].copy() for name in extra_columns
+        }
+
+    def read_csv(self, path: str, drop_incomplete_rows: bool = True) -> np.ndarray:
+        """Loads the schema columns of a CSV file into a float32 array.
+
+        Empty fields become NaN, and rows holding one are dropped by default.
+        """
+        data, _ = self.read_columns(path)
+        if drop_incomplete_rows:
+            data = data[~np.isnan(data).any(axis=1)]
+        return data
+
+
+def schema_path_next_to(artifact_path: str) -> str:
+    return os.path.join(os.path.dirname(artifact_path), SCHEMA_FILE_NAME)
+
+
+def read_header(path: str) -> list[str]:
+    with open(path, "r", newline="") as file:
+        return next(csv.reader(file))
+
+
+def read_float32_columns(
+    path: str, header: list[str], indices: list[int]
+) -> np.ndarray:
+    """The columns at ``indices`` as a 2-D float32 array, through pyarrow when
+    it is installed."""
+    if pyarrow_available():
+        from pyarrow import csv as pyarrow_csv, float32
+
+        names = [header[index] for index in indices]
+        table = pyarrow_csv.read_csv(
+            path,
+            convert_options=pyarrow_csv.ConvertOptions(
+                include_columns=list(dict.fromkeys(names)),
+                column_types={name: float32() for name in names},
+            ),
+        )
+        return np.column_stack(
+            [table.column(name).to_numpy().astype(np.float32) for name in names]
+        ).reshape(table.num_rows, len(names))
+    return np.genfromtxt(
+        path,
+        delimiter=",",
+        skip_header=1,
+        usecols=indices,
+        dtype=np.float32,
+        ndmin=2,
+    ).reshape(-1, len(indices))
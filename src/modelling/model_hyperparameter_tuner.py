@@ -1,5 +1,11 @@
+import argparse
+import dataclasses
+import hashlib
 import json
+import multiprocessing
 import os
+import time
+from typing import Optional
 from keras_tuner import HyperModel
 from keras_tuner import HyperParameters
 from keras_tuner import Objective
@@ -12,6 +18,22 @@ from src.helper_functions.model_helper_functions import (
     ModelHelpingFunctions,
 )
 from src.modelling.model_utilities import ModelUtilities
+from src.modelling.timed_tuners import (
+    TimedBayesianOptimization,
+    TimedHyperband,
+    summarize_trial_times,
+)
+
+SEARCH_MODES = ("bayesian", "hyperband")
+
+DATA_CACHE_ARRAYS = (
+    "train_sequences",
+    "val_sequences",
+    "test_sequences",
+    "train_labels",
+    "val_labels",
+    "test_labels",
+)
 
 
 class ModelHyperparameterTuner(HyperModel):
@@ -26,6 +48,16 @@ class ModelHyperparameterTuner(HyperModel):
         self.model_helper = ModelHelpingFunctions()
         self.model_utilities = ModelUtilities()
         self.input_shape = None
+        self.data_directory = "data/seq/"
+        self.data_cache_directory = os.path.join(self.directory, "data_cache")
+        self.oracle_port = 8000
+        self.search_mode = "bayesian"
+        self.hyperband_max_epochs = self.epochs
+        self.hyperband_factor = 3
+        self.hyperband_iterations = 1
+        self.max_latency_ms = None
+        self.max_params = None
+        self.latency_runs = 50
 
     def _load_data(
         self,
@@ -65,6 +97,74 @@ class ModelHyperparameterTuner(HyperModel):
                 f"An error occurred while loading data for hyperparameter tuning: {e}"
             )
 
+    def _data_fingerprint(self) -> dict:
+        """Identifies the cached inputs: the name, size and mtime of every
+        sequence file, and the feature schema the columns are read with."""
+        files = sorted(os.listdir(self.data_directory))
+        digest = hashlib.sha256()
+        for file_name in files:
+            stat = os.stat(os.path.join(self.data_directory, file_name))
+            digest.update(f"{file_name}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+        csv_files = [file_name for file_name in files if file_name.endswith(".csv")]
+        feature_schema = (
+            self.model_utilities._ensure_feature_schema(
+                os.path.join(self.data_directory, csv_files[0])
+            )
+            if csv_files
+            else None
+        )
+        return {
+            "files": len(files),
+            "files_sha256": digest.hexdigest(),
+            "feature_schema": (
+                dataclasses.asdict(feature_schema) if feature_schema else None
+            ),
+        }
+
+    def _load_cached_data(
+        self,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Preprocesses once and memory-maps the result for every tuning process."""
+        try:
+            fingerprint_path = os.path.join(
+                self.data_cache_directory, "fingerprint.json"
+            )
+            fingerprint = self._data_fingerprint()
+            cached_fingerprint = None
+            if os.path.exists(fingerprint_path):
+                with open(fingerprint_path, "r") as file:
+                    cached_fingerprint = json.load(file)
+
+            if cached_fingerprint != fingerprint:
+                self.model_helper.log_info("Building preprocessed data cache...")
+                os.makedirs(self.data_cache_directory, exist_ok=True)
+                for name, array in zip(DATA_CACHE_ARRAYS, self._load_data()):
+                    dtype = np.float32 if name.endswith("sequences") else np.int8
+                    np.save(
+                        os.path.join(self.data_cache_directory, f"{name}.npy"),
+                        np.asarray(array, dtype=dtype),
+                    )
+                with open(fingerprint_path, "w") as file:
+                    json.dump(fingerprint, file)
+
+            self.model_helper.log_info(
+                f"Memory-mapping preprocessed data from {self.data_cache_directory}"
+            )
+            arrays = tuple(
+                np.load(
+                    os.path.join(self.data_cache_directory, f"{name}.npy"),
+                    mmap_mode="r",
+                )
+                for name in DATA_CACHE_ARRAYS
+            )
+            self.input_shape = arrays[0].shape[1:]
+            return arrays
+        except Exception as e:
+            self.model_helper.log_exception(
+                f"An error occurred while loading cached tuning data: {e}"
+            )
+            raise Exception(f"Error loading cached tuning data: {e}")
+
     def build(self, hp: HyperParameters) -> tf.keras.Model:
         model = tf.keras.Sequential()
         model.add(tf.keras.layers.Masking(mask_value=0.0, input_shape=self.input_shape))
@@ -144,6 +244,116 @@ class ModelHyperparameterTuner(HyperModel):
         )
         return model
 
+    def fit(self, hp: HyperParameters, model: tf.keras.Model, *args, **kwargs):
+        history = model.fit(*args, **kwargs)
+        training_data = args[0] if args else kwargs["x"]
+        p95_latency_ms, param_count = self._measure_inference_cost(
+            model, np.asarray(training_data[:1], dtype=np.float32)
+        )
+
+        feasible = self._is_feasible(p95_latency_ms, param_count)
+        epochs = len(history.history[self.objective])
+        history.history["p95_latency_ms"] = [p95_latency_ms] * epochs
+        history.history["param_count"] = [float(param_count)] * epochs
+        history.history["constrained_score"] = [
+            score if feasible else score - 1.0
+            for score in history.history[self.objective]
+        ]
+        self.model_helper.log_info(
+            f"Trial model: {param_count} parameters, "
+            f"p95 latency {p95_latency_ms:.2f} ms per window, feasible: {feasible}"
+        )
+        return history
+
+    def _measure_inference_cost(
+        self, model: tf.keras.Model, window: np.ndarray
+    ) -> tuple[float, int]:
+        with tf.device("/CPU:0"):
+            for _ in range(5):
+                model(window, training=False)
+            timings = []
+            for _ in range(self.latency_runs):
+                start_time = time.perf_counter()
+                model(window, training=False)
+                timings.append((time.perf_counter() - start_time) * 1000)
+        return float(np.percentile(timings, 95)), model.count_params()
+
+    def _is_feasible(self, p95_latency_ms: float, param_count: int) -> bool:
+        return (
+            self.max_latency_ms is None or p95_latency_ms <= self.max_latency_ms
+        ) and (self.max_params is None or param_count <= self.max_params)
+
+    def _search_objective(self) -> Objective:
+        if self.max_latency_ms is None and self.max_params is None:
+            return Objective(self.objective, direction="max")
+        return Objective("constrained_score", direction="max")
+
+    def _save_pareto_front(
+        self, tuner: BayesianOptimization, latencies: Optional[dict] = None
+    ) -> list[dict]:
+        """Saves the trials not dominated on accuracy, latency and size.
+
+        ``latencies`` maps trial ids to re-measured p95 latencies that replace
+        the ones recorded during the search.
+        """
+        latencies = latencies or {}
+        candidates = []
+        for trial in tuner.oracle.trials.values():
+            if not trial.metrics.exists(self.objective):
+                continue
+            if not trial.metrics.exists("p95_latency_ms"):
+                continue
+            candidates.append(
+                {
+                    "trial_id": trial.trial_id,
+                    self.objective: trial.metrics.get_best_value(self.objective),
+                    "p95_latency_ms": latencies.get(
+                        trial.trial_id,
+                        trial.metrics.get_last_value("p95_latency_ms"),
+                    ),
+                    "param_count": int(trial.metrics.get_last_value("param_count")),
+                    "hyperparameters": trial.hyperparameters.values,
+                }
+            )
+
+        def dominates(a: dict, b: dict) -> bool:
+            no_worse = (
+                a[self.objective] >= b[self.objective]
+                and a["p95_latency_ms"] <= b["p95_latency_ms"]
+                and a["param_count"] <= b["param_count"]
+            )
+            better = (
+                a[self.objective] > b[self.objective]
+                or a["p95_latency_ms"] < b["p95_latency_ms"]
+                or a["param_count"] < b["param_count"]
+            )
+            return no_worse and better
+
+        pareto_front = sorted(
+            (
+                candidate
+                for candidate in candidates
+                if not any(dominates(other, candidate) for other in candidates)
+            ),
+            key=lambda candidate: -candidate[self.objective],
+        )
+        path_to_save = "hyperparameters/pareto_front.json"
+        os.makedirs(os.path.dirname(path_to_save), exist_ok=True)
+        with open(path_to_save, "w") as file:
+            json.dump(
+                {
+                    "max_latency_ms": self.max_latency_ms,
+                    "max_params": self.max_params,
+                    "front": pareto_front,
+                },
+                file,
+                indent=2,
+            )
+        self.model_helper.log_info(
+            f"Pareto front of {len(pareto_front)} trials saved to {path_to_save}"
+        )
+        return pareto_front
+
     def _model_tuner(
         self,
         objective: Objective,
@@ -153,15 +363,33 @@ class ModelHyperparameterTuner(HyperModel):
         directory: str,
     ) -> BayesianOptimization:
         try:
-            self.model_helper.log_info("Setting up Hyperparameter Tuner...")
-            tuner = BayesianOptimization(
-                hypermodel=self,
-                objective=objective,
-                max_trials=max_trials,
-                seed=seed,
-                project_name=project_name,
-                directory=directory,
+            self.model_helper.log_info(
+                f"Setting up {self.search_mode} Hyperparameter Tuner..."
             )
+            if objective.name != self.objective:
+                project_name = f"{project_name}_constrained"
+            if self.search_mode == "hyperband":
+                tuner = TimedHyperband(
+                    hypermodel=self,
+                    objective=objective,
+                    max_epochs=self.hyperband_max_epochs,
+                    factor=self.hyperband_factor,
+                    hyperband_iterations=self.hyperband_iterations,
+                    seed=seed,
+                    project_name=f"{project_name}_hyperband",
+                    directory=directory,
+                    overwrite=False,
+                )
+            else:
+                tuner = TimedBayesianOptimization(
+                    hypermodel=self,
+                    objective=objective,
+                    max_trials=max_trials,
+                    seed=seed,
+                    project_name=project_name,
+                    directory=directory,
+                    overwrite=False,
+                )
             self.model_helper.log_info("Hyperparameter Tuner set up")
             return tuner
         except Exception as e:
@@ -219,6 +447,7 @@ class ModelHyperparameterTuner(HyperModel):
     def orchestrate_tuning(self) -> dict:
         try:
             self.model_helper.log_info("Orchestrating hyperparameter tuning...")
+            tf.keras.utils.set_random_seed(self.seed)
             (
                 train_sequences,
                 val_sequences,
@@ -226,13 +455,13 @@ class ModelHyperparameterTuner(HyperModel):
                 train_labels,
                 val_labels,
                 test_labels,
-            ) = self._load_data()
+            ) = self._load_cached_data()
             self.model_helper.log_info(
                 f"Train Sequences Shape: {train_sequences[0].shape}"
             )
             model = self.build(hp=HyperParameters())
             tuner = self._model_tuner(
-                Objective(self.objective, direction="max"),
+                self._search_objective(),
                 max_trials=self.max_trials,
                 seed=self.seed,
                 project_name=self.project_name,
@@ -246,7 +475,11 @@ class ModelHyperparameterTuner(HyperModel):
                 validation_labels=val_labels,
                 epochs=self.epochs,
             )
-            self._save_best_params(best_params)
+            if tuner.tuner_id == "chief" or "KERASTUNER_TUNER_ID" not in os.environ:
+                self._save_best_params(best_params)
+                self._save_trial_times(tuner)
+                self._save_search_report()
+                self._save_pareto_front(tuner)
             self.model_helper.log_info("Hyperparameter tuning complete")
             return best_params
         except Exception as e:
@@ -255,10 +488,235 @@ class ModelHyperparameterTuner(HyperModel):
             )
             raise Exception(f"Error orchestrating hyperparameter tuning: {e}")
 
+    def orchestrate_parallel_tuning(self, workers: int) -> dict:
+        """Runs a keras-tuner chief and ``workers`` worker processes on this host.
+
+        Workers share the memory-mapped data cache and the tuner directory, so
+        an interrupted search resumes from the trials already recorded there.
+        Latencies are re-measured once all processes have finished.
+        """
+        try:
+            self.model_helper.log_info(
+                f"Orchestrating parallel hyperparameter tuning with {workers} workers"
+            )
+            train_sequences = self._load_cached_data()[0]
+            context = multiprocessing.get_context("spawn")
+            threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+            processes = [
+                context.Process(
+                    target=_run_tuning_process,
+                    args=(
+                        tuner_id,
+                        self.oracle_port,
+                        threads_per_worker,
+                        self.search_mode,
+                        self.hyperband_max_epochs,
+                        self.hyperband_factor,
+                        self.max_latency_ms,
+                        self.max_params,
+                    ),
+                )
+                for tuner_id in ["chief"] + [f"tuner{i}" for i in range(workers)]
+            ]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+
+            failed = [p.name for p in processes if p.exitcode != 0]
+            if failed:
+                raise RuntimeError(f"Tuning processes failed: {failed}")
+
+            self._rank_uncontended(np.asarray(train_sequences[:1], dtype=np.float32))
+            with open("hyperparameters/best_params.json", "r") as file:
+                best_params = json.load(file)
+            self.model_helper.log_info("Parallel hyperparameter tuning complete")
+            return best_params
+        except Exception as e:
+            self.model_helper.log_exception(
+                f"An error occurred while orchestrating parallel tuning: {e}"
+            )
+            raise Exception(f"Error orchestrating parallel tuning: {e}")
+
+    def _remeasure_latencies(
+        self, tuner: BayesianOptimization, window: np.ndarray
+    ) -> dict:
+        latencies = {}
+        for trial in tuner.oracle.trials.values():
+            if not trial.metrics.exists("p95_latency_ms"):
+                continue
+            latencies[trial.trial_id], _ = self._measure_inference_cost(
+                tuner.load_model(trial), window
+            )
+        return latencies
+
+    def _rank_uncontended(self, window: np.ndarray) -> None:
+        """Re-measures every trial's latency once the workers have stopped,
+        then rebuilds the Pareto front and, under constraints, the best
+        parameters from those numbers.
+
+        During a parallel search each trial is timed while the other workers
+        train on the same CPUs, so the recorded latencies reflect contention.
+        """
+        tuner = self._model_tuner(
+            self._search_objective(),
+            max_trials=self.max_trials,
+            seed=self.seed,
+            project_name=self.project_name,
+            directory=self.directory,
+        )
+        latencies = self._remeasure_latencies(tuner, window)
+        self.model_helper.log_info(
+            f"Re-measured the latency of {len(latencies)} trials without contention"
+        )
+        pareto_front = self._save_pareto_front(tuner, latencies)
+        if self.max_latency_ms is None and self.max_params is None:
+            return
+
+        feasible = [
+            candidate
+            for candidate in pareto_front
+            if self._is_feasible(candidate["p95_latency_ms"], candidate["param_count"])
+        ]
+        if not feasible:
+            self.model_helper.log_warning(
+                "No trial meets the constraints without contention, "
+                "keeping the best parameters of the search"
+            )
+            return
+        best = max(feasible, key=lambda candidate: candidate[self.objective])
+        self._save_best_params(best["hyperparameters"])
+
+    def _save_trial_times(self, tuner: BayesianOptimization) -> None:
+        summary = summarize_trial_times(tuner.project_dir)
+        best_trials = tuner.oracle.get_best_trials(1)
+        summary["best_score"] = best_trials[0].score if best_trials else None
+        path_to_save = os.path.join(tuner.project_dir, "trial_times_summary.json")
+        with open(path_to_save, "w") as file:
+            json.dump(summary, file, indent=2)
+        self.model_helper.log_info(
+            f"{summary['trials']} trials took {summary['total_wall_time_seconds']}s "
+            f"in total, {summary['mean_wall_time_seconds']}s on average"
+        )
+
+    def _load_trial_times_summary(self, project_name: str) -> Optional[dict]:
+        path = os.path.join(self.directory, project_name, "trial_times_summary.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as file:
+            return json.load(file)
+
+    def _save_search_report(self) -> None:
+        """Compares the compute spent by the Hyperband and Bayesian searches."""
+        bayesian = self._load_trial_times_summary(self.project_name)
+        hyperband = self._load_trial_times_summary(f"{self.project_name}_hyperband")
+        if bayesian is None or hyperband is None:
+            self.model_helper.log_info(
+                "Search report needs both a Bayesian and a Hyperband run"
+            )
+            return
+
+        report = {
+            "bayesian": bayesian,
+            "hyperband": hyperband,
+            "epochs_saved": bayesian["total_epochs_trained"]
+            - hyperband["total_epochs_trained"],
+            "wall_time_saved_seconds": round(
+                bayesian["total_wall_time_seconds"]
+                - hyperband["total_wall_time_seconds"],
+                3,
+            ),
+        }
+        if bayesian["best_score"] is not None and hyperband["best_score"] is not None:
+            report["best_score_delta"] = (
+                hyperband["best_score"] - bayesian["best_score"]
+            )
+
+        path_to_save = "hyperparameters/search_report.json"
+        os.makedirs(os.path.dirname(path_to_save), exist_ok=True)
+        with open(path_to_save, "w") as file:
+            json.dump(report, file, indent=2)
+        self.model_helper.log_info(
+            f"Hyperband saved {report['epochs_saved']} epochs and "
+            f"{report['wall_time_saved_seconds']}s versus the Bayesian search"
+        )
+
+
+def _run_tuning_process(
+    tuner_id: str,
+    oracle_port: int,
+    threads: int,
+    search_mode: str,
+    hyperband_max_epochs: int,
+    hyperband_factor: int,
+    max_latency_ms: Optional[float],
+    max_params: Optional[int],
+) -> None:
+    os.environ["KERASTUNER_TUNER_ID"] = tuner_id
+    os.environ["KERASTUNER_ORACLE_IP"] = "127.0.0.1"
+    os.environ["KERASTUNER_ORACLE_PORT"] = str(oracle_port)
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+    model_tuner = ModelHyperparameterTuner()
+    model_tuner.search_mode = search_mode
+    model_tuner.hyperband_max_epochs = hyperband_max_epochs
+    model_tuner.hyperband_factor = hyperband_factor
+    model_tuner.max_latency_ms = max_latency_ms
+    model_tuner.max_params = max_params
+    model_tuner.orchestrate_tuning()
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Tune model hyperparameters")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of parallel worker processes (1 runs in-process)",
+    )
+    parser.add_argument(
+        "--search-mode",
+        choices=SEARCH_MODES,
+        default="bayesian",
+        help="Bayesian optimisation or Hyperband successive halving",
+    )
+    parser.add_argument(
+        "--max-epochs",
+        type=int,
+        default=None,
+        help="Hyperband resource budget: epochs given to the best trials",
+    )
+    parser.add_argument(
+        "--factor",
+        type=int,
+        default=3,
+        help="Hyperband reduction factor between brackets",
+    )
+    parser.add_argument(
+        "--max-latency-ms",
+        type=float,
+        default=None,
+        help="Only rank trials whose p95 CPU latency per window is below this",
+    )
+    parser.add_argument(
+        "--max-params",
+        type=int,
+        default=None,
+        help="Only rank trials whose parameter count is below this",
+    )
+    args = parser.parse_args()
+
     model_tuner = ModelHyperparameterTuner()
-    best_params = model_tuner.orchestrate_tuning()
+    model_tuner.max_latency_ms = args.max_latency_ms
+    model_tuner.max_params = args.max_params
+    model_tuner.search_mode = args.search_mode
+    model_tuner.hyperband_factor = args.factor
+    if args.max_epochs is not None:
+        model_tuner.hyperband_max_epochs = args.max_epochs
+    if args.workers > 1:
+        best_params = model_tuner.orchestrate_parallel_tuning(args.workers)
+    else:
+        best_params = model_tuner.orchestrate_tuning()
     print(best_params)
 
 
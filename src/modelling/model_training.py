@@ -1,4 +1,9 @@
+import argparse
+import json
 import os
+import shutil
+import time
+from contextlib import contextmanager
 from datetime import datetime
 
 import numpy as np
@@ -7,13 +12,41 @@ import tensorflow as tf
 from src.helper_functions.model_helper_functions import (
     ModelHelpingFunctions,
 )
+from src.modelling.bucketing import BucketedSequence, bucket_boundaries, padding_report
+from src.modelling.checkpointing import (
+    CHECKPOINT_ROOT,
+    TrainingCheckpointer,
+    latest_run_id,
+    new_run_id,
+)
+from src.modelling.feature_schema import SCHEMA_FILE_NAME
 from src.modelling.model_utilities import ModelUtilities
+from src.modelling.training_config import FINAL_TRAINING_POLICIES, TrainingConfig
 
 
 class ModelTraining:
-    def __init__(self):
+    def __init__(
+        self,
+        training_config: TrainingConfig = None,
+        run_id: str = None,
+        resume: bool = False,
+        restart: bool = False,
+    ):
         self.model_helper = ModelHelpingFunctions()
         self.model_utilities = ModelUtilities()
+        self.training_config = training_config or TrainingConfig.load()
+        self.training_config.apply_runtime_settings()
+        self.phase_times = {}
+        self.scaler = None
+        self.bucket_lengths = None
+        self.restart = restart
+        self.resumed = False
+        if run_id is None and resume:
+            run_id = latest_run_id()
+        self.run_id = run_id or new_run_id()
+        self.model_helper.log_info(
+            f"Training run {self.run_id}, resume={resume}, restart={restart}"
+        )
 
     def _create_model(self, input_shape: tuple[int]) -> tf.keras.Model:
         self.model_helper.log_info(f"Creating model with input shape: {input_shape}")
@@ -65,19 +98,30 @@ class ModelTraining:
                 tf.keras.layers.Dense(
                     best_hyperparameters["dense_units"], activation="relu"
                 ),
-                tf.keras.layers.Dense(1, activation="sigmoid"),
+                # Kept in float32 so the sigmoid output and loss stay stable
+                # under a mixed precision policy.
+                tf.keras.layers.Dense(1, activation="sigmoid", dtype="float32"),
             ]
         )
         optimizer = tf.keras.optimizers.Adam(
             learning_rate=best_hyperparameters["learning_rate"]
         )
         model.compile(
-            loss="binary_crossentropy", optimizer=optimizer, metrics=["accuracy"]
+            loss="binary_crossentropy",
+            optimizer=optimizer,
+            metrics=["accuracy"],
+            jit_compile=self.training_config.jit_compile,
+            steps_per_execution=self.training_config.steps_per_execution,
         )
         self.model_helper.log_info("Model created")
         return model
 
-    def _save_model(self, model: tf.keras.Model) -> None:
+    def _save_model(
+        self,
+        model: tf.keras.Model,
+        metrics: dict = None,
+        training_report: dict = None,
+    ) -> None:
         try:
             self.model_helper.log_info("Saving model")
             date = datetime.now().strftime("%Y-%m-%d")
@@ -85,6 +129,16 @@ class ModelTraining:
             if not os.path.exists(directory):
                 os.makedirs(directory)
             model.save(f"{directory}/fall_detection_model.keras")
+            if self.model_utilities.feature_schema is not None:
+                self.model_utilities.feature_schema.save(
+                    f"{directory}/{SCHEMA_FILE_NAME}"
+                )
+            if metrics:
+                with open(f"{directory}/metrics.json", "w") as file:
+                    json.dump(metrics, file, indent=2)
+            if training_report:
+                with open(f"{directory}/training_report.json", "w") as file:
+                    json.dump(training_report, file, indent=2)
             self.model_helper.log_info("Model saved")
 
         except FileNotFoundError as e:
@@ -95,43 +149,261 @@ class ModelTraining:
             self.model_helper.log_exception(e)
             raise Exception(f"Error saving model: {e}")
 
-    def start(self) -> None:
-        fall_data, non_fall_data = self.model_utilities.load_data()
-        fall_labels, non_fall_labels = self.model_utilities.prepare_labels(
-            fall_data, non_fall_data
-        )
-        all_sequences = list(fall_data) + list(non_fall_data)
-        all_labels = fall_labels + non_fall_labels
-        padded_sequences = self.model_utilities.pad_sequences(all_sequences)
-        scaled_sequences = self.model_utilities.scale_sequences(padded_sequences)
-
-        
-        # For training and evaluating the model, we can use the following code:
-        (
-            train_sequences,
-            val_sequences,
-            test_sequences,
-            train_labels,
-            val_labels,
-            test_labels,
-        ) = self.model_utilities.prep_train_val_test_data(scaled_sequences, all_labels)
-        model = self._create_model(train_sequences[0].shape)
-        history = self.model_utilities.train_model(
-         model, train_sequences, train_labels, val_sequences, val_labels
+    @contextmanager
+    def _timed_phase(self, phase: str):
+        start_time = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - start_time
+        self.phase_times[phase] = round(elapsed, 3)
+        self.model_helper.log_info(f"Phase {phase} took {elapsed:.1f}s")
+
+    def _checkpointed_fit(
+        self,
+        phase: str,
+        model: tf.keras.Model,
+        fit,
+        early_stopping: tf.keras.callbacks.EarlyStopping = None,
+    ) -> tf.keras.callbacks.History:
+        """Runs ``fit(callbacks, initial_epoch)`` with checkpoints for the phase.
+
+        A phase with checkpoints under this run id continues from the latest
+        one and a phase that already completed is not trained again, so a
+        retried run picks up where it stopped; ``restart`` discards them
+        instead. The returned history covers every epoch of the phase.
+        """
+        directory = os.path.join(CHECKPOINT_ROOT, self.run_id, phase)
+        if self.restart and os.path.isdir(directory):
+            self.model_helper.log_warning(f"Discarding checkpoints in {directory}")
+            shutil.rmtree(directory)
+        checkpointer = TrainingCheckpointer(
+            directory,
+            max_to_keep=self.training_config.checkpoints_to_keep,
+            save_every_epochs=self.training_config.checkpoint_every_epochs,
+            early_stopping=early_stopping,
         )
 
-        self.model_utilities.evaluate_model(model, test_sequences, test_labels)
-        
+        initial_epoch = checkpointer.restore(model)
+        completed_history = checkpointer.completed_history()
+        self.resumed = self.resumed or initial_epoch > 0
+        if completed_history is not None:
+            self.model_helper.log_info(f"Phase {phase} already completed")
+            self.resumed = True
+            history = tf.keras.callbacks.History()
+            history.history = completed_history
+            return history
+        callbacks = [checkpointer]
+        if early_stopping is not None:
+            callbacks.insert(0, early_stopping)
+        history = fit(callbacks, initial_epoch)
+        history.history = checkpointer.history
+        return history
+
+    @staticmethod
+    def _early_stop_epochs(history: tf.keras.callbacks.History) -> int:
+        """The epoch count with the lowest validation loss in the validated run."""
+        val_loss = history.history.get("val_loss")
+        if not val_loss:
+            return len(history.history["loss"])
+        return int(np.argmin(val_loss)) + 1
+
+    def _train_final_model(
+        self,
+        validated_model: tf.keras.Model,
+        validation_history: tf.keras.callbacks.History,
+        sequences,
+        all_labels: list,
+        input_shape: tuple,
+    ) -> tuple[tf.keras.Model, int, str]:
+        """Trains the model that is saved; returns it with its epoch count and
+        the policy actually applied.
+
+        Without a validated run there are no weights to warm start from and no
+        validation loss to pick epochs with, so the model is retrained.
+        """
+        policy = self.training_config.final_training_policy
+        if validated_model is None and policy != "retrain":
+            self.model_helper.log_warning(
+                f"The {policy} policy needs a validated run, retraining instead"
+            )
+            policy = "retrain"
+        final_model = self._create_model(input_shape)
+        epochs = self.training_config.final_epochs
+
+        if policy == "warm_start":
+            final_model.set_weights(validated_model.get_weights())
+            epochs = self.training_config.fine_tune_epochs
+        elif policy == "early_stop_epochs":
+            epochs = self._early_stop_epochs(validation_history)
+
+        self.model_helper.log_info(
+            f"Training final model for {epochs} epochs using the {policy} policy"
+        )
+        self._checkpointed_fit(
+            "final",
+            final_model,
+            lambda callbacks, initial_epoch: self.model_utilities.train_final_model(
+                final_model,
+                self._batches(sequences, all_labels, shuffle=True),
+                np.array(all_labels),
+                batch_size=self.training_config.batch_size,
+                epochs=epochs,
+                callbacks=callbacks,
+                initial_epoch=initial_epoch,
+            ),
+        )
+        return final_model, epochs, policy
 
-        model = self._create_model(scaled_sequences[0].shape)
-        history = self.model_utilities.train_final_model(
-            model, scaled_sequences, np.array(all_labels)
+    def _batches(self, sequences, labels: list, shuffle: bool = False):
+        """Wraps raw sequences in length buckets when bucketed batching is on."""
+        if not self.training_config.bucketed_batching:
+            return sequences
+        return BucketedSequence(
+            list(sequences),
+            labels,
+            self.scaler,
+            self.bucket_lengths,
+            batch_size=self.training_config.batch_size,
+            shuffle=shuffle,
         )
-        self._save_model(model)
+
+    def start(self) -> None:
+        self.phase_times = {}
+        with self._timed_phase("load_data"):
+            fall_data, non_fall_data = self.model_utilities.load_data()
+            fall_labels, non_fall_labels = self.model_utilities.prepare_labels(
+                fall_data, non_fall_data
+            )
+            all_sequences = list(fall_data) + list(non_fall_data)
+            all_labels = fall_labels + non_fall_labels
+
+        with self._timed_phase("preprocess"):
+            padded_sequences = self.model_utilities.pad_sequences(all_sequences)
+            scaled_sequences = self.model_utilities.scale_sequences(padded_sequences)
+
+        padding = None
+        if self.training_config.bucketed_batching:
+            # Buckets pad the raw sequences per batch and scale them with the
+            # scaler fitted above, so only the unpadded sequences are kept.
+            self.scaler = self.model_utilities.load_scaler()
+            lengths = [len(sequence) for sequence in all_sequences]
+            self.bucket_lengths = bucket_boundaries(
+                lengths, self.training_config.num_buckets
+            )
+            padding = padding_report(
+                lengths, self.bucket_lengths, padded_sequences.shape[1]
+            )
+            self.model_helper.log_info(f"Bucketed padding: {padding}")
+            model_inputs = all_sequences
+            input_shape = (None, padded_sequences.shape[-1])
+        else:
+            model_inputs = scaled_sequences
+            input_shape = scaled_sequences[0].shape
+
+        model, history, metrics = None, None, {}
+        if not self.training_config.skip_evaluation:
+            (
+                train_sequences,
+                val_sequences,
+                test_sequences,
+                train_labels,
+                val_labels,
+                test_labels,
+            ) = self.model_utilities.prep_train_val_test_data(model_inputs, all_labels)
+            train_batches = self._batches(train_sequences, train_labels, shuffle=True)
+            val_batches = self._batches(val_sequences, val_labels)
+            with self._timed_phase("validation_training"):
+                model = self._create_model(input_shape)
+                history = self._checkpointed_fit(
+                    "validation",
+                    model,
+                    lambda callbacks, initial_epoch: self.model_utilities.train_model(
+                        model,
+                        train_batches,
+                        train_labels,
+                        val_batches,
+                        val_labels,
+                        batch_size=self.training_config.batch_size,
+                        callbacks=callbacks,
+                        initial_epoch=initial_epoch,
+                    ),
+                    early_stopping=self.model_utilities.early_stopping(),
+                )
+
+            with self._timed_phase("evaluation"):
+                test_loss, test_accuracy = self.model_utilities.evaluate_model(
+                    model, self._batches(test_sequences, test_labels), test_labels
+                )
+            metrics = {"test_loss": test_loss, "test_accuracy": test_accuracy}
+        else:
+            self.model_helper.log_info("Skipping the validation and evaluation run")
+
+        with self._timed_phase("final_training"):
+            final_model, final_epochs, final_policy = self._train_final_model(
+                model, history, model_inputs, all_labels, input_shape
+            )
+
+        training_report = {
+            "run_id": self.run_id,
+            "resumed": self.resumed,
+            "final_training_policy": final_policy,
+            "skip_evaluation": self.training_config.skip_evaluation,
+            "validation_epochs": len(history.history["loss"]) if history else 0,
+            "final_epochs": final_epochs,
+            "phase_seconds": self.phase_times,
+            "total_seconds": round(sum(self.phase_times.values()), 3),
+        }
+        if padding is not None:
+            training_report["bucketed_padding"] = padding
+        self.model_helper.log_info(f"Training report: {training_report}")
+        self._save_model(final_model, metrics=metrics, training_report=training_report)
 
 
 def main():
-    model_training = ModelTraining()
+    parser = argparse.ArgumentParser(description="Train the fall detection model")
+    parser.add_argument(
+        "--policy",
+        choices=FINAL_TRAINING_POLICIES,
+        help="How the final model is trained after the validated run",
+    )
+    parser.add_argument(
+        "--skip-evaluation",
+        action="store_true",
+        help="Train only the final model, without a validated run",
+    )
+    parser.add_argument(
+        "--run-id",
+        help=f"Checkpoint directory name under {CHECKPOINT_ROOT}",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the newest run when no --run-id is given",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Discard the checkpoints of the run instead of resuming from them",
+    )
+    parser.add_argument(
+        "--bucketed",
+        action="store_true",
+        help="Batch sequences by length and pad each batch to its bucket length",
+    )
+    args = parser.parse_args()
+
+    training_config = TrainingConfig.load()
+    if args.policy:
+        training_config.final_training_policy = args.policy
+    if args.skip_evaluation:
+        training_config.skip_evaluation = True
+    if args.bucketed:
+        training_config.bucketed_batching = True
+    model_training = ModelTraining(
+        training_config=training_config,
+        run_id=args.run_id,
+        resume=args.resume,
+        restart=args.restart,
+    )
     model_training.start()
 
 
@@ -12,19 +12,39 @@ import tensorflow as tf
 from src.helper_functions.model_helper_functions import (
     ModelHelpingFunctions,
 )
+from src.modelling.feature_schema import SCHEMA_FILE_NAME, FeatureSchema, read_header
+from src.processing.dtypes import read_csv_with_schema
+from src.processing.feature_selection import FeatureSetSpec
+
+EARLY_STOPPING_PATIENCE = 7
 
 
 class ModelUtilities:
     def __init__(self):
         self.model_helper = ModelHelpingFunctions()
+        self.feature_set = FeatureSetSpec.load()
+        self.feature_schema = None
+
+    def _ensure_feature_schema(self, file_path: str) -> FeatureSchema:
+        """Fixes the column names and order from the first sequence file."""
+        if self.feature_schema is None:
+            dtypes = read_csv_with_schema(file_path).dtypes.to_dict()
+            self.feature_schema = FeatureSchema.from_header(
+                read_header(file_path),
+                dtypes,
+                features=self.feature_set.features if self.feature_set else None,
+            )
+            self.model_helper.log_info(
+                f"Feature schema: {', '.join(self.feature_schema.names)}"
+            )
+        return self.feature_schema
 
-    def filter_and_load_data(self, file_path: str) -> pd.DataFrame:
+    def filter_and_load_data(self, file_path: str) -> np.ndarray:
         try:
-            data = pd.read_csv(file_path)
+            schema = self._ensure_feature_schema(file_path)
+            data = schema.read_csv(file_path, drop_incomplete_rows=False)
             if len(data) <= 110:
-                data = data.drop(columns=["fall_state"])
-                data = data.dropna()
-                return data.to_numpy()
+                return data[~np.isnan(data).any(axis=1)]
             else:
                 self.model_helper.log_info(
                     f"Skipping file {file_path} as it exceeds the length limit"
@@ -39,7 +59,7 @@ class ModelUtilities:
         fall_sequences = []
         non_fall_sequences = []
         try:
-            for file in os.listdir(path):
+            for file in sorted(os.listdir(path)):
                 self.model_helper.log_info(f"Loading file {file}")
                 file_path = os.path.join(path, file)
                 if file.startswith("fall"):
@@ -112,6 +132,10 @@ class ModelUtilities:
             with open(scaler_path, "wb") as file:
                 joblib.dump(scaler, file)
             self.model_helper.log_info("Scaler saved")
+            if self.feature_schema is not None:
+                self.feature_schema.save(
+                    os.path.join(scaler_directory, SCHEMA_FILE_NAME)
+                )
             return scaled_data
         except Exception as e:
             self.model_helper.log_exception(e)
@@ -154,6 +178,22 @@ class ModelUtilities:
             data = json.load(file)
             return data
 
+    def load_scaler(self, scaler_path: str = "models/scaler/scaler.pkl"):
+        self.model_helper.log_info(f"Loading scaler from {scaler_path}")
+        with open(scaler_path, "rb") as file:
+            return joblib.load(file)
+
+    @staticmethod
+    def early_stopping() -> tf.keras.callbacks.EarlyStopping:
+        return tf.keras.callbacks.EarlyStopping(patience=EARLY_STOPPING_PATIENCE)
+
+    @staticmethod
+    def _batched_inputs(sequences, labels, batch_size: int = None) -> dict:
+        """Arguments for fit or evaluate; a keras Sequence yields its own batches."""
+        if isinstance(sequences, tf.keras.utils.Sequence):
+            return {"x": sequences}
+        return {"x": sequences, "y": np.array(labels), "batch_size": batch_size}
+
     def train_model(
         self,
         model: tf.keras.Model,
@@ -161,18 +201,32 @@ class ModelUtilities:
         train_labels: list,
         val_sequences: np.ndarray,
         val_labels: list,
+        batch_size: int = 32,
+        callbacks: list = None,
+        initial_epoch: int = 0,
     ) -> tf.keras.callbacks.History:
         try:
             self.model_helper.log_info(
                 "Training model with training sequences and labels"
             )
+            validation_data = (
+                val_sequences
+                if isinstance(val_sequences, tf.keras.utils.Sequence)
+                else (val_sequences, np.array(val_labels))
+            )
+            callbacks = callbacks or []
+            if not any(
+                isinstance(callback, tf.keras.callbacks.EarlyStopping)
+                for callback in callbacks
+            ):
+                callbacks = [self.early_stopping()] + callbacks
             return model.fit(
-                train_sequences,
-                np.array(train_labels),
+                **self._batched_inputs(train_sequences, train_labels, batch_size),
                 epochs=100,
-                validation_data=(val_sequences, np.array(val_labels)),
-                callbacks=[tf.keras.callbacks.EarlyStopping(patience=7)],
+                validation_data=validation_data,
+                callbacks=callbacks,
                 shuffle=True,
+                initial_epoch=initial_epoch,
             )
 
         except Exception as e:
@@ -180,17 +234,25 @@ class ModelUtilities:
             raise Exception(f"Error training model: {e}")
 
     def train_final_model(
-        self, model: tf.keras.Model, train_sequences: np.ndarray, train_labels: list
+        self,
+        model: tf.keras.Model,
+        train_sequences: np.ndarray,
+        train_labels: list,
+        batch_size: int = 32,
+        epochs: int = 32,
+        callbacks: list = None,
+        initial_epoch: int = 0,
     ) -> tf.keras.callbacks.History:
         try:
             self.model_helper.log_info(
                 "Training model with training sequences and labels"
             )
             return model.fit(
-                train_sequences,
-                np.array(train_labels),
-                epochs=32,
+                **self._batched_inputs(train_sequences, train_labels, batch_size),
+                epochs=epochs,
+                callbacks=callbacks,
                 shuffle=True,
+                initial_epoch=initial_epoch,
             )
 
         except Exception as e:
@@ -202,7 +264,7 @@ class ModelUtilities:
     ) -> list[float]:
         try:
             self.model_helper.log_info("Evaluating model")
-            return model.evaluate(test_sequences, np.array(test_labels))
+            return model.evaluate(**self._batched_inputs(test_sequences, test_labels))
         except Exception as e:
             self.model_helper.log_exception(e)
             raise Exception(f"Error evaluating model: {e}")
@@ -2,12 +2,22 @@ from datetime import datetime
 import os
 
 import joblib
+import numpy as np
 import pandas as pd
 from keras.models import load_model
 from keras.preprocessing.sequence import pad_sequences
 from loguru import logger
 
 from src.helper_functions.model_helper_functions import ModelHelpingFunctions
+from src.modelling.bucketing import (
+    DEFAULT_NUM_BUCKETS,
+    BucketedSequence,
+    bucket_boundaries,
+    padding_report,
+)
+from src.modelling.feature_schema import FeatureSchema
+from src.processing.dtypes import read_csv_with_schema
+from src.processing.feature_selection import FeatureSetSpec
 
 
 class FallPrediction:
@@ -15,7 +25,20 @@ class FallPrediction:
         self.model = load_model(model_path)
         self.scaler_path = path_to_scaler
         self.model_helper = ModelHelpingFunctions()
-        self.data = pd.read_csv(path_to_data)
+        self.data_path = path_to_data
+        # With a schema the features are read by column index straight into a
+        # float32 array in the trained order, and jerk, which centres the
+        # crops, into its own array from the same parse; older models without
+        # one still go through a DataFrame.
+        self.feature_schema = FeatureSchema.load_next_to(path_to_scaler)
+        self.jerk = None
+        if self.feature_schema is not None:
+            self.data, columns = self.feature_schema.read_columns(
+                path_to_data, ("jerk",)
+            )
+            self.jerk = columns["jerk"]
+        else:
+            self.data = read_csv_with_schema(path_to_data)
         self.minimun_data_size = 50
         self.probability_threshold = 0.5
         self.padding_size = 108
@@ -29,6 +52,7 @@ class FallPrediction:
             (80, 19),
         ]
         self.scaler = None
+        self.feature_set = FeatureSetSpec.load()
         # self.data = self.crop_data(self.df)
 
     def crop_data(self, data: pd.DataFrame):
@@ -38,24 +62,28 @@ class FallPrediction:
                 raise ValueError("Data does not contain 'jerk' column")
 
             max_jerk_index = data["jerk"].idxmax()
-            self.model_helper.log_info(f"Max jerk index: {max_jerk_index}")
-
-            cropped_datasets = []
-
-            for left, right in self.configurations:
-                logger.info(f"Left: {left}, Right: {right}")
-                start_index = max(0, max_jerk_index - left)
-                end_index = min(len(data), max_jerk_index + right)
-                logger.info(f"Start index: {start_index}, End index: {end_index}")
-                cropped_data = data.iloc[start_index:end_index]
-                cropped_datasets.append(cropped_data)
-
-            return cropped_datasets
+            return [
+                data.iloc[start_index:end_index]
+                for start_index, end_index in self.crop_bounds(
+                    len(data), max_jerk_index
+                )
+            ]
 
         except Exception as e:
             self.model_helper.log_exception(f"Error cropping data: {e}")
             raise Exception(f"Error cropping data: {e}")
 
+    def crop_bounds(self, length: int, max_jerk_index: int) -> list[tuple[int, int]]:
+        self.model_helper.log_info(f"Max jerk index: {max_jerk_index}")
+        bounds = []
+        for left, right in self.configurations:
+            logger.info(f"Left: {left}, Right: {right}")
+            start_index = max(0, max_jerk_index - left)
+            end_index = min(length, max_jerk_index + right)
+            logger.info(f"Start index: {start_index}, End index: {end_index}")
+            bounds.append((start_index, end_index))
+        return bounds
+
     def check_data_size(self, min_size):
         if len(self.data) < min_size:
             self.model_helper.log_error(
@@ -82,7 +110,11 @@ class FallPrediction:
     def convert_to_numpy(self):
         try:
             self.model_helper.log_info("Converting to numpy")
+            if isinstance(self.data, np.ndarray):
+                return self.data
             self.data = self.data.drop(columns=["fall_state"])
+            if self.feature_set is not None:
+                self.data = self.data[self.feature_set.features]
             self.model_helper.log_info(f"Data shape: {self.data.shape}")
             self.data = self.data.to_numpy()
             return self.data
@@ -129,6 +161,67 @@ class FallPrediction:
             self.model_helper.log_exception(f"Error predicting: {e}")
             raise Exception(f"Error predicting: {e}")
 
+    def predict_batch(self, sequences: list, batch_size: int = 32) -> np.ndarray:
+        """Fall probabilities for many unpadded sequences in one pass.
+
+        Models with a variable-length input are fed length buckets; models
+        with a fixed input length get every sequence padded to that length.
+        """
+        try:
+            scaler = self.scaler or self.load_scaler(self.scaler_path)
+            model_length = self.model.input_shape[1]
+            if model_length is not None:
+                padded = pad_sequences(
+                    sequences,
+                    maxlen=model_length,
+                    dtype="float32",
+                    padding="post",
+                    truncating="post",
+                )
+                scaled = scaler.transform(padded.reshape(-1, padded.shape[-1])).reshape(
+                    padded.shape
+                )
+                return self.model.predict(scaled, batch_size=batch_size)[:, 0]
+
+            lengths = [len(sequence) for sequence in sequences]
+            boundaries = bucket_boundaries(
+                lengths, min(DEFAULT_NUM_BUCKETS, len(sequences))
+            )
+            self.model_helper.log_info(
+                f"Bucketed padding: {padding_report(lengths, boundaries, self.padding_size)}"
+            )
+            batches = BucketedSequence(
+                sequences, None, scaler, boundaries, batch_size=batch_size
+            )
+            probabilities = np.empty(len(sequences), dtype=np.float32)
+            probabilities[batches.order] = self.model.predict(batches)[:, 0]
+            return probabilities
+        except Exception as e:
+            self.model_helper.log_exception(f"Error predicting batch: {e}")
+            raise Exception(f"Error predicting batch: {e}")
+
+    def predict_cropped(self) -> np.ndarray:
+        """Probabilities for every crop configuration around the max jerk."""
+        if self.feature_schema is not None:
+            sequences = [
+                self.data[start_index:end_index]
+                for start_index, end_index in self.crop_bounds(
+                    len(self.data), int(np.nanargmax(self.jerk))
+                )
+            ]
+            return self.predict_batch(sequences)
+
+        columns = (
+            self.feature_set.features
+            if self.feature_set is not None
+            else [column for column in self.data.columns if column != "fall_state"]
+        )
+        sequences = [
+            cropped_data[columns].to_numpy()
+            for cropped_data in self.crop_data(self.data)
+        ]
+        return self.predict_batch(sequences)
+
     def predict_fall(self):
         self.check_data_size(self.minimun_data_size)
 
@@ -190,10 +283,24 @@ def get_latest_model_date(directory_path):
 #         fp.predict_fall()
 
 
-def main():
+def get_model_and_scaler_paths() -> tuple[str, str]:
+    current_directory = "models/current"
+    if os.path.isdir(current_directory):
+        logger.info(f"Using registry model version in {current_directory}")
+        return (
+            f"{current_directory}/fall_detection_model.keras",
+            f"{current_directory}/scaler.pkl",
+        )
+
     date = get_latest_model_date("models/model/")
-    model_path = f"models/model/{date}/fall_detection_model.keras"
-    scaler_path = "models/scaler/scaler.pkl"
+    return (
+        f"models/model/{date}/fall_detection_model.keras",
+        "models/scaler/scaler.pkl",
+    )
+
+
+def main():
+    model_path, scaler_path = get_model_and_scaler_paths()
     data_path = "data/sample_cleaned/merged_data.csv"
 
     fp = FallPrediction(model_path, scaler_path, data_path)
@@ -0,0 +1,87 @@
+import json
+import os
+import time
+
+from keras_tuner import BayesianOptimization, Hyperband
+from loguru import logger
+
+
+class TrialTimingMixin:
+    """Records the wall time and trained epochs of every trial a tuner runs.
+
+    Each trial is written to its own file so that chief and worker processes
+    sharing a tuner directory never contend for the same file.
+    """
+
+    def run_trial(self, trial, *args, **kwargs):
+        start_time = time.perf_counter()
+        results = super().run_trial(trial, *args, **kwargs)
+        wall_time = time.perf_counter() - start_time
+
+        record = {
+            "trial_id": trial.trial_id,
+            "tuner_id": getattr(self, "tuner_id", "tuner0"),
+            "wall_time_seconds": round(wall_time, 3),
+            "epochs_trained": _count_epochs(results),
+            "hyperparameters": trial.hyperparameters.values,
+        }
+        self._write_trial_record(record)
+        logger.info(
+            f"Trial {trial.trial_id} took {record['wall_time_seconds']}s "
+            f"for {record['epochs_trained']} epochs"
+        )
+        return results
+
+    def _write_trial_record(self, record: dict) -> None:
+        directory = trial_times_directory(self.project_dir)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{record['trial_id']}.json"), "w") as file:
+            json.dump(record, file, indent=2)
+
+
+def trial_times_directory(project_dir: str) -> str:
+    return os.path.join(project_dir, "trial_times")
+
+
+def load_trial_times(project_dir: str) -> list[dict]:
+    directory = trial_times_directory(project_dir)
+    if not os.path.isdir(directory):
+        return []
+    records = []
+    for file_name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, file_name), "r") as file:
+            records.append(json.load(file))
+    return records
+
+
+def summarize_trial_times(project_dir: str) -> dict:
+    records = load_trial_times(project_dir)
+    wall_times = [record["wall_time_seconds"] for record in records]
+    return {
+        "trials": len(records),
+        "total_wall_time_seconds": round(sum(wall_times), 3),
+        "mean_wall_time_seconds": (
+            round(sum(wall_times) / len(wall_times), 3) if wall_times else 0.0
+        ),
+        "max_wall_time_seconds": max(wall_times, default=0.0),
+        "total_epochs_trained": sum(record["epochs_trained"] for record in records),
+    }
+
+
+def _count_epochs(results) -> int:
+    if not isinstance(results, list):
+        results = [results]
+    epochs = 0
+    for result in results:
+        history = getattr(result, "history", None)
+        if history:
+            epochs += len(next(iter(history.values())))
+    return epochs
+
+
+class TimedBayesianOptimization(TrialTimingMixin, BayesianOptimization):
+    pass
+
+
+class TimedHyperband(TrialTimingMixin, Hyperband):
+    pass
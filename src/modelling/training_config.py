@@ -0,0 +1,86 @@
+import dataclasses
+import json
+import os
+
+import tensorflow as tf
+from loguru import logger
+
+TRAINING_CONFIG_PATH = "hyperparameters/training_config.json"
+MIXED_PRECISION_POLICIES = ("float32", "mixed_float16", "mixed_bfloat16")
+FINAL_TRAINING_POLICIES = ("retrain", "warm_start", "early_stop_epochs")
+
+
+@dataclasses.dataclass
+class TrainingConfig:
+    batch_size: int = 32
+    jit_compile: bool = False
+    steps_per_execution: int = 1
+    mixed_precision_policy: str = "float32"
+    intra_op_threads: int = 0
+    inter_op_threads: int = 0
+    final_training_policy: str = "retrain"
+    final_epochs: int = 32
+    fine_tune_epochs: int = 5
+    skip_evaluation: bool = False
+    checkpoints_to_keep: int = 3
+    checkpoint_every_epochs: int = 1
+    bucketed_batching: bool = False
+    num_buckets: int = 4
+
+    def __post_init__(self):
+        if self.mixed_precision_policy not in MIXED_PRECISION_POLICIES:
+            raise ValueError(
+                f"Unknown mixed precision policy {self.mixed_precision_policy}, "
+                f"choose one of {MIXED_PRECISION_POLICIES}"
+            )
+        if self.final_training_policy not in FINAL_TRAINING_POLICIES:
+            raise ValueError(
+                f"Unknown final training policy {self.final_training_policy}, "
+                f"choose one of {FINAL_TRAINING_POLICIES}"
+            )
+
+    @classmethod
+    def load(cls, path: str = TRAINING_CONFIG_PATH) -> "TrainingConfig":
+        if not os.path.exists(path):
+            logger.info(f"No training config at {path}, using defaults")
+            return cls()
+        with open(path, "r") as file:
+            return cls(**json.load(file))
+
+    def save(self, path: str = TRAINING_CONFIG_PATH) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            json.dump(dataclasses.asdict(self), file, indent=2)
+
+    def apply_runtime_settings(self) -> None:
+        """Applies the process-wide TensorFlow settings; call before building models.
+
+        Thread pool sizes of 0 leave the choice to TensorFlow. Once the
+        TensorFlow runtime has started its pools can no longer be resized, so
+        a differing size is then logged and left as it is.
+        """
+        logger.info(f"Applying training config {self}")
+        for name, threads, get_threads, set_threads in (
+            (
+                "intra_op",
+                self.intra_op_threads,
+                tf.config.threading.get_intra_op_parallelism_threads,
+                tf.config.threading.set_intra_op_parallelism_threads,
+            ),
+            (
+                "inter_op",
+                self.inter_op_threads,
+                tf.config.threading.get_inter_op_parallelism_threads,
+                tf.config.threading.set_inter_op_parallelism_threads,
+            ),
+        ):
+            if threads == 0 or threads == get_threads():
+                continue
+            try:
+                set_threads(threads)
+            except RuntimeError as e:
+                logger.warning(
+                    f"Keeping the {name} thread pool at {get_threads()}, "
+                    f"TensorFlow is already initialized: {e}"
+                )
+        tf.keras.mixed_precision.set_global_policy(self.mixed_precision_policy)
@@ -4,6 +4,9 @@ import logging
 from typing import List
 import numpy as np
 
+from src.processing.dtypes import apply_schema, read_csv_with_schema
+from src.processing.feature_selection import FeatureSetSpec
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
@@ -30,16 +33,23 @@ class CSVFileManager:
 
         self.output_directory.mkdir(parents=True, exist_ok=True)
         output_path = self.output_directory / output_file_name
-        df.to_csv(output_path, index=False)
+        apply_schema(df).to_csv(output_path, index=False)
         logging.info(f"CSV file saved to {output_path}")
 
 
 class CSVPreprocessor:
     """Reads and preprocesses CSV files."""
 
+    def __init__(self, feature_set: FeatureSetSpec = None):
+        self.feature_set = feature_set
+
     def process(self, file_path: Path) -> pd.DataFrame:
-        df = pd.read_csv(file_path)
-        df.drop(columns=["timestamp", "time_interval"], errors="ignore", inplace=True)
+        return self.clean(read_csv_with_schema(file_path))
+
+    def clean(self, df: pd.DataFrame) -> pd.DataFrame:
+        df = df.drop(columns=["timestamp", "time_interval"], errors="ignore")
+        if self.feature_set is not None:
+            df = self.feature_set.project(df).copy()
         df.replace([np.inf, -np.inf], np.nan, inplace=True)
         df.dropna(inplace=True)
         return df
@@ -64,7 +74,7 @@ def main():
     output_name = "merged_data.csv"
 
     file_manager = CSVFileManager(input_dir, output_dir)
-    preprocessor = CSVPreprocessor()
+    preprocessor = CSVPreprocessor(FeatureSetSpec.load())
     merger = CSVMerger()
 
     csv_files = file_manager.find_csv_files()
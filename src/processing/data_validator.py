@@ -1,6 +1,33 @@
+import dataclasses
+
+import numpy as np
 import pandas as pd
 from loguru import logger
 
+DEFAULT_GAP_FACTOR = 3.0
+
+
+@dataclasses.dataclass
+class ValidationReport:
+    rows: int
+    missing_columns: list = dataclasses.field(default_factory=list)
+    null_counts: dict = dataclasses.field(default_factory=dict)
+    duplicate_rows: int = 0
+    non_monotonic_timestamps: int = 0
+    sample_rate_gaps: int = 0
+    median_interval: float = 0.0
+    max_interval: float = 0.0
+    dropped_rows: dict = dataclasses.field(default_factory=dict)
+
+    @property
+    def is_valid(self) -> bool:
+        return not (
+            self.missing_columns
+            or self.null_counts
+            or self.duplicate_rows
+            or self.non_monotonic_timestamps
+        )
+
 
 class DataValidator:
     def __init__(
@@ -9,39 +36,114 @@ class DataValidator:
         pass
 
     def validate(
-        self, data: pd.DataFrame, required_accelerator_columns: list
+        self,
+        data: pd.DataFrame,
+        required_accelerator_columns: list,
+        repair: bool = False,
     ) -> pd.DataFrame:
-        self._check_all_columns(data, required_accelerator_columns)
-        self._check_null_values(data)
-        self._check_duplicated_rows(data)
+        """Checks the raw data and prepares its timestamp column.
+
+        Raises on the first kind of problem found unless ``repair`` is set,
+        in which case null, duplicated and out-of-order rows are dropped.
+        """
+        data, report = self.inspect(data, required_accelerator_columns, repair=repair)
+        if report.missing_columns:
+            logger.error(f"Missing columns: {set(report.missing_columns)}")
+            raise ValueError(f"Missing columns: {set(report.missing_columns)}")
+        if not repair:
+            if report.null_counts:
+                logger.error("Null values found")
+                raise ValueError("Null values found")
+            if report.duplicate_rows:
+                logger.error("Duplicated rows found")
+                raise ValueError("Duplicated rows found")
+            if report.non_monotonic_timestamps:
+                logger.warning(
+                    f"{report.non_monotonic_timestamps} timestamps are out of order"
+                )
         self._drop_timestamp(data)
         self._rename_timestamp_local(data)
         return data
 
-    def _check_all_columns(
-        self, data: str, required_accelerometer_columns: list
-    ) -> None:
-        try:
-            missing_columns = set(required_accelerometer_columns) - set(data.columns)
-            if missing_columns:
-                logger.error(f"Missing columns: {missing_columns}")
-                raise ValueError(f"Missing columns: {missing_columns}")
-            logger.info("All required columns found")
-        except Exception as e:
-            logger.error(f"Error checking columns: {e}")
-            raise e
-
-    def _check_null_values(self, data: pd.DataFrame) -> None:
-        if data.isnull().values.any():
-            logger.error("Null values found")
-            raise ValueError("Null values found")
-        logger.info("No null values found")
-
-    def _check_duplicated_rows(self, data: pd.DataFrame) -> None:
-        if data.duplicated().any():
-            logger.error("Duplicated rows found")
-            raise ValueError("Duplicated rows found")
-        logger.info("No duplicated rows found")
+    def inspect(
+        self,
+        data: pd.DataFrame,
+        required_columns: list,
+        timestamp_column: str = "timestamp",
+        gap_factor: float = DEFAULT_GAP_FACTOR,
+        repair: bool = False,
+    ) -> tuple[pd.DataFrame, ValidationReport]:
+        """Runs every check in one pass over the column arrays.
+
+        Duplicates are found by hashing every column of each row; rows
+        sharing a hash are then compared exactly, so a hash collision never
+        flags or drops a distinct row. Returns the (optionally repaired) data
+        together with the report.
+        """
+        report = ValidationReport(rows=len(data))
+        report.missing_columns = sorted(set(required_columns) - set(data.columns))
+
+        null_mask = np.zeros(len(data), dtype=bool)
+        row_hash = np.zeros(len(data), dtype=np.uint64)
+        for column in data.columns:
+            values = data[column].to_numpy()
+            column_nulls = pd.isna(values)
+            if column_nulls.any():
+                report.null_counts[column] = int(column_nulls.sum())
+                null_mask |= column_nulls
+            # Mixing in a multiplier keeps the combined hash column-order aware.
+            row_hash = row_hash * np.uint64(1000003) ^ pd.util.hash_array(values)
+        duplicate_mask = np.zeros(len(data), dtype=bool)
+        candidates = pd.Series(row_hash).duplicated(keep=False).to_numpy()
+        if candidates.any():
+            duplicate_mask[candidates] = data.loc[candidates].duplicated().to_numpy()
+        report.duplicate_rows = int(duplicate_mask.sum())
+
+        out_of_order_mask = np.zeros(len(data), dtype=bool)
+        timestamps = (
+            data[timestamp_column].to_numpy()
+            if timestamp_column in data.columns
+            else None
+        )
+        if timestamps is not None and np.issubdtype(timestamps.dtype, np.number):
+            out_of_order_mask[1:] = (
+                timestamps[1:] <= np.maximum.accumulate(timestamps)[:-1]
+            )
+            report.non_monotonic_timestamps = int(out_of_order_mask.sum())
+            intervals = np.diff(timestamps[~out_of_order_mask])
+            if len(intervals):
+                report.median_interval = float(np.median(intervals))
+                report.max_interval = float(intervals.max())
+                report.sample_rate_gaps = int(
+                    (intervals > gap_factor * report.median_interval).sum()
+                )
+
+        logger.info(f"Validation report: {report}")
+        if repair:
+            data, report.dropped_rows = self._repair(
+                data, null_mask, duplicate_mask, out_of_order_mask
+            )
+        return data, report
+
+    def _repair(
+        self,
+        data: pd.DataFrame,
+        null_mask: np.ndarray,
+        duplicate_mask: np.ndarray,
+        out_of_order_mask: np.ndarray,
+    ) -> tuple[pd.DataFrame, dict]:
+        dropped_rows = {
+            "null": int(null_mask.sum()),
+            "duplicate": int((duplicate_mask & ~null_mask).sum()),
+            "out_of_order": int(
+                (out_of_order_mask & ~duplicate_mask & ~null_mask).sum()
+            ),
+        }
+        keep = ~(null_mask | duplicate_mask | out_of_order_mask)
+        if keep.all():
+            return data, dropped_rows
+        logger.warning(f"Dropping rows during repair: {dropped_rows}")
+        return data.loc[keep].reset_index(drop=True), dropped_rows
 
     def _drop_timestamp(self, data: pd.DataFrame) -> None:
         if "timestamp" in data.columns:
@@ -0,0 +1,85 @@
+import csv
+from functools import lru_cache
+from typing import Optional
+
+import pandas as pd
+from loguru import logger
+
+FLOAT_DTYPE = "float32"
+LABEL_DTYPE = "int8"
+LABEL_COLUMNS = ("fall_state", "impact_detection", "gap")
+# Kept at 64 bits: epoch nanoseconds after processing, epoch seconds (float)
+# or local time strings in raw recordings.
+TIME_COLUMNS = ("timestamp", "timestamp_local")
+
+
+@lru_cache(maxsize=None)
+def pyarrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def column_dtype(name: str) -> Optional[str]:
+    """The dtype a column is stored and loaded as; None leaves it to the parser."""
+    if name in TIME_COLUMNS:
+        return None
+    if name in LABEL_COLUMNS:
+        return LABEL_DTYPE
+    return FLOAT_DTYPE
+
+
+def schema_for(columns: list[str]) -> dict:
+    return {
+        column: column_dtype(column)
+        for column in columns
+        if column_dtype(column) is not None
+    }
+
+
+def read_header(path) -> list[str]:
+    with open(path, "r", newline="") as file:
+        return next(csv.reader(file), [])
+
+
+def read_csv_with_schema(path, usecols: Optional[list] = None) -> pd.DataFrame:
+    """Reads a CSV with explicit dtypes, with the pyarrow engine when it is
+    installed.
+
+    Files that do not fit the schema, such as labels with missing values or
+    text in a sensor column, are re-read with inferred types and downcast
+    where possible.
+    """
+    columns = [
+        column for column in read_header(path) if usecols is None or column in usecols
+    ]
+    engine = "pyarrow" if pyarrow_available() else "c"
+    try:
+        return pd.read_csv(
+            path, usecols=columns, dtype=schema_for(columns), engine=engine
+        )
+    except (ValueError, TypeError) as e:
+        logger.warning(f"{path} does not fit the dtype schema ({e}), inferring")
+        return apply_schema(pd.read_csv(path, usecols=columns))
+
+
+def apply_schema(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """Downcasts the numeric columns of ``dataframe`` to the schema dtypes.
+
+    Labels holding missing values and non-numeric columns are left as they are.
+    """
+    casts = {}
+    for column, dtype in schema_for(list(dataframe.columns)).items():
+        values = dataframe[column]
+        if not pd.api.types.is_numeric_dtype(values) or values.dtype == dtype:
+            continue
+        if dtype == LABEL_DTYPE and values.isna().any():
+            continue
+        casts[column] = dtype
+    return dataframe.astype(casts) if casts else dataframe
+
+
+def memory_bytes(dataframe: pd.DataFrame) -> int:
+    return int(dataframe.memory_usage(deep=True).sum())
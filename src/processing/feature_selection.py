@@ -0,0 +1,283 @@
+import argparse
+import dataclasses
+import json
+import os
+import time
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+FEATURE_SET_PATH = "hyperparameters/feature_set.json"
+REPORT_PATH = "hyperparameters/feature_selection_report.json"
+# Columns the pipeline needs besides the model inputs: timestamps for
+# resampling and splitting, labels, and jerk for cropping around impacts.
+AUXILIARY_COLUMNS = ("timestamp", "fall_state", "jerk")
+NON_FEATURE_COLUMNS = (
+    "timestamp",
+    "timestamp_local",
+    "time_interval",
+    "fall_state",
+    "gap",
+)
+
+
+@dataclasses.dataclass
+class FeatureSetSpec:
+    features: list
+    dropped: dict = dataclasses.field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: str = FEATURE_SET_PATH) -> Optional["FeatureSetSpec"]:
+        """The persisted spec, or None when every column should be kept."""
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as file:
+            return cls(**json.load(file))
+
+    def save(self, path: str = FEATURE_SET_PATH) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            json.dump(dataclasses.asdict(self), file, indent=2)
+        logger.info(f"Feature set with {len(self.features)} features saved to {path}")
+
+    def project(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Keeps the spec features and the auxiliary columns present in ``data``."""
+        keep = [column for column in AUXILIARY_COLUMNS if column in data.columns]
+        keep += [column for column in self.features if column not in keep]
+        return data[keep]
+
+
+def feature_columns(data: pd.DataFrame) -> list[str]:
+    return [column for column in data.columns if column not in NON_FEATURE_COLUMNS]
+
+
+def correlation_pruning(
+    data: pd.DataFrame, threshold: float = 0.98
+) -> tuple[list[str], dict]:
+    """Drops every column whose absolute correlation with an earlier kept column
+    reaches ``threshold``; constant columns are dropped as well."""
+    columns = feature_columns(data)
+    values = data[columns].to_numpy(dtype=np.float64)
+    values = values[np.isfinite(values).all(axis=1)]
+    constant = values.std(axis=0) == 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        correlation = np.abs(np.corrcoef(values, rowvar=False))
+
+    kept, dropped = [], {}
+    for index, column in enumerate(columns):
+        if constant[index]:
+            dropped[column] = "constant"
+            continue
+        duplicate_of = next(
+            (
+                columns[kept_index]
+                for kept_index in (columns.index(name) for name in kept)
+                if correlation[index, kept_index] >= threshold
+            ),
+            None,
+        )
+        if duplicate_of is None:
+            kept.append(column)
+        else:
+            dropped[column] = (
+                f"correlated with {duplicate_of} "
+                f"(|r|={correlation[index, columns.index(duplicate_of)]:.4f})"
+            )
+    logger.info(f"Correlation pruning kept {len(kept)} of {len(columns)} columns")
+    return kept, dropped
+
+
+def permutation_importance(
+    predict: Callable[[np.ndarray], np.ndarray],
+    sequences: np.ndarray,
+    labels: np.ndarray,
+    feature_names: list[str],
+    repeats: int = 3,
+    seed: int = 42,
+) -> tuple[float, dict]:
+    """Accuracy lost when one feature is shuffled across sequences.
+
+    ``sequences`` are the padded and scaled (sequences, timesteps, features)
+    model inputs, ``predict`` returns fall probabilities.
+    """
+    rng = np.random.default_rng(seed)
+    labels = np.asarray(labels)
+
+    def accuracy(inputs: np.ndarray) -> float:
+        return float(np.mean((np.ravel(predict(inputs)) > 0.5) == labels))
+
+    baseline = accuracy(sequences)
+    importances = {}
+    for index, name in enumerate(feature_names):
+        drops = []
+        for _ in range(repeats):
+            permuted = sequences.copy()
+            permuted[:, :, index] = sequences[rng.permutation(len(sequences)), :, index]
+            drops.append(baseline - accuracy(permuted))
+        importances[name] = round(float(np.mean(drops)), 6)
+        logger.info(f"Permutation importance of {name}: {importances[name]}")
+    return baseline, importances
+
+
+def stage_gains(
+    data: pd.DataFrame,
+    spec: FeatureSetSpec,
+    raw_data: Optional[pd.DataFrame] = None,
+) -> dict:
+    """Measures what the spec saves in processing, storage and model input."""
+    all_features = feature_columns(data)
+    full_csv = data.to_csv(index=False).encode()
+    projected_csv = spec.project(data).to_csv(index=False).encode()
+    gains = {
+        "storage": {
+            "csv_bytes_full": len(full_csv),
+            "csv_bytes_projected": len(projected_csv),
+            "saved_fraction": round(1 - len(projected_csv) / len(full_csv), 4),
+        },
+        "model_input": {
+            "features_full": len(all_features),
+            "features_projected": len(spec.features),
+            "float32_bytes_per_timestep_full": 4 * len(all_features),
+            "float32_bytes_per_timestep_projected": 4 * len(spec.features),
+            "first_layer_compute_saved": round(
+                1 - len(spec.features) / len(all_features), 4
+            ),
+        },
+    }
+    if raw_data is not None:
+        gains["processing"] = _processing_gain(raw_data, spec)
+    return gains
+
+
+def _processing_gain(raw_data: pd.DataFrame, spec: FeatureSetSpec) -> dict:
+    from src.processing.motion_features import MotionFeatureCalculator
+
+    calculator = MotionFeatureCalculator()
+    timings = {}
+    for name, feature_set in (("full", None), ("projected", spec.features)):
+        start_time = time.perf_counter()
+        calculator.calculate_all_features(
+            raw_data.copy(),
+            "timestamp_local",
+            ["ax", "ay", "az"],
+            feature_set=feature_set,
+        )
+        timings[name] = time.perf_counter() - start_time
+    return {
+        "seconds_full": round(timings["full"], 4),
+        "seconds_projected": round(timings["projected"], 4),
+        "saved_fraction": round(1 - timings["projected"] / timings["full"], 4),
+    }
+
+
+def _labelled_sequences(
+    sequences_directory: str, schema=None
+) -> tuple[list, list, list]:
+    """Sequences, labels and feature names of the fall and non-fall files.
+
+    With a schema the columns are read by index in the order the scaler and
+    model were trained on, so the permuted column indices match the model
+    inputs; without one every non-auxiliary column is kept in file order.
+    """
+    sequences, labels, names = [], [], schema.names if schema else None
+    for file_name in sorted(os.listdir(sequences_directory)):
+        if not file_name.startswith(("fall", "non_fall")):
+            continue
+        path = os.path.join(sequences_directory, file_name)
+        if schema is not None:
+            sequences.append(schema.read_csv(path))
+        else:
+            data = pd.read_csv(path)
+            names = feature_columns(data)
+            sequences.append(data[names].dropna().to_numpy(dtype=np.float32))
+        labels.append(1 if file_name.startswith("fall") else 0)
+    return sequences, labels, names
+
+
+def _model_permutation_importance(
+    model_path: str, scaler_path: str, sequences_directory: str
+) -> tuple[float, dict]:
+    import joblib
+    from keras.models import load_model
+    from keras.preprocessing.sequence import pad_sequences
+
+    from src.modelling.feature_schema import FeatureSchema
+
+    model = load_model(model_path)
+    with open(scaler_path, "rb") as file:
+        scaler = joblib.load(file)
+
+    schema = FeatureSchema.load_next_to(scaler_path)
+    if schema is None:
+        logger.warning(
+            f"No feature schema next to {scaler_path}, using the file column order"
+        )
+    sequences, labels, names = _labelled_sequences(sequences_directory, schema)
+
+    padded = pad_sequences(
+        sequences,
+        maxlen=model.input_shape[1],
+        dtype="float32",
+        padding="post",
+        truncating="post",
+    )
+    scaled = scaler.transform(padded.reshape(-1, padded.shape[-1])).reshape(
+        padded.shape
+    )
+    return permutation_importance(
+        lambda inputs: model.predict(inputs, verbose=0), scaled, labels, names
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Analyse feature redundancy and importance and write a feature set"
+    )
+    parser.add_argument("--data", default="data/cleaned/merged_data.csv")
+    parser.add_argument("--threshold", type=float, default=0.98)
+    parser.add_argument(
+        "--raw-file",
+        help="Raw recording used to time feature computation with and without the spec",
+    )
+    parser.add_argument("--model", help="Trained model for permutation importance")
+    parser.add_argument("--scaler", default="models/scaler/scaler.pkl")
+    parser.add_argument("--sequences", default="data/seq/")
+    parser.add_argument(
+        "--min-importance",
+        type=float,
+        default=0.0,
+        help="Drop features whose permutation importance is at or below this",
+    )
+    args = parser.parse_args()
+
+    data = pd.read_csv(args.data)
+    kept, dropped = correlation_pruning(data, args.threshold)
+    report = {"correlation_threshold": args.threshold}
+
+    if args.model:
+        baseline, importances = _model_permutation_importance(
+            args.model, args.scaler, args.sequences
+        )
+        report["baseline_accuracy"] = baseline
+        report["permutation_importance"] = importances
+        for column in list(kept):
+            if importances.get(column, np.inf) <= args.min_importance:
+                kept.remove(column)
+                dropped[column] = f"permutation importance {importances[column]}"
+
+    spec = FeatureSetSpec(features=kept, dropped=dropped)
+    raw_data = pd.read_csv(args.raw_file) if args.raw_file else None
+    report["feature_set"] = dataclasses.asdict(spec)
+    report["gains"] = stage_gains(data, spec, raw_data)
+    spec.save()
+
+    os.makedirs(os.path.dirname(REPORT_PATH), exist_ok=True)
+    with open(REPORT_PATH, "w") as file:
+        json.dump(report, file, indent=2)
+    logger.info(f"Feature selection report saved to {REPORT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@ import logging
 from typing import List
 import numpy as np
 
+from src.processing.dtypes import apply_schema, read_csv_with_schema
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
@@ -40,7 +42,7 @@ class CSVFilesMerger:
         return csv_files
 
     def read_and_process_csv(self, file_path: Path) -> pd.DataFrame:
-        df = pd.read_csv(file_path)
+        df = read_csv_with_schema(file_path)
         df.drop(
             columns=["timestamp", "time_interval"], errors="ignore", inplace=True
         )  # Remove specified columns
@@ -74,7 +76,7 @@ class CSVFilesMerger:
             parents=True, exist_ok=True
         )  # Ensure the output directory exists
         output_path = self.output_directory / self.output_file_name
-        df.to_csv(output_path, index=False)
+        apply_schema(df).to_csv(output_path, index=False)
         logging.info(f"Merged CSV file saved to {output_path}")
 
 
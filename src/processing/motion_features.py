@@ -1,27 +1,119 @@
+from typing import Optional
+
 import numpy as np
 import pandas as pd
 from loguru import logger
 from scipy.integrate import cumtrapz
 
+from src.processing.feature_selection import AUXILIARY_COLUMNS, NON_FEATURE_COLUMNS
+from src.processing.resampling import Resampler
+from src.processing.rolling_features import RollingFeatureEngine
+from src.processing.signal_conditioning import SignalConditioner
+from src.processing.spectral_features import SpectralFeatureEngine
+from src.processing.timestamps import interval_seconds, to_epoch_ns
+
+IMPACT_JERK_THRESHOLD = 75000
+
+
+def cumulative_trapezoid_uniform(values: np.ndarray, dt: float) -> np.ndarray:
+    """Cumulative trapezoidal integral of samples spaced ``dt`` apart, starting at 0."""
+    values = np.asarray(values, dtype=np.float64)
+    return dt * (np.cumsum(values) - 0.5 * (values[0] + values))
+
 
 class MotionFeatureCalculator:
+    def __init__(self):
+        self.uniform_dt = None
+        self.linear_acceleration = None
+
     def calculate_all_features(
         self,
         dataframe: pd.DataFrame,
         timestamp_col: str,
         accel_cols: list,
         time_unit="ms",
+        feature_set: Optional[list] = None,
+        resampler: Optional[Resampler] = None,
+        conditioner: Optional[SignalConditioner] = None,
+        rolling: Optional[RollingFeatureEngine] = None,
+        spectral: Optional[SpectralFeatureEngine] = None,
     ) -> pd.DataFrame:
+        """Adds the motion features to ``dataframe``.
+
+        With a ``feature_set`` only the feature groups those columns depend on
+        are computed, and the result keeps just those columns plus the
+        timestamp, label and jerk columns. With a ``resampler`` the recording
+        is first mapped onto a fixed-rate grid and integration uses that
+        constant step. With a ``conditioner`` the axes are smoothed and
+        velocity and displacement integrate the gravity-removed signal. With
+        ``rolling`` and ``spectral`` the windowed statistics and
+        frequency-domain groups are added as well.
+        """
         logger.info("Calculating all motion features")
-        self.dataframe = dataframe
+        self.uniform_dt = None
+        self.linear_acceleration = None
+        needed = (
+            None if feature_set is None else set(feature_set) | set(AUXILIARY_COLUMNS)
+        )
+
+        def needs(*columns: str) -> bool:
+            return needed is None or not needed.isdisjoint(columns)
+
         self.check_all_columns(dataframe, accel_cols)
         self.calculate_time_interval(dataframe, timestamp_col, time_unit)
-        self.calculate_velocity_displacement(accel_cols, dataframe)
-        self.calculate_angles(dataframe)
-        self.calculate_g_force(dataframe)
-        self.calculate_jerk_orientation(dataframe)
-        self.calculate_magnitudes(dataframe)
-        self.calculate_impact_detection(dataframe)
+        if resampler is not None:
+            dataframe = resampler.resample(
+                dataframe.drop(columns=["time_interval"]), timestamp_col
+            )
+            time_divisor = 1000 if time_unit == "ms" else 1
+            self.uniform_dt = resampler.period_ns / 1e9 / time_divisor
+            dataframe["time_interval"] = self.uniform_dt
+        if conditioner is not None:
+            logger.info("Conditioning acceleration signals")
+            smoothed, self.linear_acceleration = conditioner.filter(dataframe)
+            dataframe[conditioner.columns] = smoothed
+        self.dataframe = dataframe
+        if needs(
+            *[f"{kind}{axis[-1]}" for kind in "vd" for axis in accel_cols],
+            "magnitude_velocity",
+            "magnitude_displacement",
+        ):
+            self.calculate_velocity_displacement(accel_cols, dataframe)
+        if needs("angle_xy", "angle_yz", "angle_zx"):
+            self.calculate_angles(dataframe)
+        if needs("g_force", "jerk", "impact_detection"):
+            self.calculate_g_force(dataframe)
+        if needs(
+            "jerk",
+            "orientation_xy",
+            "orientation_yz",
+            "orientation_zx",
+            "impact_detection",
+        ):
+            self.calculate_jerk_orientation(dataframe)
+        if needed is None:
+            self.calculate_magnitudes(dataframe)
+        else:
+            for kind in ("acceleration", "velocity", "displacement"):
+                if needs(f"magnitude_{kind}"):
+                    self.calculate_magnitude(dataframe, kind)
+        if needs("impact_detection"):
+            self.calculate_impact_detection(dataframe)
+        for group in (rolling, spectral):
+            if group is None or not needs(*group.columns):
+                continue
+            if "g_force" in group.signals and "g_force" not in dataframe.columns:
+                self.calculate_g_force(dataframe)
+            dataframe = pd.concat([dataframe, group.calculate(dataframe)], axis=1)
+
+        if needed is not None:
+            dataframe = dataframe[
+                [
+                    column
+                    for column in dataframe.columns
+                    if column in needed or column in NON_FEATURE_COLUMNS
+                ]
+            ]
         return dataframe
 
     def check_all_columns(self, dataframe: pd.DataFrame, accel_cols: list) -> None:
@@ -34,13 +126,11 @@ class MotionFeatureCalculator:
 
     def calculate_time_interval(self, dataframe, timestamp_col: str, time_unit="ms"):
         logger.info("Calculating time interval")
-        dataframe[timestamp_col] = pd.to_datetime(dataframe[timestamp_col])
-        dataframe["time_interval"] = (
-            dataframe[timestamp_col].diff().fillna(pd.Timedelta(seconds=0))
-        )
-        dataframe["time_interval"] = dataframe["time_interval"].dt.total_seconds()
+        epoch_ns = to_epoch_ns(dataframe[timestamp_col].to_numpy())
+        dataframe[timestamp_col] = epoch_ns
+        # The "ms" divisor predates this parser; trained models depend on it.
         time_divisor = 1000 if time_unit == "ms" else 1
-        dataframe["time_interval"] /= time_divisor
+        dataframe["time_interval"] = interval_seconds(epoch_ns) / time_divisor
         logger.info("Time interval calculated")
 
     def calculate_velocity_displacement(
@@ -50,11 +140,25 @@ class MotionFeatureCalculator:
         for axis in accel_cols:
             logger.info(f"Calculating velocity and displacement for {axis}")
             velocity_col = f"v{axis[-1]}"
+            displacement_col = f"d{axis[-1]}"
+            acceleration = (
+                dataframe[axis]
+                if self.linear_acceleration is None
+                else self.linear_acceleration[axis]
+            )
+            if self.uniform_dt is not None:
+                dataframe[velocity_col] = cumulative_trapezoid_uniform(
+                    acceleration.to_numpy(), self.uniform_dt
+                )
+                dataframe[displacement_col] = cumulative_trapezoid_uniform(
+                    dataframe[velocity_col].to_numpy(), self.uniform_dt
+                )
+                continue
+
             dataframe[velocity_col] = cumtrapz(
-                dataframe[axis], dataframe["time_interval"], initial=0
+                acceleration, dataframe["time_interval"], initial=0
             )
 
-            displacement_col = f"d{axis[-1]}"
             dataframe[displacement_col] = cumtrapz(
                 dataframe[velocity_col], dataframe["time_interval"], initial=0
             )
@@ -95,23 +199,20 @@ class MotionFeatureCalculator:
         )
 
     def calculate_magnitudes(self, dataframe: pd.DataFrame):
-        logger.info("Calculating magnitude of acceleration")
-        dataframe["magnitude_acceleration"] = np.sqrt(
-            dataframe["ax"] ** 2 + dataframe["ay"] ** 2 + dataframe["az"] ** 2
-        )
+        for kind in ("acceleration", "velocity", "displacement"):
+            self.calculate_magnitude(dataframe, kind)
 
-        logger.info("Calculating magnitude of velocity")
-        dataframe["magnitude_velocity"] = np.sqrt(
-            dataframe["vx"] ** 2 + dataframe["vy"] ** 2 + dataframe["vz"] ** 2
-        )
-
-        logger.info("Calculating magnitude of displacement")
-        dataframe["magnitude_displacement"] = np.sqrt(
-            dataframe["dx"] ** 2 + dataframe["dy"] ** 2 + dataframe["dz"] ** 2
+    def calculate_magnitude(self, dataframe: pd.DataFrame, kind: str):
+        logger.info(f"Calculating magnitude of {kind}")
+        prefix = kind[0]
+        dataframe[f"magnitude_{kind}"] = np.sqrt(
+            dataframe[f"{prefix}x"] ** 2
+            + dataframe[f"{prefix}y"] ** 2
+            + dataframe[f"{prefix}z"] ** 2
         )
 
     def calculate_impact_detection(self, dataframe: pd.DataFrame):
         logger.info("Calculating impact detection")
-        dataframe["impact_detection"] = dataframe["jerk"].apply(
-            lambda x: 1 if x > 75000 else 0
-        )
+        dataframe["impact_detection"] = (
+            dataframe["jerk"] > IMPACT_JERK_THRESHOLD
+        ).astype(int)
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+DEFAULT_PERIOD_MS = 75
+DEFAULT_GAP_TOLERANCE_PERIODS = 3
+STEP_COLUMNS = ("fall_state",)
+GAP_COLUMN = "gap"
+
+
+def uniform_grid(epoch_ns: np.ndarray, period_ns: int) -> np.ndarray:
+    return np.arange(epoch_ns[0], epoch_ns[-1] + 1, period_ns, dtype=np.int64)
+
+
+def step_interpolate(
+    grid_ns: np.ndarray, epoch_ns: np.ndarray, values: np.ndarray
+) -> np.ndarray:
+    """The most recent sample at or before each grid point; labels are never blended."""
+    indices = np.searchsorted(epoch_ns, grid_ns, side="right") - 1
+    return values[np.clip(indices, 0, len(values) - 1)]
+
+
+def gap_flags(
+    grid_ns: np.ndarray, epoch_ns: np.ndarray, tolerance_ns: int
+) -> np.ndarray:
+    """Flags grid points that fall between samples further apart than the tolerance.
+
+    Grid points landing exactly on a sample are never flagged.
+    """
+    right = np.clip(
+        np.searchsorted(epoch_ns, grid_ns, side="left"), 1, len(epoch_ns) - 1
+    )
+    spacing = epoch_ns[right] - epoch_ns[right - 1]
+    on_sample = epoch_ns[right] == grid_ns
+    return ((spacing > tolerance_ns) & ~on_sample).astype(np.int8)
+
+
+class Resampler:
+    """Maps a recording onto a fixed-rate time grid.
+
+    Numeric columns are linearly interpolated, label columns take the last
+    known value, and a ``gap`` column flags grid points interpolated across
+    a delivery gap longer than the tolerance.
+    """
+
+    def __init__(
+        self,
+        period_ms: float = DEFAULT_PERIOD_MS,
+        gap_tolerance_ms: float = None,
+    ):
+        self.period_ns = int(period_ms * 1_000_000)
+        self.gap_tolerance_ns = int(
+            (gap_tolerance_ms or DEFAULT_GAP_TOLERANCE_PERIODS * period_ms) * 1_000_000
+        )
+
+    def resample(self, dataframe: pd.DataFrame, timestamp_col: str) -> pd.DataFrame:
+        """Resamples ``dataframe`` whose ``timestamp_col`` holds int64 epoch ns."""
+        epoch_ns = dataframe[timestamp_col].to_numpy(dtype=np.int64)
+        order = np.argsort(epoch_ns, kind="stable")
+        epoch_ns = epoch_ns[order]
+        keep = np.concatenate([[True], np.diff(epoch_ns) > 0])
+        epoch_ns = epoch_ns[keep]
+        grid_ns = uniform_grid(epoch_ns, self.period_ns)
+
+        resampled = {timestamp_col: grid_ns}
+        for column in dataframe.columns:
+            if column == timestamp_col:
+                continue
+            values = dataframe[column].to_numpy()[order][keep]
+            if column in STEP_COLUMNS:
+                resampled[column] = step_interpolate(grid_ns, epoch_ns, values)
+            elif np.issubdtype(values.dtype, np.number):
+                resampled[column] = np.interp(grid_ns, epoch_ns, values)
+        resampled[GAP_COLUMN] = gap_flags(grid_ns, epoch_ns, self.gap_tolerance_ns)
+
+        result = pd.DataFrame(resampled)
+        logger.info(
+            f"Resampled {len(dataframe)} rows onto {len(result)} grid points, "
+            f"{int(result[GAP_COLUMN].sum())} inside gaps"
+        )
+        return result
@@ -0,0 +1,172 @@
+from collections import deque
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+from scipy.ndimage import maximum_filter1d, minimum_filter1d
+
+DEFAULT_SIGNALS = ("ax", "ay", "az", "g_force")
+DEFAULT_WINDOWS = (16,)
+STATISTICS = ("mean", "std", "min", "max", "energy", "zero_crossings")
+SMA_AXES = ("ax", "ay", "az")
+
+
+def trailing_sums(values: np.ndarray, window: int) -> tuple[np.ndarray, np.ndarray]:
+    """Sum of the last ``window`` values at every sample, and how many there were.
+
+    The first ``window - 1`` samples sum over the shorter history available.
+    """
+    cumulative = np.concatenate([[0.0], np.cumsum(values, dtype=np.float64)])
+    end = np.arange(1, len(values) + 1)
+    start = np.maximum(end - window, 0)
+    return cumulative[end] - cumulative[start], end - start
+
+
+def sign_changes(values: np.ndarray) -> np.ndarray:
+    """1 where a sample is on the other side of zero from the previous one."""
+    positive = values >= 0
+    changes = np.zeros(len(values), dtype=np.float64)
+    changes[1:] = positive[1:] != positive[:-1]
+    return changes
+
+
+def rolling_statistics(values: np.ndarray, window: int) -> dict:
+    """All trailing-window statistics of one signal, each in O(n)."""
+    values = np.asarray(values, dtype=np.float64)
+    sums, counts = trailing_sums(values, window)
+    squares, _ = trailing_sums(values**2, window)
+    mean = sums / counts
+    energy = squares / counts
+    origin = (window - 1) // 2
+    return {
+        "mean": mean,
+        "std": np.sqrt(np.maximum(energy - mean**2, 0)),
+        "min": minimum_filter1d(values, window, mode="nearest", origin=origin),
+        "max": maximum_filter1d(values, window, mode="nearest", origin=origin),
+        "energy": energy,
+        "zero_crossings": trailing_sums(sign_changes(values), window)[0],
+    }
+
+
+class RollingFeatureEngine:
+    """Windowed statistics over trailing windows of ``windows`` samples.
+
+    Adds ``<signal>_<statistic>_<window>`` for every signal and a signal
+    magnitude area ``sma_<window>`` over the accelerometer axes. ``calculate``
+    works on a whole recording; ``stream`` returns a per-sample calculator
+    producing the same values for live data.
+    """
+
+    def __init__(
+        self, signals: tuple = DEFAULT_SIGNALS, windows: tuple = DEFAULT_WINDOWS
+    ):
+        self.signals = list(signals)
+        self.windows = list(windows)
+
+    @property
+    def columns(self) -> list[str]:
+        names = [
+            f"{signal}_{statistic}_{window}"
+            for window in self.windows
+            for signal in self.signals
+            for statistic in STATISTICS
+        ]
+        return names + [f"sma_{window}" for window in self.windows]
+
+    def calculate(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        logger.info(f"Calculating rolling features over windows {self.windows}")
+        features = {}
+        absolute_sum = np.abs(dataframe[list(SMA_AXES)].to_numpy(np.float64)).sum(
+            axis=1
+        )
+        for window in self.windows:
+            for signal in self.signals:
+                statistics = rolling_statistics(dataframe[signal].to_numpy(), window)
+                for statistic in STATISTICS:
+                    features[f"{signal}_{statistic}_{window}"] = statistics[statistic]
+            sums, counts = trailing_sums(absolute_sum, window)
+            features[f"sma_{window}"] = sums / counts
+        return pd.DataFrame(features, index=dataframe.index)[self.columns]
+
+    def stream(self) -> "RollingFeatureStream":
+        return RollingFeatureStream(self)
+
+
+class _TrailingWindow:
+    """Running sums and monotonic min/max deques over the last ``size`` samples."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.index = -1
+        self.values = deque()
+        self.changes = deque()
+        self.minimums = deque()
+        self.maximums = deque()
+        self.total = 0.0
+        self.squares = 0.0
+        self.crossings = 0.0
+
+    def push(self, value: float) -> dict:
+        self.index += 1
+        change = float(bool(self.values) and (value >= 0) != (self.values[-1] >= 0))
+        self.values.append(value)
+        self.changes.append(change)
+        self.total += value
+        self.squares += value * value
+        self.crossings += change
+        if len(self.values) > self.size:
+            oldest = self.values.popleft()
+            self.total -= oldest
+            self.squares -= oldest * oldest
+            self.crossings -= self.changes.popleft()
+
+        while self.minimums and self.minimums[-1][1] >= value:
+            self.minimums.pop()
+        self.minimums.append((self.index, value))
+        while self.maximums and self.maximums[-1][1] <= value:
+            self.maximums.pop()
+        self.maximums.append((self.index, value))
+        for extremes in (self.minimums, self.maximums):
+            if extremes[0][0] <= self.index - self.size:
+                extremes.popleft()
+
+        count = len(self.values)
+        mean = self.total / count
+        energy = self.squares / count
+        return {
+            "mean": mean,
+            "std": np.sqrt(max(energy - mean * mean, 0.0)),
+            "min": self.minimums[0][1],
+            "max": self.maximums[0][1],
+            "energy": energy,
+            "zero_crossings": self.crossings,
+        }
+
+
+class RollingFeatureStream:
+    """Computes the rolling features one sample at a time in O(1) amortised."""
+
+    def __init__(self, engine: RollingFeatureEngine):
+        self.engine = engine
+        self.windows = {
+            (signal, window): _TrailingWindow(window)
+            for window in engine.windows
+            for signal in engine.signals
+        }
+        self.sma_windows = {
+            window: _TrailingWindow(window) for window in engine.windows
+        }
+
+    def push(self, sample: dict) -> dict:
+        features = {}
+        for (signal, window), trailing in self.windows.items():
+            for statistic, value in trailing.push(float(sample[signal])).items():
+                features[f"{signal}_{statistic}_{window}"] = value
+        absolute_sum = sum(abs(float(sample[axis])) for axis in SMA_AXES)
+        for window, trailing in self.sma_windows.items():
+            features[f"sma_{window}"] = trailing.push(absolute_sum)["mean"]
+        return features
+
+    def process(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        rows = [self.push(sample) for sample in chunk.to_dict("records")]
+        return pd.DataFrame(rows, index=chunk.index, columns=self.engine.columns)
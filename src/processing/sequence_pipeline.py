@@ -0,0 +1,137 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+from loguru import logger
+
+from src.processing.csv_processing_pipeline import CSVPreprocessor
+from src.processing.dtypes import apply_schema
+from src.processing.source_all_processor import DataProcessor, setup_directories
+from src.processing.split_sequences import (
+    DEFAULT_SEED,
+    SplitSequences,
+    recording_name,
+    recording_rng,
+)
+
+SEQUENCE_DIRECTORY = "data/seq/"
+
+
+class SequencePipeline:
+    """Turns raw recordings straight into training sequences.
+
+    Each recording is validated, given its motion features, cleaned and
+    split in memory, and its sequences are written to ``output_directory``
+    named after the recording, so sequences never span two recordings.
+    The ``processed_*`` and ``cleaned_*`` intermediates are only written
+    when a ``debug_directory`` is given.
+    """
+
+    def __init__(
+        self,
+        raw_directory: str,
+        output_directory: str = SEQUENCE_DIRECTORY,
+        debug_directory: str = None,
+        workers: int = None,
+        base_seed: int = DEFAULT_SEED,
+        **processor_options,
+    ):
+        self.raw_directory = raw_directory
+        self.output_directory = output_directory
+        self.debug_directory = debug_directory
+        self.workers = workers
+        self.base_seed = base_seed
+        self.processor_options = processor_options
+
+    def run(self) -> dict:
+        os.makedirs(self.output_directory, exist_ok=True)
+        if self.debug_directory:
+            os.makedirs(self.debug_directory, exist_ok=True)
+        files = sorted(
+            file for file in os.listdir(self.raw_directory) if file.endswith(".csv")
+        )
+        logger.info(f"Building sequences from {len(files)} recordings")
+
+        if self.workers == 1:
+            results = [self.process_recording(file) for file in files]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                results = list(executor.map(self.process_recording, files))
+
+        summary = {"recordings": len(files), "failed": [], "fall": 0, "non_fall": 0}
+        for file, result in zip(files, results):
+            if result is None:
+                summary["failed"].append(file)
+                continue
+            summary["fall"] += result["fall"]
+            summary["non_fall"] += result["non_fall"]
+        logger.info(f"Sequence pipeline finished: {summary}")
+        return summary
+
+    def process_recording(self, file: str) -> dict:
+        """Runs one recording end to end; returns its sequence counts, or None
+        when the recording could not be processed."""
+        try:
+            processor = DataProcessor(
+                self.raw_directory,
+                self.debug_directory or ".",
+                **self.processor_options,
+            )
+            processed = processor.process_data(processor.load_data(file), file)
+            cleaned = CSVPreprocessor(processor.feature_set).clean(processed)
+            if self.debug_directory:
+                apply_schema(processed).to_csv(
+                    Path(self.debug_directory) / f"processed_{file}", index=False
+                )
+                apply_schema(cleaned).to_csv(
+                    Path(self.debug_directory) / f"cleaned_{file}", index=False
+                )
+
+            name = recording_name(file)
+            splitter = SplitSequences(
+                cleaned,
+                self.output_directory,
+                name_prefix=name,
+                rng=recording_rng(self.base_seed, name),
+            )
+            splitter.split_csv()
+            logger.info(f"{file}: {splitter.saved_sequences}")
+            return splitter.saved_sequences
+        except Exception as e:
+            logger.error(f"Error building sequences from {file}: {e}")
+            return None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Process, clean and split raw recordings into training sequences"
+    )
+    parser.add_argument("folder", choices=["sample", "data", "data2"])
+    parser.add_argument("--output", default=SEQUENCE_DIRECTORY)
+    parser.add_argument(
+        "--debug-dir", help="Also write the processed and cleaned recordings here"
+    )
+    parser.add_argument("--workers", type=int, help="Processes; defaults to CPU count")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repair", action="store_true")
+    parser.add_argument("--resample-ms", type=float)
+    parser.add_argument("--condition", action="store_true")
+    args = parser.parse_args()
+
+    path_to_raw, _ = setup_directories(args.folder)
+    SequencePipeline(
+        path_to_raw,
+        args.output,
+        debug_directory=args.debug_dir,
+        workers=args.workers,
+        base_seed=args.seed,
+        repair=args.repair,
+        resample_period_ms=args.resample_ms,
+        condition=args.condition,
+    ).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import argparse
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+from scipy.signal import butter, sosfilt, sosfilt_zi
+
+from src.processing.resampling import DEFAULT_PERIOD_MS
+
+DEFAULT_SAMPLE_RATE_HZ = 1000 / DEFAULT_PERIOD_MS
+LOW_PASS_CUTOFF_HZ = 5.0
+HIGH_PASS_CUTOFF_HZ = 0.3
+FILTER_ORDER = 2
+ACCEL_COLUMNS = ("ax", "ay", "az")
+
+
+@lru_cache(maxsize=None)
+def design_filter(
+    kind: str, cutoff_hz: float, sample_rate_hz: float, order: int = FILTER_ORDER
+) -> np.ndarray:
+    """Butterworth filter as second-order sections."""
+    nyquist = sample_rate_hz / 2
+    if not 0 < cutoff_hz < nyquist:
+        raise ValueError(
+            f"Cutoff {cutoff_hz} Hz must lie between 0 and the Nyquist rate {nyquist} Hz"
+        )
+    return butter(order, cutoff_hz, btype=kind, fs=sample_rate_hz, output="sos")
+
+
+class SignalConditioner:
+    """Low-pass smoothing and high-pass gravity removal for the accelerometer axes.
+
+    ``filter`` conditions a whole recording, ``process`` conditions one chunk
+    of a stream and carries the filter state to the next chunk, so chunked
+    and whole-file output are identical. Filters start in the steady state of
+    the first sample, which removes the start-up transient and makes the
+    gravity-removed signal start at zero.
+    """
+
+    def __init__(
+        self,
+        columns: tuple = ACCEL_COLUMNS,
+        sample_rate_hz: float = DEFAULT_SAMPLE_RATE_HZ,
+        low_pass_hz: float = LOW_PASS_CUTOFF_HZ,
+        high_pass_hz: float = HIGH_PASS_CUTOFF_HZ,
+        order: int = FILTER_ORDER,
+    ):
+        self.columns = list(columns)
+        self.low_pass = design_filter("lowpass", low_pass_hz, sample_rate_hz, order)
+        self.high_pass = design_filter("highpass", high_pass_hz, sample_rate_hz, order)
+        self.reset()
+
+    def reset(self) -> None:
+        self.low_pass_state = None
+        self.high_pass_state = None
+
+    def filter(self, dataframe: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """Batch mode: conditions a whole recording from a fresh state."""
+        self.reset()
+        return self.process(dataframe)
+
+    def process(self, chunk: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """Streaming mode: returns the smoothed and the gravity-removed axes."""
+        values = chunk[self.columns].to_numpy(dtype=np.float64)
+        if len(values) == 0:
+            empty = pd.DataFrame(columns=self.columns, index=chunk.index)
+            return empty, empty.copy()
+        if self.low_pass_state is None:
+            self.low_pass_state = self._steady_state(self.low_pass, values[0])
+        smoothed, self.low_pass_state = sosfilt(
+            self.low_pass, values, axis=0, zi=self.low_pass_state
+        )
+        if self.high_pass_state is None:
+            self.high_pass_state = self._steady_state(self.high_pass, smoothed[0])
+        linear, self.high_pass_state = sosfilt(
+            self.high_pass, smoothed, axis=0, zi=self.high_pass_state
+        )
+        return (
+            pd.DataFrame(smoothed, columns=self.columns, index=chunk.index),
+            pd.DataFrame(linear, columns=self.columns, index=chunk.index),
+        )
+
+    @staticmethod
+    def _steady_state(sos: np.ndarray, first_sample: np.ndarray) -> np.ndarray:
+        return sosfilt_zi(sos)[:, :, np.newaxis] * first_sample[np.newaxis, np.newaxis]
+
+
+def condition_file(
+    source: str,
+    destination: str,
+    chunksize: int = 100_000,
+    conditioner: SignalConditioner = None,
+) -> None:
+    """Filters a recording chunk by chunk, in memory bounded by ``chunksize``.
+
+    The smoothed axes replace the raw ones and the gravity-removed axes are
+    written as ``linear_<axis>`` columns.
+    """
+    conditioner = conditioner or SignalConditioner()
+    conditioner.reset()
+    rows = 0
+    for index, chunk in enumerate(pd.read_csv(source, chunksize=chunksize)):
+        smoothed, linear = conditioner.process(chunk)
+        chunk[conditioner.columns] = smoothed
+        for column in conditioner.columns:
+            chunk[f"linear_{column}"] = linear[column]
+        chunk.to_csv(
+            destination, mode="w" if index == 0 else "a", header=index == 0, index=False
+        )
+        rows += len(chunk)
+    logger.info(f"Conditioned {rows} rows from {source} into {destination}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Smooth a recording and remove gravity in constant memory"
+    )
+    parser.add_argument("source")
+    parser.add_argument("destination")
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--sample-rate", type=float, default=DEFAULT_SAMPLE_RATE_HZ)
+    parser.add_argument("--low-pass", type=float, default=LOW_PASS_CUTOFF_HZ)
+    parser.add_argument("--high-pass", type=float, default=HIGH_PASS_CUTOFF_HZ)
+    args = parser.parse_args()
+    condition_file(
+        args.source,
+        args.destination,
+        args.chunksize,
+        SignalConditioner(
+            sample_rate_hz=args.sample_rate,
+            low_pass_hz=args.low_pass,
+            high_pass_hz=args.high_pass,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -8,20 +8,58 @@ import pandas as pd
 from loguru import logger
 
 from src.processing.data_validator import DataValidator
+from src.processing.dtypes import apply_schema, read_csv_with_schema
+from src.processing.feature_selection import FeatureSetSpec
 from src.processing.motion_features import MotionFeatureCalculator
+from src.processing.resampling import DEFAULT_PERIOD_MS, Resampler
+from src.processing.rolling_features import RollingFeatureEngine
+from src.processing.signal_conditioning import SignalConditioner
+from src.processing.spectral_features import SpectralFeatureEngine
 
 from src.tools.acceleration import Acceleration
 
 
 class DataProcessor:
-    def __init__(self, raw: str, processed: str):
+    def __init__(
+        self,
+        raw: str,
+        processed: str,
+        repair: bool = False,
+        resample_period_ms: float = None,
+        condition: bool = False,
+        rolling_windows: list = None,
+        spectral_window: int = None,
+    ):
         self.raw = Path(raw)
+        self.repair = repair
+        self.resampler = Resampler(resample_period_ms) if resample_period_ms else None
+        self.conditioner = (
+            SignalConditioner(
+                sample_rate_hz=1000 / (resample_period_ms or DEFAULT_PERIOD_MS)
+            )
+            if condition
+            else None
+        )
+        self.rolling = (
+            RollingFeatureEngine(windows=tuple(rolling_windows))
+            if rolling_windows
+            else None
+        )
+        self.spectral = (
+            SpectralFeatureEngine(
+                window=spectral_window,
+                sample_rate_hz=1000 / (resample_period_ms or DEFAULT_PERIOD_MS),
+            )
+            if spectral_window
+            else None
+        )
         self.processed = Path(processed)
         self.required_accelerometer_columns = [
             field.name for field in dataclasses.fields(Acceleration)
         ]
         self.data_validator = DataValidator()
         self.motion_feature_calculator = MotionFeatureCalculator()
+        self.feature_set = FeatureSetSpec.load()
 
     def process_file(self, file: str) -> None:
         if self.is_already_processed(file):
@@ -48,7 +86,7 @@ class DataProcessor:
         file_path = self.raw / filename
         if file_path.exists():
             logger.info(f"File found at {file_path}")
-            return pd.read_csv(file_path)
+            return read_csv_with_schema(file_path)
         else:
             logger.error(f"No file found at {file_path}")
             raise FileNotFoundError(f"No file found at {file_path}")
@@ -59,10 +97,18 @@ class DataProcessor:
             validated_data = self.data_validator.validate(
                 data=data,
                 required_accelerator_columns=self.required_accelerometer_columns,
+                repair=self.repair,
             )
             logger.info("Processing data")
             processed_data = self.motion_feature_calculator.calculate_all_features(
-                validated_data, "timestamp", ["ax", "ay", "az"]
+                validated_data,
+                "timestamp",
+                ["ax", "ay", "az"],
+                feature_set=self.feature_set.features if self.feature_set else None,
+                resampler=self.resampler,
+                conditioner=self.conditioner,
+                rolling=self.rolling,
+                spectral=self.spectral,
             )
             logger.info("Data processed")
         except Exception as e:
@@ -74,7 +120,7 @@ class DataProcessor:
         try:
             logger.info(f"Saving data to {filename}")
             save_path = self.processed / filename
-            data.to_csv(save_path, index=False)
+            apply_schema(data).to_csv(save_path, index=False)
             logger.info(f"Data saved to {save_path}")
         except Exception as e:
             logger.error(f"Error saving file: {e}")
@@ -102,10 +148,25 @@ def setup_directories(folder):
     return path_to_raw, path_to_processed
 
 
-def main(folder):
+def main(
+    folder,
+    repair=False,
+    resample_period_ms=None,
+    condition=False,
+    rolling_windows=None,
+    spectral_window=None,
+):
     logger.info("Starting data processing")
     path_to_raw, path_to_processed = setup_directories(folder=folder)
-    data_processor = DataProcessor(path_to_raw, path_to_processed)
+    data_processor = DataProcessor(
+        path_to_raw,
+        path_to_processed,
+        repair=repair,
+        resample_period_ms=resample_period_ms,
+        condition=condition,
+        rolling_windows=rolling_windows,
+        spectral_window=spectral_window,
+    )
 
     logger.info("Processing files")
     for file in os.listdir(path_to_raw):
@@ -119,5 +180,38 @@ if __name__ == "__main__":
         choices=["sample", "data", "data2"],
         help="Specify the folder to process",
     )
+    parser.add_argument(
+        "--repair",
+        action="store_true",
+        help="Drop null, duplicated and out-of-order rows instead of failing",
+    )
+    parser.add_argument(
+        "--resample-ms",
+        type=float,
+        help="Resample every recording onto a uniform grid with this period",
+    )
+    parser.add_argument(
+        "--condition",
+        action="store_true",
+        help="Low-pass the axes and integrate gravity-removed acceleration",
+    )
+    parser.add_argument(
+        "--rolling-windows",
+        type=int,
+        nargs="+",
+        help="Add rolling statistics over trailing windows of these sample counts",
+    )
+    parser.add_argument(
+        "--spectral-window",
+        type=int,
+        help="Add frequency-domain features over trailing windows of this many samples",
+    )
     args = parser.parse_args()
-    main(args.folder)
+    main(
+        args.folder,
+        repair=args.repair,
+        resample_period_ms=args.resample_ms,
+        condition=args.condition,
+        rolling_windows=args.rolling_windows,
+        spectral_window=args.spectral_window,
+    )
@@ -1,8 +1,36 @@
-import pandas as pd
+import argparse
+import csv
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from src.helper_functions.model_helper_functions import ModelHelpingFunctions
 
+DROPPED_COLUMNS = ("timestamp", "time_interval")
+
+
+def drop_columns(source: Path, destination: Path, columns: tuple = DROPPED_COLUMNS):
+    """Copies a CSV without ``columns``, one row at a time.
+
+    Fields are copied as text and never parsed, so values are written back
+    exactly as they were read. A file with none of the columns is copied
+    byte for byte.
+    """
+    with open(source, "r", newline="") as reader_file:
+        header = next(csv.reader(reader_file), [])
+    keep = [index for index, name in enumerate(header) if name not in columns]
+    if len(keep) == len(header):
+        shutil.copyfile(source, destination)
+        return
+
+    with open(source, "r", newline="") as reader_file, open(
+        destination, "w", newline=""
+    ) as writer_file:
+        reader = csv.reader(reader_file)
+        writer = csv.writer(writer_file, lineterminator="\n")
+        for row in reader:
+            writer.writerow([row[index] for index in keep])
+
 
 class SourceBPreprocessor:
     def __init__(self, input_directory: str, output_directory: str):
@@ -13,39 +41,33 @@ class SourceBPreprocessor:
         self.output_directory.mkdir(parents=True, exist_ok=True)
         self.model_helper = ModelHelpingFunctions()
 
-    def process_each_csv_file(self) -> None:
-        for file_path in self.input_directory.glob("*.csv"):
-            try:
-                self.model_helper.log_info(f"Processing {file_path.name}")
-                df = pd.read_csv(file_path)
-                df = self.drop_timestamp_column(df)
-                self.save_csv_into_folder(df, file_path.name)
-            except FileNotFoundError as e:
-                self.model_helper.log_error(f"File not found: {e}")
-                raise FileNotFoundError(f"File not found: {e}")
-            except Exception as e:
-                self.model_helper.log_exception(f"Error processing file: {e}")
-                raise e
-
-    def drop_timestamp_column(self, df: pd.DataFrame) -> pd.DataFrame:
-        try:
-            df = df.drop(columns=["timestamp", "time_interval"], errors="ignore")
-            self.model_helper.log_info("Dropped timestamp and time_interval columns")
-            return df
-        except Exception as e:
-            self.model_helper.log_error(f"Error dropping timestamp column: {e}")
-            raise e
+    def process_each_csv_file(self, workers: int = None) -> None:
+        """Drops the time columns from every file across a process pool.
 
-    def save_csv_into_folder(self, df: pd.DataFrame, file_name: str) -> None:
-        try:
-            modified_file_name = self.get_modified_filename(file_name)
-            save_path = self.output_directory / modified_file_name
-            self.model_helper.log_info(f"Saving file {save_path}")
-            df.to_csv(save_path, index=False)
-            self.model_helper.log_info(f"Data saved to {save_path}")
-        except Exception as e:
-            self.model_helper.log_exception(f"Error saving file: {e}")
-            raise e
+        Output names are assigned up front in sorted file order, so the
+        counters give the same names however the work is scheduled.
+        """
+        file_paths = sorted(self.input_directory.glob("*.csv"))
+        destinations = [
+            self.output_directory / self.get_modified_filename(file_path.name)
+            for file_path in file_paths
+        ]
+        self.model_helper.log_info(f"Processing {len(file_paths)} files")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(drop_columns, file_path, destination): file_path
+                for file_path, destination in zip(file_paths, destinations)
+            }
+            for future, file_path in futures.items():
+                try:
+                    future.result()
+                    self.model_helper.log_info(f"Processed {file_path.name}")
+                except FileNotFoundError as e:
+                    self.model_helper.log_error(f"File not found: {e}")
+                    raise FileNotFoundError(f"File not found: {e}")
+                except Exception as e:
+                    self.model_helper.log_exception(f"Error processing file: {e}")
+                    raise e
 
     def get_modified_filename(self, file_name: str) -> str:
         try:
@@ -67,13 +89,18 @@ class SourceBPreprocessor:
 
 
 def main():
-    input_directory = "data2/processed/"
-    output_directory = "data/seq/"
+    parser = argparse.ArgumentParser(
+        description="Copy source B recordings into data/seq without time columns"
+    )
+    parser.add_argument("--input", default="data2/processed/")
+    parser.add_argument("--output", default="data/seq/")
+    parser.add_argument("--workers", type=int, help="Processes; defaults to CPU count")
+    args = parser.parse_args()
 
     data_processor = SourceBPreprocessor(
-        input_directory=input_directory, output_directory=output_directory
+        input_directory=args.input, output_directory=args.output
     )
-    data_processor.process_each_csv_file()
+    data_processor.process_each_csv_file(workers=args.workers)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,138 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.fft import rfft, rfftfreq
+from scipy.signal import get_window
+
+from src.processing.signal_conditioning import DEFAULT_SAMPLE_RATE_HZ
+
+DEFAULT_SIGNALS = ("g_force",)
+DEFAULT_WINDOW = 32
+DEFAULT_BANDS_HZ = ((0.0, 1.0), (1.0, 3.0), (3.0, 7.0))
+# Windows transformed per rfft call; bounds the stacked copy to a few MB.
+WINDOWS_PER_BLOCK = 8192
+
+
+@lru_cache(maxsize=None)
+def window_function(name: str, length: int) -> np.ndarray:
+    window = get_window(name, length, fftbins=True)
+    window.setflags(write=False)
+    return window
+
+
+@lru_cache(maxsize=None)
+def band_masks(
+    length: int, sample_rate_hz: float, bands: tuple
+) -> tuple[np.ndarray, np.ndarray]:
+    """The rfft bin frequencies and one boolean mask per band, ``low <= f < high``."""
+    frequencies = rfftfreq(length, d=1 / sample_rate_hz)
+    masks = np.stack(
+        [(frequencies >= low) & (frequencies < high) for low, high in bands]
+    )
+    frequencies.setflags(write=False)
+    masks.setflags(write=False)
+    return frequencies, masks
+
+
+def band_name(low: float, high: float) -> str:
+    return f"{low:g}_{high:g}hz".replace(".", "p")
+
+
+def trailing_windows(values: np.ndarray, window: int) -> np.ndarray:
+    """A (samples, window) strided view whose row i ends at sample i.
+
+    The first rows are padded with the first value so every sample has a window.
+    """
+    padded = np.concatenate([np.full(window - 1, values[0]), values])
+    return sliding_window_view(padded, window)
+
+
+def power_spectra(
+    values: np.ndarray, window: int, window_name: str = "hann"
+) -> np.ndarray:
+    """Power spectrum of every trailing window with its mean removed."""
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) == 0:
+        return np.empty((0, window // 2 + 1))
+    windows = trailing_windows(values, window)
+    taper = window_function(window_name, window)
+    spectra = np.empty((len(windows), window // 2 + 1))
+    for start in range(0, len(windows), WINDOWS_PER_BLOCK):
+        block = windows[start : start + WINDOWS_PER_BLOCK]
+        block = (block - block.mean(axis=1, keepdims=True)) * taper
+        spectra[start : start + len(block)] = np.abs(rfft(block, axis=1)) ** 2
+    return spectra
+
+
+def spectral_statistics(
+    values: np.ndarray,
+    window: int = DEFAULT_WINDOW,
+    sample_rate_hz: float = DEFAULT_SAMPLE_RATE_HZ,
+    bands: tuple = DEFAULT_BANDS_HZ,
+) -> dict:
+    """Dominant frequency, band energies and spectral entropy of each window."""
+    spectra = power_spectra(values, window)
+    frequencies, masks = band_masks(window, sample_rate_hz, tuple(bands))
+    total = spectra[:, 1:].sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        distribution = spectra[:, 1:] / total[:, np.newaxis]
+        entropy = -np.nansum(distribution * np.log(distribution), axis=1)
+    statistics = {
+        "dominant_frequency": frequencies[1 + np.argmax(spectra[:, 1:], axis=1)],
+        "spectral_entropy": np.where(
+            total > 0, entropy / np.log(spectra.shape[1] - 1), 0.0
+        ),
+    }
+    energies = spectra @ masks.T / window
+    for (low, high), energy in zip(bands, energies.T):
+        statistics[f"energy_{band_name(low, high)}"] = energy
+    return statistics
+
+
+class SpectralFeatureEngine:
+    """Frequency-domain features over a trailing window of ``window`` samples.
+
+    Every window of a signal is stacked into one strided view and transformed
+    with a single batched rfft; window functions and band masks are cached.
+    Columns are named ``<signal>_<feature>_<window>``.
+    """
+
+    def __init__(
+        self,
+        signals: tuple = DEFAULT_SIGNALS,
+        window: int = DEFAULT_WINDOW,
+        sample_rate_hz: float = DEFAULT_SAMPLE_RATE_HZ,
+        bands: tuple = DEFAULT_BANDS_HZ,
+    ):
+        self.signals = list(signals)
+        self.window = window
+        self.sample_rate_hz = sample_rate_hz
+        self.bands = tuple(tuple(band) for band in bands)
+
+    @property
+    def columns(self) -> list[str]:
+        features = ["dominant_frequency", "spectral_entropy"] + [
+            f"energy_{band_name(low, high)}" for low, high in self.bands
+        ]
+        return [
+            f"{signal}_{feature}_{self.window}"
+            for signal in self.signals
+            for feature in features
+        ]
+
+    def calculate(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        logger.info(f"Calculating spectral features over {self.window} samples")
+        features = {}
+        for signal in self.signals:
+            statistics = spectral_statistics(
+                dataframe[signal].to_numpy(),
+                self.window,
+                self.sample_rate_hz,
+                self.bands,
+            )
+            for name, values in statistics.items():
+                features[f"{signal}_{name}_{self.window}"] = values
+        return pd.DataFrame(features, index=dataframe.index)[self.columns]
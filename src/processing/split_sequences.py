@@ -1,15 +1,62 @@
-import pandas as pd
+import argparse
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Union
+
 import numpy as np
 import pandas as pd
 
 from src.helper_functions.model_helper_functions import ModelHelpingFunctions
+from src.processing.csv_processing_pipeline import CSVPreprocessor
+from src.processing.dtypes import apply_schema, read_csv_with_schema
+from src.processing.feature_selection import FeatureSetSpec
+
+DEFAULT_SEED = 42
+PROCESSED_PREFIX = "processed_"
+
+
+def stable_hash(name: str) -> int:
+    """A 64-bit hash of ``name`` that, unlike ``hash``, is the same in every process."""
+    return int.from_bytes(hashlib.blake2b(name.encode(), digest_size=8).digest(), "big")
+
+
+def recording_name(file_name: str) -> str:
+    """The recording a raw or processed file belongs to, e.g. ``walk`` for
+    both ``walk.csv`` and ``processed_walk.csv``."""
+    stem = Path(file_name).stem
+    return stem[len(PROCESSED_PREFIX) :] if stem.startswith(PROCESSED_PREFIX) else stem
+
+
+def recording_rng(base_seed: int, name: str) -> np.random.Generator:
+    """A generator that depends only on the seed and the recording, never on
+    which worker or in which order the recording is split."""
+    return np.random.default_rng(np.random.SeedSequence([base_seed, stable_hash(name)]))
 
 
 class SplitSequences:
-    def __init__(self, filepath: str, output_directory: str):
-        data_to_split = pd.read_csv(filepath)
+    def __init__(
+        self,
+        source: Union[str, pd.DataFrame],
+        output_directory: str,
+        name_prefix: str = "",
+        rng: np.random.Generator = None,
+    ):
+        """Splits a CSV file or an in-memory recording into fall and non-fall
+        sequences. With a ``name_prefix`` the files are named
+        ``<kind>_<name_prefix>_<counter>.csv`` so several recordings can share
+        one output directory. Pass an ``rng`` for reproducible fall context
+        lengths."""
+        data_to_split = (
+            read_csv_with_schema(source) if isinstance(source, str) else source
+        )
         self.data = data_to_split[data_to_split["fall_state"].isin([0, 1])]
+        self.data = self.data.reset_index(drop=True)
         self.output_directory = output_directory
+        self.name_prefix = name_prefix
+        self.saved_sequences = {"fall": 0, "non_fall": 0}
+        self.rng = rng or np.random.default_rng()
         self.in_fall_sequence = False
         self.end_index = None
         self.start_index = 0
@@ -17,7 +64,7 @@ class SplitSequences:
         self.model_helper = ModelHelpingFunctions()
 
     def random_value_between_20_and_40(self) -> int:
-        return np.random.randint(20, 40)
+        return int(self.rng.integers(20, 40))
 
     def split_csv(self) -> None:
         try:
@@ -25,11 +72,9 @@ class SplitSequences:
                 "Splitting CSV files into sequences of falls and non-falls"
             )
 
-            for i in range(1, len(self.data)):
-                current_state = self.data.iloc[i]["fall_state"]
-                previous_state = self.data.iloc[i - 1]["fall_state"]
-
-                self.process_sequence(current_state, previous_state, i)
+            states = self.data["fall_state"].to_numpy()
+            for i in self.state_change_indices(states):
+                self.process_sequence(states[i], states[i - 1], i)
 
             if self.start_index < len(self.data):
                 self.save_sequence(
@@ -39,6 +84,14 @@ class SplitSequences:
         except Exception as e:
             self.model_helper.log_exception(e)
 
+    @staticmethod
+    def state_change_indices(states: np.ndarray) -> np.ndarray:
+        """The only rows where ``process_sequence`` can act: every change of
+        state, and row 1 for a recording that starts inside a fall."""
+        if len(states) < 2:
+            return np.array([], dtype=int)
+        return np.union1d(np.flatnonzero(np.diff(states)) + 1, [1])
+
     def process_sequence(self, current_state: int, previous_state: int, i: int) -> None:
         try:
             self.model_helper.log_info(f"Processing sequence at index {i}")
@@ -125,9 +178,17 @@ class SplitSequences:
 
     def write_sequence_to_file(self, sequence: pd.DataFrame, is_fall: bool) -> None:
         try:
-            file_name = f"{self.output_directory}{'fall' if is_fall else 'non_fall'}_{self.counter}.csv"
-            sequence.to_csv(file_name, index=False)
+            kind = "fall" if is_fall else "non_fall"
+            if self.name_prefix:
+                file_name = os.path.join(
+                    self.output_directory,
+                    f"{kind}_{self.name_prefix}_{self.counter}.csv",
+                )
+            else:
+                file_name = f"{self.output_directory}{kind}_{self.counter}.csv"
+            apply_schema(sequence).to_csv(file_name, index=False)
             self.counter += 1
+            self.saved_sequences[kind] += 1
             self.model_helper.log_info(f"Sequence saved to {file_name}")
         except Exception as e:
             self.model_helper.log_exception(e)
@@ -143,10 +204,81 @@ class SplitSequences:
             self.model_helper.log_exception(e)
 
 
+def split_recording(
+    file_path: str,
+    output_directory: str,
+    base_seed: int = DEFAULT_SEED,
+    feature_set: FeatureSetSpec = None,
+) -> dict:
+    """Cleans and splits one processed recording; returns its sequence counts."""
+    name = recording_name(file_path)
+    data = CSVPreprocessor(feature_set).process(Path(file_path))
+    splitter = SplitSequences(
+        data, output_directory, name_prefix=name, rng=recording_rng(base_seed, name)
+    )
+    splitter.split_csv()
+    return splitter.saved_sequences
+
+
+def split_recordings(
+    input_directory: str,
+    output_directory: str,
+    base_seed: int = DEFAULT_SEED,
+    workers: int = None,
+) -> dict:
+    """Splits every processed recording on its own, across a process pool.
+
+    The output is identical for any number of workers: each recording gets
+    its own generator and its sequences are named after it.
+    """
+    os.makedirs(output_directory, exist_ok=True)
+    files = sorted(
+        os.path.join(input_directory, file)
+        for file in os.listdir(input_directory)
+        if file.endswith(".csv")
+    )
+    feature_set = FeatureSetSpec.load()
+    arguments = (
+        files,
+        [output_directory] * len(files),
+        [base_seed] * len(files),
+        [feature_set] * len(files),
+    )
+    if workers == 1:
+        results = list(map(split_recording, *arguments))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(split_recording, *arguments))
+
+    totals = {"recordings": len(files), "fall": 0, "non_fall": 0}
+    for result in results:
+        totals["fall"] += result["fall"]
+        totals["non_fall"] += result["non_fall"]
+    ModelHelpingFunctions().log_info(f"Split recordings: {totals}")
+    return totals
+
+
 def main():
-    filepath = "data/cleaned/merged_data.csv"
-    split_sequences = SplitSequences(filepath, "data/seq/")
-    split_sequences.split_csv()
+    parser = argparse.ArgumentParser(
+        description="Split processed recordings into fall and non-fall sequences"
+    )
+    parser.add_argument("--input", default="data/processed/")
+    parser.add_argument("--output", default="data/seq/")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--workers", type=int, help="Processes; defaults to CPU count")
+    parser.add_argument(
+        "--merged",
+        help="Split this merged CSV in one pass instead, as before",
+    )
+    args = parser.parse_args()
+
+    if args.merged:
+        split_sequences = SplitSequences(
+            args.merged, args.output, rng=np.random.default_rng(args.seed)
+        )
+        split_sequences.split_csv()
+    else:
+        split_recordings(args.input, args.output, args.seed, args.workers)
 
 
 if __name__ == "__main__":
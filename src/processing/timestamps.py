@@ -0,0 +1,79 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+NANOSECONDS_PER_SECOND = 1_000_000_000
+NANOSECONDS_PER_MILLISECOND = 1_000_000
+NANOSECONDS_PER_UNIT = {
+    "s": NANOSECONDS_PER_SECOND,
+    "ms": NANOSECONDS_PER_MILLISECOND,
+    "us": 1_000,
+    "ns": 1,
+}
+# Epoch nanoseconds pass 1e17 in March 1973; smaller integers are seconds,
+# milliseconds or microseconds and would silently land in 1970.
+MIN_PLAUSIBLE_EPOCH_NS = 10**17
+
+
+def to_epoch_ns(values, unit: Optional[str] = None) -> np.ndarray:
+    """Converts a timestamp column to int64 nanoseconds since the epoch.
+
+    Strings are parsed as ISO 8601 ("2024-02-06 10:00:42.430037" as written by
+    ``str(datetime.now())``, or the "T" separated ``isoformat()``), with or
+    without fractional seconds. Numbers are epoch offsets in ``unit`` ("s",
+    "ms", "us" or "ns"); without a unit only integers in nanoseconds are
+    accepted, and a ValueError is raised for floats or integers too small to
+    be nanoseconds.
+    """
+    values = np.asarray(values)
+    if unit is not None:
+        if unit not in NANOSECONDS_PER_UNIT:
+            raise ValueError(
+                f"Unknown timestamp unit {unit!r}, expected one of "
+                f"{sorted(NANOSECONDS_PER_UNIT)}"
+            )
+        if not np.issubdtype(values.dtype, np.number):
+            raise ValueError("A unit only applies to numeric timestamps")
+        if np.issubdtype(values.dtype, np.integer):
+            return values.astype(np.int64) * NANOSECONDS_PER_UNIT[unit]
+        # Scaling the whole and fractional parts apart keeps the nanoseconds
+        # that a float64 epoch in nanoseconds could not represent.
+        whole = np.floor(values)
+        fraction = np.rint((values - whole) * NANOSECONDS_PER_UNIT[unit])
+        return whole.astype(np.int64) * NANOSECONDS_PER_UNIT[unit] + fraction.astype(
+            np.int64
+        )
+    if np.issubdtype(values.dtype, np.floating):
+        raise ValueError(
+            f"Timestamps of dtype {values.dtype} are ambiguous, pass unit= "
+            "to give their epoch unit"
+        )
+    if np.issubdtype(values.dtype, np.integer):
+        nonzero = np.abs(values[values != 0])
+        if len(nonzero) and nonzero.max() < MIN_PLAUSIBLE_EPOCH_NS:
+            raise ValueError(
+                f"Integer timestamps up to {nonzero.max()} are too small to be "
+                "epoch nanoseconds, pass unit= to give their epoch unit"
+            )
+        return values.astype(np.int64, copy=False)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[ns]").view(np.int64)
+    try:
+        parsed = values.astype("datetime64[ns]")
+    except ValueError:
+        logger.warning("Timestamps are not plain ISO 8601, parsing with pandas")
+        parsed = pd.to_datetime(values, format="ISO8601").to_numpy("datetime64[ns]")
+    return parsed.view(np.int64)
+
+
+def device_ms_to_ns(values) -> np.ndarray:
+    return to_epoch_ns(values, unit="ms")
+
+
+def interval_seconds(epoch_ns: np.ndarray) -> np.ndarray:
+    """Seconds since the previous sample, 0 for the first one."""
+    if len(epoch_ns) == 0:
+        return np.zeros(0, dtype=np.float64)
+    return np.diff(epoch_ns, prepend=epoch_ns[0]) / NANOSECONDS_PER_SECOND
@@ -0,0 +1,150 @@
+"""Run make test_all in the terminal to run all the tests"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import boto3
+from moto import mock_s3
+
+from src.aws.s3_helpers.dataset_packer import DatasetPacker, PackedDatasetStore
+
+BUCKET_NAME = "test-bucket"
+
+
+@mock_s3
+class TestPackedDatasetStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.s3_client = boto3.client("s3", region_name="us-east-1")
+        self.s3_client.create_bucket(Bucket=BUCKET_NAME)
+        self.temp_dir = tempfile.mkdtemp()
+        self.source_dir = os.path.join(self.temp_dir, "raw")
+        self.target_dir = os.path.join(self.temp_dir, "fetched")
+        os.makedirs(self.source_dir)
+        for index in range(6):
+            for kind in ["fall", "non_fall"]:
+                with open(
+                    os.path.join(self.source_dir, f"{kind}_{index}.csv"), "w"
+                ) as file:
+                    file.write("ax,ay,az\n" + f"{index},1,2\n" * 50)
+        self.store = PackedDatasetStore(
+            BUCKET_NAME, "raw_data", s3_client=self.s3_client, max_workers=2
+        )
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_dir)
+
+    def test_pack_respects_shard_size_and_is_reproducible(self) -> None:
+        # Arrange
+        staging_dir = os.path.join(self.temp_dir, "staging")
+        packer = DatasetPacker(self.source_dir, staging_dir, max_shard_bytes=1000)
+
+        # Act
+        first = packer.pack()
+        second = packer.pack()
+
+        # Assert
+        self.assertGreater(len(first["shards"]), 1)
+        self.assertEqual(sum(len(shard["files"]) for shard in first["shards"]), 12)
+        self.assertEqual(first, second)
+
+    def test_new_file_only_changes_its_own_shard(self) -> None:
+        # Arrange
+        staging_dir = os.path.join(self.temp_dir, "staging")
+        packer = DatasetPacker(self.source_dir, staging_dir, max_shard_bytes=1000)
+        before = {shard["name"]: shard["sha256"] for shard in packer.pack()["shards"]}
+        with open(os.path.join(self.source_dir, "fall_00.csv"), "w") as file:
+            file.write("ax,ay,az\n0,0,0\n")
+
+        # Act
+        after = {shard["name"]: shard["sha256"] for shard in packer.pack()["shards"]}
+
+        # Assert
+        changed = [name for name in after if before.get(name) != after[name]]
+        self.assertEqual(len(changed), 1)
+
+    def test_push_deletes_shards_the_index_no_longer_names(self) -> None:
+        # Arrange
+        self.store.push(self.source_dir, max_shard_bytes=1000)
+        for file_name in os.listdir(self.source_dir):
+            if file_name != "fall_0.csv":
+                os.remove(os.path.join(self.source_dir, file_name))
+
+        # Act
+        self.store.push(self.source_dir, max_shard_bytes=1000)
+
+        # Assert
+        keys = [
+            item["Key"]
+            for item in self.s3_client.list_objects_v2(Bucket=BUCKET_NAME)["Contents"]
+        ]
+        self.assertEqual(
+            sorted(keys),
+            ["packed/raw_data/index.json", "packed/raw_data/shard-00000.tar.gz"],
+        )
+        self.assertEqual(self.store.pull(self.target_dir), ["fall_0.csv"])
+
+    def test_push_and_pull_round_trip(self) -> None:
+        # Arrange
+        self.store.push(self.source_dir, max_shard_bytes=1000)
+
+        # Act
+        extracted = self.store.pull(self.target_dir)
+
+        # Assert
+        self.assertEqual(sorted(extracted), sorted(os.listdir(self.source_dir)))
+        with open(os.path.join(self.target_dir, "fall_3.csv")) as file:
+            self.assertEqual(file.read(), "ax,ay,az\n" + "3,1,2\n" * 50)
+
+    def test_pull_only_fetches_matching_and_missing_files(self) -> None:
+        # Arrange
+        self.store.push(self.source_dir, max_shard_bytes=1000)
+        self.store.pull(self.target_dir, pattern="non_fall_*")
+
+        # Act
+        second_pull = self.store.pull(self.target_dir, pattern="non_fall_*")
+
+        # Assert
+        self.assertTrue(
+            all(name.startswith("non_fall_") for name in os.listdir(self.target_dir))
+        )
+        self.assertEqual(len(os.listdir(self.target_dir)), 6)
+        self.assertEqual(second_pull, [])
+
+    def test_unchanged_push_skips_all_shards(self) -> None:
+        # Arrange
+        self.store.push(self.source_dir, max_shard_bytes=1000)
+
+        # Act
+        result = self.store.push(self.source_dir, max_shard_bytes=1000)
+
+        # Assert
+        self.assertEqual(result.transferred, [])
+
+    def test_index_is_not_published_when_a_shard_fails(self) -> None:
+        # Arrange
+        upload_file = self.s3_client.upload_file
+
+        def failing_upload(local_path, bucket, key, **kwargs):
+            if key.endswith("shard-00001.tar.gz"):
+                raise OSError("connection reset")
+            return upload_file(local_path, bucket, key, **kwargs)
+
+        # Act
+        with mock.patch.object(self.s3_client, "upload_file", failing_upload):
+            with self.assertRaises(ValueError):
+                self.store.push(self.source_dir, max_shard_bytes=1000)
+
+        # Assert
+        keys = [
+            item["Key"]
+            for item in self.s3_client.list_objects_v2(Bucket=BUCKET_NAME)["Contents"]
+        ]
+        self.assertIn("packed/raw_data/shard-00000.tar.gz", keys)
+        self.assertNotIn("packed/raw_data/index.json", keys)
+
+
+if __name__ == "__main__":
+    unittest.main()
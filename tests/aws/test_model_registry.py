@@ -0,0 +1,128 @@
+"""Run make test_all in the terminal to run all the tests"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import boto3
+from moto import mock_s3
+
+from src.aws.s3_helpers.model_registry import ModelRegistry
+
+BUCKET_NAME = "test-bucket"
+
+
+@mock_s3
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        self.s3_client = boto3.client("s3", region_name="us-east-1")
+        self.s3_client.create_bucket(Bucket=BUCKET_NAME)
+        self.temp_dir = tempfile.mkdtemp()
+        self.model_path = os.path.join(self.temp_dir, "fall_detection_model.keras")
+        self.scaler_path = os.path.join(self.temp_dir, "scaler.pkl")
+        self._write(self.model_path, b"model-v1")
+        self._write(self.scaler_path, b"scaler-v1")
+        self.models_dir = os.path.join(self.temp_dir, "models")
+        self.registry = ModelRegistry(
+            BUCKET_NAME, s3_client=self.s3_client, local_directory=self.models_dir
+        )
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_dir)
+
+    @staticmethod
+    def _write(path: str, content: bytes) -> None:
+        with open(path, "wb") as file:
+            file.write(content)
+
+    def test_fetch_without_registry_returns_none(self) -> None:
+        self.assertIsNone(self.registry.fetch_current())
+
+    def test_fetch_points_current_at_published_version(self) -> None:
+        # Arrange
+        version = self.registry.publish(
+            self.model_path, self.scaler_path, metrics={"test_accuracy": 0.9}
+        )
+
+        # Act
+        self.registry.fetch_current()
+
+        # Assert
+        current = os.path.join(self.models_dir, "current")
+        self.assertTrue(os.path.islink(current))
+        self.assertEqual(os.path.basename(os.path.realpath(current)), version)
+        with open(os.path.join(current, "fall_detection_model.keras"), "rb") as file:
+            self.assertEqual(file.read(), b"model-v1")
+        with open(os.path.join(current, "metrics.json")) as file:
+            self.assertEqual(json.load(file), {"test_accuracy": 0.9})
+
+    def test_unchanged_registry_costs_one_get(self) -> None:
+        # Arrange
+        self.registry.publish(self.model_path, self.scaler_path)
+        self.registry.fetch_current()
+        operations = []
+        self.s3_client.meta.events.register(
+            "before-call.s3.*",
+            lambda model, **kwargs: operations.append(model.name),
+        )
+
+        # Act
+        self.registry.fetch_current()
+
+        # Assert
+        self.assertEqual(operations, ["GetObject"])
+
+    def test_new_version_replaces_current_link(self) -> None:
+        # Arrange
+        self.registry.publish(self.model_path, self.scaler_path)
+        self.registry.fetch_current()
+        self._write(self.model_path, b"model-v2")
+        second_version = self.registry.publish(self.model_path, self.scaler_path)
+
+        # Act
+        self.registry.fetch_current()
+
+        # Assert
+        current = os.path.join(self.models_dir, "current")
+        self.assertEqual(os.path.basename(os.path.realpath(current)), second_version)
+        with open(os.path.join(current, "fall_detection_model.keras"), "rb") as file:
+            self.assertEqual(file.read(), b"model-v2")
+
+    def test_corrupt_cached_artifact_is_downloaded_again(self) -> None:
+        # Arrange
+        self.registry.publish(self.model_path, self.scaler_path, metrics={})
+        self.registry.fetch_current()
+        cached_model = os.path.realpath(
+            os.path.join(self.models_dir, "current", "fall_detection_model.keras")
+        )
+        self._write(cached_model, b"model-XX")
+
+        # Act
+        self.registry.fetch_current()
+
+        # Assert
+        with open(cached_model, "rb") as file:
+            self.assertEqual(file.read(), b"model-v1")
+
+    def test_feature_schema_is_fetched_next_to_scaler(self) -> None:
+        # Arrange
+        schema_path = os.path.join(self.temp_dir, "feature_schema.json")
+        self._write(schema_path, b'{"names": ["ax"], "dtypes": ["float64"]}')
+        self.registry.publish(
+            self.model_path, self.scaler_path, schema_path=schema_path
+        )
+
+        # Act
+        self.registry.fetch_current()
+
+        # Assert
+        current = os.path.join(self.models_dir, "current")
+        self.assertTrue(os.path.exists(os.path.join(current, "scaler.pkl")))
+        with open(os.path.join(current, "feature_schema.json")) as file:
+            self.assertEqual(json.load(file)["names"], ["ax"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+"""Run make test_all in the terminal to run all the tests"""
+
+import unittest
+from unittest.mock import patch
+
+from src.aws.s3_helpers import s3_helper
+from src.aws.s3_helpers.s3_helper import S3Helpers, get_s3_client
+
+
+class TestS3ClientCache(unittest.TestCase):
+    def setUp(self) -> None:
+        s3_helper._s3_clients.clear()
+
+    def tearDown(self) -> None:
+        s3_helper._s3_clients.clear()
+
+    def test_helpers_do_not_create_clients_on_init(self) -> None:
+        # Act
+        with patch("boto3.session.Session") as mock_session:
+            S3Helpers("bucket", "raw_data")
+            S3Helpers("bucket", "processed_data")
+
+        # Assert
+        mock_session.assert_not_called()
+
+    def test_client_is_shared_per_credentials(self) -> None:
+        # Act
+        first = get_s3_client("key", "secret", None, "eu-north-1")
+        second = get_s3_client("key", "secret", None, "eu-north-1")
+        other = get_s3_client("other-key", "secret", None, "eu-north-1")
+
+        # Assert
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(
+            first.meta.config.max_pool_connections, s3_helper.MAX_POOL_CONNECTIONS
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
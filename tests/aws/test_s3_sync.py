@@ -0,0 +1,143 @@
+"""Run make test_all in the terminal to run all the tests"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import boto3
+from moto import mock_s3
+
+from src.aws.s3_helpers.s3_sync import S3SyncEngine, UploadPlanner, compute_etag
+
+BUCKET_NAME = "test-bucket"
+
+
+@mock_s3
+class TestS3SyncEngine(unittest.TestCase):
+    def setUp(self) -> None:
+        os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+        self.s3_client = boto3.client("s3", region_name="us-east-1")
+        self.s3_client.create_bucket(Bucket=BUCKET_NAME)
+        self.temp_dir = tempfile.mkdtemp()
+        self.local_dir = os.path.join(self.temp_dir, "raw")
+        os.makedirs(self.local_dir)
+        self.engine = S3SyncEngine(
+            BUCKET_NAME, "raw_data", s3_client=self.s3_client, max_workers=4
+        )
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_dir)
+
+    def _write_local(self, file_name: str, content: str) -> None:
+        with open(os.path.join(self.local_dir, file_name), "w") as file:
+            file.write(content)
+
+    def test_list_remote_objects_paginates_past_one_page(self) -> None:
+        # Arrange
+        for index in range(1005):
+            self.s3_client.put_object(
+                Bucket=BUCKET_NAME, Key=f"raw_data/file_{index}.csv", Body=b"x"
+            )
+
+        # Act
+        remote_objects = self.engine.list_remote_objects()
+
+        # Assert
+        self.assertEqual(len(remote_objects), 1005)
+
+    def test_download_skips_unchanged_objects(self) -> None:
+        # Arrange
+        self.s3_client.put_object(
+            Bucket=BUCKET_NAME, Key="raw_data/fall_1.csv", Body=b"ax,ay,az\n1,2,3\n"
+        )
+        self.s3_client.put_object(
+            Bucket=BUCKET_NAME, Key="raw_data/fall_2.csv", Body=b"ax,ay,az\n4,5,6\n"
+        )
+
+        # Act
+        first = self.engine.download(self.local_dir)
+        second = self.engine.download(self.local_dir)
+
+        # Assert
+        self.assertEqual(sorted(first.transferred), ["fall_1.csv", "fall_2.csv"])
+        self.assertEqual(second.transferred, [])
+        self.assertEqual(sorted(second.skipped), ["fall_1.csv", "fall_2.csv"])
+
+    def test_download_replaces_stale_local_copy(self) -> None:
+        # Arrange
+        self._write_local("fall_1.csv", "ax,ay,az\n0,0,0\n")
+        self.s3_client.put_object(
+            Bucket=BUCKET_NAME, Key="raw_data/fall_1.csv", Body=b"ax,ay,az\n1,2,3\n"
+        )
+
+        # Act
+        result = self.engine.download(self.local_dir)
+
+        # Assert
+        self.assertEqual(result.transferred, ["fall_1.csv"])
+        with open(os.path.join(self.local_dir, "fall_1.csv")) as file:
+            self.assertEqual(file.read(), "ax,ay,az\n1,2,3\n")
+
+    def test_upload_only_transfers_changed_files(self) -> None:
+        # Arrange
+        self._write_local("fall_1.csv", "ax,ay,az\n1,2,3\n")
+        self._write_local("fall_2.csv", "ax,ay,az\n4,5,6\n")
+        self.engine.upload(self.local_dir)
+        self._write_local("fall_2.csv", "ax,ay,az\n7,8,9\n")
+
+        # Act
+        result = self.engine.upload(self.local_dir)
+
+        # Assert
+        self.assertEqual(result.transferred, ["fall_2.csv"])
+        self.assertEqual(result.skipped, ["fall_1.csv"])
+        remote = self.engine.list_remote_objects()
+        self.assertEqual(
+            remote["fall_2.csv"].etag,
+            compute_etag(os.path.join(self.local_dir, "fall_2.csv")),
+        )
+
+    def test_noop_upload_costs_a_single_listing(self) -> None:
+        # Arrange
+        for index in range(5):
+            self._write_local(f"fall_{index}.csv", f"ax,ay,az\n{index},0,0\n")
+        self.engine.upload(self.local_dir)
+        operations = []
+        self.s3_client.meta.events.register(
+            "before-call.s3.*",
+            lambda model, **kwargs: operations.append(model.name),
+        )
+
+        # Act
+        result = self.engine.upload(self.local_dir)
+
+        # Assert
+        self.assertEqual(result.transferred, [])
+        self.assertEqual(len(result.skipped), 5)
+        self.assertEqual(operations, ["ListObjectsV2"])
+
+    def test_upload_planner_diffs_against_remote_index(self) -> None:
+        # Arrange
+        self._write_local("fall_1.csv", "ax,ay,az\n1,2,3\n")
+        self._write_local("fall_2.csv", "ax,ay,az\n4,5,6\n")
+        self.s3_client.upload_file(
+            os.path.join(self.local_dir, "fall_1.csv"),
+            BUCKET_NAME,
+            "raw_data/fall_1.csv",
+        )
+        files = {
+            f"raw_data/{name}": os.path.join(self.local_dir, name)
+            for name in ["fall_1.csv", "fall_2.csv"]
+        }
+
+        # Act
+        plan = UploadPlanner(self.engine.build_remote_index()).plan(files)
+
+        # Assert
+        self.assertEqual(plan.unchanged, ["raw_data/fall_1.csv"])
+        self.assertEqual([item.key for item in plan.uploads], ["raw_data/fall_2.csv"])
+
+
+if __name__ == "__main__":
+    unittest.main()
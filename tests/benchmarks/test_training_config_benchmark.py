@@ -0,0 +1,80 @@
+"""Run make test_all in the terminal to run all the tests"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+try:
+    from src.benchmarks.training_config_benchmark import (
+        BenchmarkResult,
+        run_benchmark,
+        write_best,
+    )
+    from src.modelling.training_config import TrainingConfig
+except ImportError:  # TensorFlow is missing from this environment
+    TrainingConfig = None
+
+
+def _exit_without_result(config, data_shape, epochs, queue) -> None:
+    os._exit(3)
+
+
+def _hang(config, data_shape, epochs, queue) -> None:
+    time.sleep(60)
+
+
+@unittest.skipIf(TrainingConfig is None, "needs tensorflow")
+class TestTrainingConfigBenchmark(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_dir)
+
+    def test_crashed_process_is_recorded_as_failed(self) -> None:
+        [result] = run_benchmark(
+            [TrainingConfig()], (4, 8, 2), 1, target=_exit_without_result
+        )
+
+        self.assertFalse(result.stable)
+        self.assertIn("exited with code 3", result.error)
+
+    def test_hung_process_times_out(self) -> None:
+        [result] = run_benchmark(
+            [TrainingConfig()], (4, 8, 2), 1, timeout_seconds=2, target=_hang
+        )
+
+        self.assertFalse(result.stable)
+        self.assertIn("No result after 2s", result.error)
+
+    def test_write_best_keeps_fields_the_grid_does_not_sweep(self) -> None:
+        path = os.path.join(self.temp_dir, "training_config.json")
+        TrainingConfig(
+            final_training_policy="warm_start",
+            skip_evaluation=True,
+            bucketed_batching=True,
+            num_buckets=6,
+        ).save(path)
+        best = BenchmarkResult(
+            config={
+                **TrainingConfig(batch_size=128, jit_compile=True).__dict__,
+                "final_training_policy": "retrain",
+            },
+            epochs_per_second=3.0,
+            final_loss=0.5,
+            stable=True,
+        )
+
+        write_best(best, path)
+
+        saved = TrainingConfig.load(path)
+        self.assertEqual((saved.batch_size, saved.jit_compile), (128, True))
+        self.assertEqual(saved.final_training_policy, "warm_start")
+        self.assertTrue(saved.skip_evaluation)
+        self.assertEqual((saved.bucketed_batching, saved.num_buckets), (True, 6))
+
+
+if __name__ == "__main__":
+    unittest.main()
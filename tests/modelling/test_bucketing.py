@@ -0,0 +1,132 @@
+"""Run make test_all in the terminal to run all the tests"""
+
+import unittest
+
+import numpy as np
+
+try:
+    from keras.preprocessing.sequence import pad_sequences
+
+    from src.modelling.bucketing import (
+        MIN_BUCKET_LENGTH,
+        BucketedSequence,
+        assign_buckets,
+        bucket_boundaries,
+        padding_report,
+    )
+except ImportError:  # TensorFlow is missing from this environment
+    BucketedSequence = None
+
+
+class ScaleByTwo:
+    def transform(self, values: np.ndarray) -> np.ndarray:
+        return values * 2
+
+
+def sequences_of(lengths: list[int]) -> list[np.ndarray]:
+    return [
+        np.full((length, 2), index + 1, dtype=np.float32)
+        for index, length in enumerate(lengths)
+    ]
+
+
+@unittest.skipIf(BucketedSequence is None, "needs tensorflow")
+class TestBucketBoundaries(unittest.TestCase):
+    def test_boundaries_at_equal_count_quantiles(self) -> None:
+        lengths = [40, 50, 60, 70, 80, 90, 100, 110]
+
+        boundaries = bucket_boundaries(lengths, num_buckets=4)
+
+        self.assertEqual(boundaries, [58, 75, 93, 110])
+        self.assertEqual(
+            np.bincount(assign_buckets(lengths, boundaries)).tolist(), [2, 2, 2, 2]
+        )
+
+    def test_short_sequences_share_the_minimum_bucket(self) -> None:
+        boundaries = bucket_boundaries([5, 10, 15, 20, 100], num_buckets=4)
+
+        self.assertEqual(boundaries[0], MIN_BUCKET_LENGTH)
+        self.assertTrue(all(b >= MIN_BUCKET_LENGTH for b in boundaries))
+        self.assertEqual(boundaries, sorted(set(boundaries)))
+
+    def test_last_boundary_covers_the_longest_sequence(self) -> None:
+        lengths = [33, 47, 108]
+
+        boundaries = bucket_boundaries(lengths, num_buckets=2)
+
+        self.assertEqual(boundaries[-1], 108)
+        self.assertTrue((assign_buckets(lengths, boundaries) < len(boundaries)).all())
+
+    def test_padding_report(self) -> None:
+        report = padding_report([40, 50, 100, 110], [50, 110], global_length=110)
+
+        self.assertEqual(report["real_timesteps"], 300)
+        self.assertEqual(report["global_padded_timesteps"], 440)
+        self.assertEqual(report["bucketed_padded_timesteps"], 320)
+        self.assertEqual(report["bucket_sizes"], [2, 2])
+        self.assertEqual(report["estimated_compute_saved"], round(1 - 320 / 440, 4))
+
+
+@unittest.skipIf(BucketedSequence is None, "needs tensorflow")
+class TestBucketedSequence(unittest.TestCase):
+    def setUp(self) -> None:
+        self.lengths = [40, 100, 45, 110, 50]
+        self.sequences = sequences_of(self.lengths)
+        self.labels = [0, 1, 0, 1, 0]
+        self.boundaries = [50, 110]
+
+    def test_batches_are_padded_to_their_bucket_and_scaled(self) -> None:
+        batches = BucketedSequence(
+            self.sequences, self.labels, ScaleByTwo(), self.boundaries, batch_size=2
+        )
+
+        shapes = [batches[index][0].shape for index in range(len(batches))]
+
+        self.assertEqual(shapes, [(2, 50, 2), (1, 50, 2), (2, 110, 2)])
+        inputs, labels = batches[0]
+        expected = (
+            pad_sequences(
+                [self.sequences[0], self.sequences[2]],
+                maxlen=50,
+                dtype="float32",
+                padding="post",
+            )
+            * 2
+        )
+        np.testing.assert_array_equal(inputs, expected)
+        np.testing.assert_array_equal(labels, [0, 0])
+
+    def test_unlabelled_batches_keep_an_order_for_predictions(self) -> None:
+        batches = BucketedSequence(
+            self.sequences, None, ScaleByTwo(), self.boundaries, batch_size=2
+        )
+
+        self.assertEqual(batches.order.tolist(), [0, 2, 4, 1, 3])
+        self.assertEqual(batches[0].shape, (2, 50, 2))
+
+    def test_shuffled_epochs_cover_every_sequence_once(self) -> None:
+        batches = BucketedSequence(
+            self.sequences,
+            self.labels,
+            ScaleByTwo(),
+            self.boundaries,
+            batch_size=2,
+            shuffle=True,
+        )
+        first_epoch = [indices.tolist() for _, indices in batches.batches]
+
+        batches.on_epoch_end()
+
+        for epoch in (first_epoch, [i.tolist() for _, i in batches.batches]):
+            self.assertEqual(sorted(sum(epoch, [])), [0, 1, 2, 3, 4])
+        for bucket, indices in batches.batches:
+            self.assertTrue(
+                all(
+                    assign_buckets([self.lengths[i]], self.boundaries)[0] == bucket
+                    for i in indices
+                )
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.modelling.cascade import (
+    CascadeDetector,
+    ImpactPrefilter,
+    evaluate_replay,
+    fall_events,
+    load_replay_set,
+)
+from src.modelling.feature_schema import FeatureSchema
+
+
+class WindowMaxPredictor:
+    """Stands in for FallPrediction: the probability of a window is the
+    largest value of its first feature."""
+
+    probability_threshold = 0.5
+    configurations = [(50, 49), (30, 69)]
+
+    def __init__(self):
+        self.windows_scored = 0
+
+    def crop_bounds(self, length, max_jerk_index):
+        return [
+            (max(0, max_jerk_index - left), min(length, max_jerk_index + right))
+            for left, right in self.configurations
+        ]
+
+    def predict_batch(self, sequences):
+        self.windows_scored += len(sequences)
+        return np.array([sequence[:, 0].max() for sequence in sequences])
+
+
+def recording(length: int, falls: list, bumps: list) -> tuple:
+    jerk = np.zeros(length)
+    fall_state = np.zeros(length, dtype=int)
+    features = np.zeros((length, 2), dtype=np.float32)
+    for index in falls:
+        jerk[index] = 90000
+        fall_state[index - 5 : index + 5] = 1
+        features[index, 0] = 0.9
+    for index in bumps:
+        jerk[index] = 80000
+    data = pd.DataFrame(
+        {"jerk": jerk, "g_force": np.full(length, 9.81), "fall_state": fall_state}
+    )
+    return data, features
+
+
+class TestImpactPrefilter(unittest.TestCase):
+    def test_one_trigger_per_impact_at_max_jerk(self):
+        data = pd.DataFrame(
+            {"jerk": [0, 80000, 95000, 76000, 0, 0, 0, 0, 0, 90000, 0], "g_force": 9.81}
+        )
+
+        triggers = ImpactPrefilter(refractory=5).trigger_indices(data)
+
+        np.testing.assert_array_equal(triggers, [2, 9])
+
+    def test_refractory_suppresses_close_triggers(self):
+        data = pd.DataFrame({"jerk": [80000, 0, 90000, 0, 0], "g_force": 9.81})
+
+        triggers = ImpactPrefilter(refractory=3).trigger_indices(data)
+
+        np.testing.assert_array_equal(triggers, [0])
+
+    def test_energy_criterion(self):
+        g_force = np.full(40, 9.81)
+        g_force[20:24] = 30.0
+        data = pd.DataFrame({"jerk": np.zeros(40), "g_force": g_force})
+
+        prefilter = ImpactPrefilter(
+            jerk_threshold=None, energy_threshold=10.0, energy_window=8
+        )
+
+        self.assertTrue(prefilter.candidate_mask(data)[20:28].all())
+        self.assertFalse(prefilter.candidate_mask(data)[:20].any())
+
+
+class TestCascadeDetector(unittest.TestCase):
+    def test_detects_falls_scoring_only_triggered_windows(self):
+        predictor = WindowMaxPredictor()
+        data, features = recording(1000, falls=[300], bumps=[700])
+
+        detections = CascadeDetector(predictor).detect(data, features)
+
+        self.assertEqual([detection["index"] for detection in detections], [300])
+        self.assertEqual(predictor.windows_scored, 4)
+
+    def test_replay_reports_recall_loss_and_compute_saved(self):
+        detector = CascadeDetector(WindowMaxPredictor())
+        replay = [
+            recording(1000, falls=[200, 600], bumps=[]),
+            # A fall without an impact spike is missed by the prefilter.
+            recording(800, falls=[400], bumps=[100]),
+        ]
+        replay[1][0].loc[400, "jerk"] = 0
+
+        report = evaluate_replay(detector, replay, dense_stride=10)
+
+        self.assertEqual(report["events"], 3)
+        self.assertEqual(report["dense_recall"], 1.0)
+        self.assertAlmostEqual(report["cascade_recall"], 2 / 3, places=4)
+        self.assertAlmostEqual(report["recall_loss"], 1 / 3, places=4)
+        self.assertEqual(report["cascade_windows"], 6)
+        self.assertEqual(report["dense_windows"], 360)
+        self.assertAlmostEqual(report["compute_saved"], 1 - 6 / 360, places=4)
+
+    def test_replay_set_drops_incomplete_rows_from_data_and_features(self):
+        predictor = WindowMaxPredictor()
+        predictor.feature_schema = FeatureSchema(
+            names=["ax", "jerk"], dtypes=["float32", "float32"]
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            pd.DataFrame(
+                {
+                    "ax": [0.1, np.inf, 0.3, 0.4],
+                    "jerk": [1.0, 2.0, np.nan, 4.0],
+                    "g_force": [9.8, 9.8, 9.8, 9.8],
+                    "fall_state": [0, 0, 1, 1],
+                }
+            ).to_csv(os.path.join(directory, "fall_1000.csv"), index=False)
+
+            [(data, features)] = load_replay_set(directory, predictor)
+
+        np.testing.assert_array_equal(data["jerk"], [1.0, 4.0])
+        np.testing.assert_array_equal(data["fall_state"], [0, 1])
+        np.testing.assert_allclose(features, [[0.1, 1.0], [0.4, 4.0]])
+
+    def test_replay_set_reads_g_force_only_when_a_criterion_needs_it(self):
+        predictor = WindowMaxPredictor()
+        predictor.feature_schema = FeatureSchema(names=["ax"], dtypes=["float32"])
+        with tempfile.TemporaryDirectory() as directory:
+            pd.DataFrame(
+                {"ax": [0.1, 0.2], "jerk": [1.0, 2.0], "fall_state": [0, 1]}
+            ).to_csv(os.path.join(directory, "fall_1000.csv"), index=False)
+
+            [(data, _)] = load_replay_set(directory, predictor)
+            with self.assertRaises(ValueError):
+                load_replay_set(
+                    directory, predictor, ImpactPrefilter(energy_threshold=10.0)
+                )
+
+        self.assertEqual(list(data.columns), ["jerk", "fall_state"])
+
+    def test_fall_events(self):
+        self.assertEqual(fall_events(np.array([0, 1, 1, 0, 1])), [(1, 3), (4, 5)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,222 @@
+"""Run make test_all in the terminal to run all the tests"""
+
+import json
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+try:
+    import tensorflow as tf
+
+    from src.modelling.checkpointing import (
+        HISTORY_FILE_NAME,
+        TrainingCheckpointer,
+        capture_rng_state,
+        restore_rng_state,
+    )
+    from src.modelling.model_training import ModelTraining
+    from src.modelling.training_config import TrainingConfig
+except ImportError:  # TensorFlow is missing from this environment
+    TrainingCheckpointer = None
+
+THREADING = "src.modelling.training_config.tf.config.threading"
+
+
+class Interrupted(Exception):
+    pass
+
+
+def interrupt_after(epochs: int) -> "tf.keras.callbacks.Callback":
+    """Stops fit with an exception, as a killed process would, after ``epochs``."""
+
+    def on_epoch_end(epoch, logs=None):
+        if epoch + 1 == epochs:
+            raise Interrupted()
+
+    return tf.keras.callbacks.LambdaCallback(on_epoch_end=on_epoch_end)
+
+
+def tiny_model() -> "tf.keras.Model":
+    model = tf.keras.Sequential(
+        [tf.keras.Input(shape=(4,)), tf.keras.layers.Dense(1, activation="sigmoid")]
+    )
+    model.compile(loss="binary_crossentropy", optimizer="adam")
+    return model
+
+
+def tiny_data() -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(0)
+    return rng.normal(size=(16, 4)).astype(np.float32), rng.integers(0, 2, 16)
+
+
+@unittest.skipIf(TrainingCheckpointer is None, "needs tensorflow")
+class TestRngState(unittest.TestCase):
+    def test_restored_state_repeats_every_generator(self) -> None:
+        state = capture_rng_state()
+        first = (
+            np.random.rand(3).tolist(),
+            random.random(),
+            tf.random.get_global_generator().normal([3]).numpy().tolist(),
+        )
+
+        restore_rng_state(json.loads(json.dumps(state)))
+
+        self.assertEqual(
+            (
+                np.random.rand(3).tolist(),
+                random.random(),
+                tf.random.get_global_generator().normal([3]).numpy().tolist(),
+            ),
+            first,
+        )
+
+
+@unittest.skipIf(TrainingCheckpointer is None, "needs tensorflow")
+class TestTrainingCheckpointer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.mkdtemp()
+        self.directory = os.path.join(self.temp_dir, "validation")
+        self.x, self.y = tiny_data()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_dir)
+
+    def _interrupted_fit(self, epochs: int, stop_after: int, **kwargs):
+        model = tiny_model()
+        checkpointer = TrainingCheckpointer(self.directory, **kwargs)
+        callbacks = [checkpointer, interrupt_after(stop_after)]
+        if checkpointer.early_stopping is not None:
+            callbacks.insert(0, checkpointer.early_stopping)
+        with self.assertRaises(Interrupted):
+            model.fit(self.x, self.y, epochs=epochs, callbacks=callbacks, verbose=0)
+        checkpointer.checkpoint.sync()
+        return model
+
+    def test_keeps_the_latest_checkpoints_and_their_state(self) -> None:
+        self._interrupted_fit(epochs=10, stop_after=5, max_to_keep=2)
+
+        files = os.listdir(self.directory)
+
+        self.assertEqual(
+            sorted(name for name in files if name.endswith(".state.json")),
+            ["ckpt-4.state.json", "ckpt-5.state.json"],
+        )
+        self.assertNotIn(HISTORY_FILE_NAME, files)
+
+    def test_resume_restores_weights_and_merges_history(self) -> None:
+        interrupted = self._interrupted_fit(epochs=5, stop_after=3)
+
+        model = tiny_model()
+        checkpointer = TrainingCheckpointer(self.directory)
+        initial_epoch = checkpointer.restore(model)
+        for restored, saved in zip(model.get_weights(), interrupted.get_weights()):
+            np.testing.assert_array_equal(restored, saved)
+        model.fit(
+            self.x,
+            self.y,
+            epochs=5,
+            initial_epoch=initial_epoch,
+            callbacks=[checkpointer],
+            verbose=0,
+        )
+
+        self.assertEqual(initial_epoch, 3)
+        self.assertEqual(len(checkpointer.history["loss"]), 5)
+        self.assertEqual(len(checkpointer.completed_history()["loss"]), 5)
+
+    def test_resume_restores_early_stopping_state(self) -> None:
+        monitor = tf.keras.callbacks.EarlyStopping(monitor="loss", patience=50)
+        self._interrupted_fit(epochs=10, stop_after=4, early_stopping=monitor)
+        saved = {"wait": monitor.wait, "best": monitor.best}
+
+        early_stopping = tf.keras.callbacks.EarlyStopping(monitor="loss", patience=50)
+        checkpointer = TrainingCheckpointer(
+            self.directory, early_stopping=early_stopping
+        )
+        checkpointer.restore(tiny_model())
+        early_stopping.on_train_begin()
+        checkpointer.on_train_begin()
+
+        self.assertEqual(early_stopping.wait, saved["wait"])
+        self.assertAlmostEqual(early_stopping.best, saved["best"], places=6)
+
+
+@unittest.skipIf(TrainingCheckpointer is None, "needs tensorflow")
+class TestCheckpointedFit(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.mkdtemp()
+        self.working_directory = os.getcwd()
+        os.chdir(self.temp_dir)
+        self.x, self.y = tiny_data()
+
+    def tearDown(self) -> None:
+        os.chdir(self.working_directory)
+        shutil.rmtree(self.temp_dir)
+
+    def _training(self, **kwargs) -> "ModelTraining":
+        with mock.patch(f"{THREADING}.set_intra_op_parallelism_threads"), mock.patch(
+            f"{THREADING}.set_inter_op_parallelism_threads"
+        ):
+            return ModelTraining(
+                training_config=TrainingConfig(), run_id="dag-run-1", **kwargs
+            )
+
+    def _fit(self, training, model, stop_after: int = None):
+        def fit(callbacks, initial_epoch):
+            if stop_after is not None:
+                callbacks = callbacks + [interrupt_after(stop_after)]
+            return model.fit(
+                self.x,
+                self.y,
+                epochs=6,
+                initial_epoch=initial_epoch,
+                callbacks=callbacks,
+                verbose=0,
+            )
+
+        return training._checkpointed_fit("final", model, fit)
+
+    def _interrupt(self, stop_after: int) -> None:
+        with self.assertRaises(Interrupted):
+            self._fit(self._training(), tiny_model(), stop_after=stop_after)
+
+    def test_retry_with_the_same_run_id_resumes(self) -> None:
+        self._interrupt(stop_after=4)
+        training = self._training()
+
+        history = self._fit(training, tiny_model())
+
+        self.assertTrue(training.resumed)
+        self.assertEqual(len(history.history["loss"]), 6)
+
+    def test_completed_phase_is_not_trained_again(self) -> None:
+        self._fit(self._training(), tiny_model())
+        model = tiny_model()
+        model.fit = mock.Mock()
+
+        history = self._fit(self._training(), model)
+
+        model.fit.assert_not_called()
+        self.assertEqual(len(history.history["loss"]), 6)
+
+    def test_restart_discards_the_checkpoints(self) -> None:
+        self._interrupt(stop_after=4)
+        training = self._training(restart=True)
+
+        history = self._fit(training, tiny_model())
+
+        self.assertFalse(training.resumed)
+        self.assertEqual(len(history.history["loss"]), 6)
+        with open(
+            os.path.join("models/checkpoints/dag-run-1/final", HISTORY_FILE_NAME)
+        ) as file:
+            self.assertEqual(len(json.load(file)["loss"]), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
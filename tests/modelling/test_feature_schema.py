@@ -0,0 +1,81 @@
+"""Run make test_all in the terminal to run all the tests"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.modelling.feature_schema import FeatureSchema, schema_path_next_to
+
+
+class TestFeatureSchema(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.mkdtemp()
+        self.schema = FeatureSchema.from_header(
+            ["timestamp", "ax", "ay", "jerk", "fall_state"],
+            {"ax": "float64", "ay": "float64", "jerk": "float64"},
+        )
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_dir)
+
+    def _write_csv(self, name: str, content: str) -> str:
+        path = os.path.join(self.temp_dir, name)
+        with open(path, "w") as file:
+            file.write(content)
+        return path
+
+    def test_schema_excludes_non_feature_columns(self) -> None:
+        self.assertEqual(self.schema.names, ["ax", "ay", "jerk"])
+
+    def test_reordered_columns_load_in_schema_order(self) -> None:
+        # Arrange
+        path = self._write_csv(
+            "sequence.csv", "jerk,fall_state,ay,ax\n3,0,2,1\n6,1,5,4\n"
+        )
+
+        # Act
+        data = self.schema.read_csv(path)
+
+        # Assert
+        self.assertEqual(data.dtype, np.float32)
+        np.testing.assert_array_equal(data, [[1, 2, 3], [4, 5, 6]])
+
+    def test_incomplete_rows_are_dropped(self) -> None:
+        path = self._write_csv("sequence.csv", "ax,ay,jerk\n1,,3\n4,5,6\n")
+
+        np.testing.assert_array_equal(self.schema.read_csv(path), [[4, 5, 6]])
+
+    def test_extra_columns_come_from_the_same_parse(self) -> None:
+        path = self._write_csv(
+            "sequence.csv", "fall_state,jerk,ay,ax\n0,3,2,1\n1,,5,4\n"
+        )
+
+        features, columns = self.schema.read_columns(path, ("jerk", "fall_state"))
+
+        self.assertEqual(features.dtype, np.float32)
+        np.testing.assert_array_equal(features[0], [1, 2, 3])
+        self.assertEqual(list(columns), ["jerk", "fall_state"])
+        self.assertEqual(columns["fall_state"].dtype, np.float32)
+        np.testing.assert_array_equal(columns["fall_state"], [0, 1])
+        self.assertTrue(np.isnan(columns["jerk"][1]))
+
+    def test_single_column_reads_as_a_column(self) -> None:
+        schema = FeatureSchema(names=["ax"], dtypes=["float64"])
+        path = self._write_csv("sequence.csv", "ax,ay\n1,2\n4,5\n6,7\n")
+
+        np.testing.assert_array_equal(schema.read_csv(path), [[1], [4], [6]])
+
+    def test_missing_column_raises(self) -> None:
+        path = self._write_csv("sequence.csv", "ax,jerk\n1,3\n")
+
+        with self.assertRaises(ValueError):
+            self.schema.read_csv(path)
+
+    def test_schema_round_trip_next_to_scaler(self) -> None:
+        scaler_path = os.path.join(self.temp_dir, "scaler.pkl")
+        self.schema.save(schema_path_next_to(scaler_path))
+
+        self.assertEqual(FeatureSchema.load_next_to(scaler_path), self.schema)
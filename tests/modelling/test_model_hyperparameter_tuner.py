@@ -0,0 +1,329 @@
+"""Run make test_all in the terminal to run all the tests"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+try:
+    import tensorflow as tf
+
+    from src.modelling import model_hyperparameter_tuner
+    from src.modelling.model_hyperparameter_tuner import ModelHyperparameterTuner
+except ImportError:  # TensorFlow and keras-tuner are missing from this environment
+    ModelHyperparameterTuner = None
+
+from src.processing.feature_selection import FeatureSetSpec
+
+
+def tuning_arrays() -> tuple:
+    rng = np.random.default_rng(0)
+    return (
+        rng.normal(size=(6, 4, 2)),
+        rng.normal(size=(2, 4, 2)),
+        rng.normal(size=(2, 4, 2)),
+        [0, 1, 0, 1, 0, 1],
+        [0, 1],
+        [1, 0],
+    )
+
+
+@unittest.skipIf(ModelHyperparameterTuner is None, "needs tensorflow and keras-tuner")
+class TestTuningDataCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.mkdtemp()
+        self.tuner = ModelHyperparameterTuner()
+        self.tuner.data_directory = os.path.join(self.temp_dir, "seq")
+        self.tuner.data_cache_directory = os.path.join(self.temp_dir, "cache")
+        self.tuner.model_utilities.feature_set = None
+        os.makedirs(self.tuner.data_directory)
+        for name in ["fall_1000.csv", "non_fall_1000.csv"]:
+            self._write_sequence(name, rows=5)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_dir)
+
+    def _write_sequence(self, name: str, rows: int) -> None:
+        pd.DataFrame(
+            {
+                "ax": np.arange(rows, dtype=float),
+                "jerk": np.ones(rows),
+                "fall_state": np.zeros(rows, dtype=int),
+            }
+        ).to_csv(os.path.join(self.tuner.data_directory, name), index=False)
+
+    def _load(self, tuner=None) -> tuple[tuple, mock.Mock]:
+        tuner = tuner or self.tuner
+        with mock.patch.object(
+            tuner, "_load_data", side_effect=tuning_arrays
+        ) as load_data:
+            return tuner._load_cached_data(), load_data
+
+    def test_cache_is_built_once_and_memory_mapped(self) -> None:
+        self._load()
+
+        arrays, load_data = self._load()
+
+        load_data.assert_not_called()
+        self.assertIsInstance(arrays[0], np.memmap)
+        self.assertEqual(arrays[0].dtype, np.float32)
+        self.assertEqual(arrays[3].dtype, np.int8)
+        np.testing.assert_allclose(arrays[0], tuning_arrays()[0].astype(np.float32))
+        self.assertEqual(self.tuner.input_shape, (4, 2))
+
+    def test_changed_file_size_rebuilds_the_cache(self) -> None:
+        self._load()
+        self._write_sequence("fall_1000.csv", rows=6)
+
+        _, load_data = self._load()
+
+        load_data.assert_called_once()
+
+    def test_changed_feature_set_rebuilds_the_cache(self) -> None:
+        self._load()
+        tuner = ModelHyperparameterTuner()
+        tuner.data_directory = self.tuner.data_directory
+        tuner.data_cache_directory = self.tuner.data_cache_directory
+        tuner.model_utilities.feature_set = FeatureSetSpec(features=["jerk"])
+
+        _, load_data = self._load(tuner)
+
+        load_data.assert_called_once()
+
+
+class InlineProcess:
+    """Runs the target in the calling process when started."""
+
+    def __init__(self, target, args):
+        self.target = target
+        self.args = args
+        self.name = args[0]
+        self.exitcode = None
+
+    def start(self) -> None:
+        self.target(*self.args)
+        self.exitcode = 0
+
+    def join(self) -> None:
+        pass
+
+
+@unittest.skipIf(ModelHyperparameterTuner is None, "needs tensorflow and keras-tuner")
+class TestParallelTuningPlumbing(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.mkdtemp()
+        self.working_directory = os.getcwd()
+        os.chdir(self.temp_dir)
+        os.makedirs("hyperparameters")
+        with open("hyperparameters/best_params.json", "w") as file:
+            json.dump({"dense_units": 64}, file)
+
+    def tearDown(self) -> None:
+        os.chdir(self.working_directory)
+        shutil.rmtree(self.temp_dir)
+
+    def test_search_settings_reach_every_process(self) -> None:
+        # Arrange
+        tuner = ModelHyperparameterTuner()
+        tuner.search_mode = "hyperband"
+        tuner.hyperband_max_epochs = 27
+        tuner.hyperband_factor = 4
+        tuner.max_latency_ms = 5.0
+        tuner.max_params = 10_000
+        spawned = []
+
+        def orchestrate_tuning(process_tuner):
+            spawned.append(
+                (
+                    os.environ["KERASTUNER_TUNER_ID"],
+                    process_tuner.search_mode,
+                    process_tuner.hyperband_max_epochs,
+                    process_tuner.hyperband_factor,
+                    process_tuner.max_latency_ms,
+                    process_tuner.max_params,
+                )
+            )
+
+        context = mock.Mock(Process=InlineProcess)
+        threading = "src.modelling.model_hyperparameter_tuner.tf.config.threading"
+
+        # Act
+        with mock.patch.object(tuner, "_load_cached_data"), mock.patch.object(
+            tuner, "_rank_uncontended"
+        ), mock.patch.object(
+            model_hyperparameter_tuner.multiprocessing,
+            "get_context",
+            return_value=context,
+        ), mock.patch.object(
+            ModelHyperparameterTuner, "orchestrate_tuning", orchestrate_tuning
+        ), mock.patch(
+            f"{threading}.set_intra_op_parallelism_threads"
+        ), mock.patch(
+            f"{threading}.set_inter_op_parallelism_threads"
+        ), mock.patch.dict(
+            os.environ
+        ):
+            best_params = tuner.orchestrate_parallel_tuning(workers=2)
+
+        # Assert
+        self.assertEqual(best_params, {"dense_units": 64})
+        self.assertEqual(
+            spawned,
+            [
+                (tuner_id, "hyperband", 27, 4, 5.0, 10_000)
+                for tuner_id in ["chief", "tuner0", "tuner1"]
+            ],
+        )
+
+
+class FakeMetrics:
+    def __init__(self, values: dict):
+        self.values = values
+
+    def exists(self, name: str) -> bool:
+        return name in self.values
+
+    def get_best_value(self, name: str) -> float:
+        return max(self.values[name])
+
+    def get_last_value(self, name: str) -> float:
+        return self.values[name][-1]
+
+
+def fake_trial(trial_id: str, accuracy: float, latency: float, params: int):
+    return SimpleNamespace(
+        trial_id=trial_id,
+        metrics=FakeMetrics(
+            {
+                "val_accuracy": [accuracy - 0.1, accuracy],
+                "p95_latency_ms": [latency],
+                "param_count": [float(params)],
+            }
+        ),
+        hyperparameters=SimpleNamespace(values={"trial": trial_id}),
+    )
+
+
+@unittest.skipIf(ModelHyperparameterTuner is None, "needs tensorflow and keras-tuner")
+class TestConstrainedSearch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.mkdtemp()
+        self.working_directory = os.getcwd()
+        os.chdir(self.temp_dir)
+        self.tuner = ModelHyperparameterTuner()
+
+    def tearDown(self) -> None:
+        os.chdir(self.working_directory)
+        shutil.rmtree(self.temp_dir)
+
+    def _fit(self, latency_ms: float, param_count: int) -> dict:
+        history = SimpleNamespace(history={"val_accuracy": [0.7, 0.8]})
+        model = mock.Mock(fit=mock.Mock(return_value=history))
+        with mock.patch.object(
+            self.tuner,
+            "_measure_inference_cost",
+            return_value=(latency_ms, param_count),
+        ):
+            return self.tuner.fit(None, model, np.zeros((3, 4, 2))).history
+
+    def test_inference_cost_of_a_tiny_model(self) -> None:
+        model = tf.keras.Sequential(
+            [
+                tf.keras.Input(shape=(4, 2)),
+                tf.keras.layers.Flatten(),
+                tf.keras.layers.Dense(1),
+            ]
+        )
+        self.tuner.latency_runs = 5
+
+        latency_ms, param_count = self.tuner._measure_inference_cost(
+            model, np.zeros((1, 4, 2), dtype=np.float32)
+        )
+
+        self.assertEqual(param_count, 9)
+        self.assertGreater(latency_ms, 0)
+
+    def test_fit_records_cost_per_epoch(self) -> None:
+        history = self._fit(latency_ms=2.5, param_count=1000)
+
+        self.assertEqual(history["p95_latency_ms"], [2.5, 2.5])
+        self.assertEqual(history["param_count"], [1000.0, 1000.0])
+
+    def test_feasible_trial_keeps_its_score(self) -> None:
+        self.tuner.max_latency_ms = 5.0
+        self.tuner.max_params = 2000
+
+        history = self._fit(latency_ms=2.5, param_count=1000)
+
+        self.assertEqual(history["constrained_score"], [0.7, 0.8])
+
+    def test_infeasible_trial_ranks_below_every_feasible_one(self) -> None:
+        self.tuner.max_latency_ms = 5.0
+
+        history = self._fit(latency_ms=7.5, param_count=1000)
+
+        np.testing.assert_allclose(history["constrained_score"], [-0.3, -0.2])
+
+    def test_objective_follows_the_constraints(self) -> None:
+        self.assertEqual(self.tuner._search_objective().name, "val_accuracy")
+        self.tuner.max_params = 2000
+        self.assertEqual(self.tuner._search_objective().name, "constrained_score")
+
+    def test_pareto_front_drops_dominated_trials(self) -> None:
+        trials = [
+            fake_trial("fast", accuracy=0.90, latency=1.0, params=1000),
+            fake_trial("accurate", accuracy=0.95, latency=4.0, params=5000),
+            fake_trial("dominated", accuracy=0.89, latency=2.0, params=2000),
+        ]
+        tuner = SimpleNamespace(
+            oracle=SimpleNamespace(trials={trial.trial_id: trial for trial in trials})
+        )
+
+        front = self.tuner._save_pareto_front(tuner)
+
+        self.assertEqual([entry["trial_id"] for entry in front], ["accurate", "fast"])
+        with open("hyperparameters/pareto_front.json") as file:
+            saved = json.load(file)
+        self.assertEqual(saved["front"], front)
+        self.assertEqual(front[1]["val_accuracy"], 0.90)
+        self.assertEqual(front[1]["param_count"], 1000)
+
+    def test_parallel_search_is_ranked_on_uncontended_latency(self) -> None:
+        # During the search "small" looked slow because workers competed
+        # for the CPUs; measured alone it meets the constraint.
+        trials = [
+            fake_trial("small", accuracy=0.93, latency=9.0, params=1000),
+            fake_trial("large", accuracy=0.90, latency=4.0, params=5000),
+        ]
+        search = SimpleNamespace(
+            oracle=SimpleNamespace(trials={trial.trial_id: trial for trial in trials}),
+            load_model=lambda trial: trial.trial_id,
+        )
+        uncontended = {"small": (3.0, 1000), "large": (4.0, 5000)}
+        self.tuner.max_latency_ms = 5.0
+
+        with mock.patch.object(
+            self.tuner, "_model_tuner", return_value=search
+        ), mock.patch.object(
+            self.tuner,
+            "_measure_inference_cost",
+            side_effect=lambda model, window: uncontended[model],
+        ):
+            self.tuner._rank_uncontended(np.zeros((1, 4, 2), dtype=np.float32))
+
+        with open("hyperparameters/best_params.json") as file:
+            self.assertEqual(json.load(file), {"trial": "small"})
+        with open("hyperparameters/pareto_front.json") as file:
+            front = json.load(file)["front"]
+        self.assertEqual([entry["trial_id"] for entry in front], ["small"])
+        self.assertEqual(front[0]["p95_latency_ms"], 3.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""Run make test_all in the terminal to run all the tests"""
+
+import unittest
+from unittest import mock
+
+try:
+    import tensorflow as tf
+
+    from src.modelling.model_training import ModelTraining
+    from src.modelling.training_config import TrainingConfig
+except ImportError:  # TensorFlow is missing from this environment
+    ModelTraining = None
+
+THREADING = "src.modelling.training_config.tf.config.threading"
+
+
+def history_of(val_loss: list) -> "tf.keras.callbacks.History":
+    history = tf.keras.callbacks.History()
+    history.history = {"loss": [1.0] * len(val_loss), "val_loss": val_loss}
+    return history
+
+
+@unittest.skipIf(ModelTraining is None, "needs tensorflow")
+class TestFinalTrainingPolicy(unittest.TestCase):
+    def _train(self, policy: str, validated_model=None, history=None) -> tuple:
+        config = TrainingConfig(
+            final_training_policy=policy, final_epochs=32, fine_tune_epochs=5
+        )
+        with mock.patch(f"{THREADING}.set_intra_op_parallelism_threads"), mock.patch(
+            f"{THREADING}.set_inter_op_parallelism_threads"
+        ):
+            training = ModelTraining(training_config=config, run_id="test")
+        final_model = mock.Mock()
+        with mock.patch.object(
+            training, "_create_model", return_value=final_model
+        ), mock.patch.object(training, "_checkpointed_fit"):
+            result = training._train_final_model(
+                validated_model, history, [], [], (64, 3)
+            )
+        return result, final_model
+
+    def test_retrain_uses_the_final_epochs(self) -> None:
+        (_, epochs, policy), _ = self._train("retrain", mock.Mock(), history_of([1]))
+
+        self.assertEqual((epochs, policy), (32, "retrain"))
+
+    def test_warm_start_continues_from_the_validated_weights(self) -> None:
+        validated_model = mock.Mock()
+        validated_model.get_weights.return_value = ["weights"]
+
+        (_, epochs, policy), final_model = self._train(
+            "warm_start", validated_model, history_of([1])
+        )
+
+        final_model.set_weights.assert_called_once_with(["weights"])
+        self.assertEqual((epochs, policy), (5, "warm_start"))
+
+    def test_early_stop_epochs_picks_the_lowest_validation_loss(self) -> None:
+        (_, epochs, policy), _ = self._train(
+            "early_stop_epochs", mock.Mock(), history_of([0.9, 0.4, 0.6, 0.5])
+        )
+
+        self.assertEqual((epochs, policy), (2, "early_stop_epochs"))
+
+    def test_skipped_evaluation_falls_back_to_retrain(self) -> None:
+        for requested in ("warm_start", "early_stop_epochs"):
+            (_, epochs, policy), final_model = self._train(requested)
+
+            final_model.set_weights.assert_not_called()
+            self.assertEqual((epochs, policy), (32, "retrain"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""Run make test_all in the terminal to run all the tests"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+try:
+    from src.modelling.timed_tuners import (
+        TrialTimingMixin,
+        load_trial_times,
+        summarize_trial_times,
+    )
+except ImportError:  # keras-tuner is missing from this environment
+    TrialTimingMixin = None
+
+
+class FakeTuner:
+    def __init__(self, project_dir: str, epochs: list):
+        self.project_dir = project_dir
+        self.tuner_id = "tuner1"
+        self.epochs = epochs
+
+    def run_trial(self, trial, *args, **kwargs):
+        # Hyperband returns one history per execution.
+        return [
+            SimpleNamespace(history={"loss": [0.5] * epochs, "val_accuracy": []})
+            for epochs in self.epochs
+        ]
+
+
+@unittest.skipIf(TrialTimingMixin is None, "needs keras-tuner")
+class TestTrialTimingMixin(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_dir)
+
+    def _run(self, trial_id: str, epochs: list) -> None:
+        tuner = type("TimedFakeTuner", (TrialTimingMixin, FakeTuner), {})(
+            self.temp_dir, epochs
+        )
+        trial = SimpleNamespace(
+            trial_id=trial_id,
+            hyperparameters=SimpleNamespace(values={"dense_units": 64}),
+        )
+        tuner.run_trial(trial)
+
+    def test_each_trial_writes_its_own_record(self) -> None:
+        self._run("00", [3, 2])
+        self._run("01", [4])
+
+        records = load_trial_times(self.temp_dir)
+
+        self.assertEqual([record["trial_id"] for record in records], ["00", "01"])
+        self.assertEqual(records[0]["epochs_trained"], 5)
+        self.assertEqual(records[0]["tuner_id"], "tuner1")
+        self.assertEqual(records[0]["hyperparameters"], {"dense_units": 64})
+        self.assertGreaterEqual(records[0]["wall_time_seconds"], 0)
+        with open(os.path.join(self.temp_dir, "trial_times", "01.json")) as file:
+            self.assertEqual(json.load(file)["epochs_trained"], 4)
+
+    def test_summary_totals_trials(self) -> None:
+        self._run("00", [3])
+        self._run("01", [4])
+
+        summary = summarize_trial_times(self.temp_dir)
+
+        self.assertEqual(summary["trials"], 2)
+        self.assertEqual(summary["total_epochs_trained"], 7)
+        self.assertEqual(
+            set(summary),
+            {
+                "trials",
+                "total_wall_time_seconds",
+                "mean_wall_time_seconds",
+                "max_wall_time_seconds",
+                "total_epochs_trained",
+            },
+        )
+
+    def test_summary_of_an_empty_search(self) -> None:
+        self.assertEqual(summarize_trial_times(self.temp_dir)["trials"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+"""Run make test_all in the terminal to run all the tests"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+try:
+    import tensorflow as tf
+
+    from src.modelling.model_training import ModelTraining
+    from src.modelling.training_config import TrainingConfig
+except ImportError:  # TensorFlow is missing from this environment
+    TrainingConfig = None
+
+SMALL_HYPERPARAMETERS = {
+    "conv1_filters": 4,
+    "conv1_kernel": 2,
+    "pool1_size": 2,
+    "conv2_filters": 4,
+    "conv2_kernel": 2,
+    "pool2_size": 2,
+    "conv3_filters": 4,
+    "conv3_kernel": 2,
+    "pool3_size": 2,
+    "lstm1_units": 4,
+    "lstm2_units": 4,
+    "lstm3_units": 4,
+    "dense_units": 4,
+    "learning_rate": 1e-3,
+}
+THREADING = "src.modelling.training_config.tf.config.threading"
+
+
+@unittest.skipIf(TrainingConfig is None, "needs tensorflow")
+class TestTrainingConfig(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "training_config.json")
+
+    def tearDown(self) -> None:
+        tf.keras.mixed_precision.set_global_policy("float32")
+        shutil.rmtree(self.temp_dir)
+
+    def test_missing_file_loads_defaults(self) -> None:
+        config = TrainingConfig.load(self.path)
+
+        self.assertEqual(config, TrainingConfig())
+        self.assertEqual(config.batch_size, 32)
+        self.assertEqual(config.mixed_precision_policy, "float32")
+        self.assertEqual(config.final_training_policy, "retrain")
+        self.assertFalse(config.skip_evaluation)
+        self.assertFalse(config.bucketed_batching)
+
+    def test_partial_file_overrides_only_its_keys(self) -> None:
+        with open(self.path, "w") as file:
+            json.dump({"batch_size": 128, "jit_compile": True}, file)
+
+        config = TrainingConfig.load(self.path)
+
+        self.assertEqual(config.batch_size, 128)
+        self.assertTrue(config.jit_compile)
+        self.assertEqual(config.steps_per_execution, 1)
+
+    def test_save_and_load_round_trip(self) -> None:
+        config = TrainingConfig(
+            mixed_precision_policy="mixed_bfloat16",
+            final_training_policy="warm_start",
+            num_buckets=6,
+        )
+        config.save(self.path)
+
+        self.assertEqual(TrainingConfig.load(self.path), config)
+
+    def test_unknown_policies_are_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            TrainingConfig(mixed_precision_policy="float16")
+        with self.assertRaises(ValueError):
+            TrainingConfig(final_training_policy="fine_tune")
+
+    def test_apply_runtime_settings(self) -> None:
+        config = TrainingConfig(
+            mixed_precision_policy="mixed_float16",
+            intra_op_threads=4,
+            inter_op_threads=2,
+        )
+
+        with mock.patch(f"{THREADING}.set_intra_op_parallelism_threads") as intra:
+            with mock.patch(f"{THREADING}.set_inter_op_parallelism_threads") as inter:
+                config.apply_runtime_settings()
+
+        intra.assert_called_once_with(4)
+        inter.assert_called_once_with(2)
+        self.assertEqual(tf.keras.mixed_precision.global_policy().name, "mixed_float16")
+
+    def test_default_thread_pools_are_left_to_tensorflow(self) -> None:
+        with mock.patch(f"{THREADING}.set_intra_op_parallelism_threads") as intra:
+            with mock.patch(f"{THREADING}.set_inter_op_parallelism_threads") as inter:
+                TrainingConfig().apply_runtime_settings()
+
+        intra.assert_not_called()
+        inter.assert_not_called()
+
+    def test_initialized_runtime_keeps_its_thread_pools(self) -> None:
+        tf.constant(1.0) + 1.0
+        config = TrainingConfig(intra_op_threads=3, inter_op_threads=2)
+
+        with mock.patch(
+            f"{THREADING}.set_intra_op_parallelism_threads",
+            side_effect=RuntimeError("cannot be modified after initialization"),
+        ):
+            config.apply_runtime_settings()
+            config.apply_runtime_settings()
+
+        self.assertEqual(tf.keras.mixed_precision.global_policy().name, "float32")
+
+    def test_output_layer_stays_float32_under_mixed_precision(self) -> None:
+        config = TrainingConfig(mixed_precision_policy="mixed_float16")
+        with mock.patch(f"{THREADING}.set_intra_op_parallelism_threads"), mock.patch(
+            f"{THREADING}.set_inter_op_parallelism_threads"
+        ):
+            training = ModelTraining(training_config=config, run_id="test")
+        training.model_utilities.get_model_hyperparameters = mock.Mock(
+            return_value=SMALL_HYPERPARAMETERS
+        )
+
+        model = training._create_model((64, 3))
+
+        self.assertEqual(model.layers[1].compute_dtype, "float16")
+        self.assertEqual(model.layers[-1].compute_dtype, "float32")
+        self.assertEqual(model.output.dtype, tf.float32)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,7 @@ import unittest
 from unittest.mock import patch, mock_open
 import pandas as pd
 import io
+from src.processing.dtypes import apply_schema
 from src.processing.source_all_processor import DataProcessor
 from pathlib import Path
 import shutil
@@ -36,7 +37,7 @@ class TestDataProcessor(unittest.TestCase):
     def test_load_data(self, mock_file, mock_exists):
         # Arrange
         filename = "test.csv"
-        expected_data = pd.read_csv(io.StringIO(mock_data))
+        expected_data = apply_schema(pd.read_csv(io.StringIO(mock_data)))
         # Act
         loaded_data = self.processor.load_data(filename)
         # Assert
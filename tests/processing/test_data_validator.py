@@ -1,4 +1,6 @@
 import unittest
+from unittest import mock
+import numpy as np
 import pandas
 from src.processing.data_validator import DataValidator
 
@@ -51,5 +53,81 @@ class TestDataValidator(unittest.TestCase):
         self.assertNotIn("timestamp_local", self.validator.data.columns)
 
 
+class TestValidationReport(unittest.TestCase):
+    def setUp(self):
+        self.data = pandas.DataFrame(
+            {
+                "timestamp": [1000, 1075, 1150, 1150, 1100, 1600, 1675],
+                "timestamp_local": [f"10:00:0{i}" for i in (0, 1, 2, 2, 4, 5, 6)],
+                "ax": [0.1, 0.2, 0.3, 0.3, 0.5, np.nan, 0.7],
+                "ay": [9.8] * 7,
+                "az": [0.0] * 7,
+                "fall_state": [0] * 7,
+            }
+        )
+        self.required_columns = list(self.data.columns)
+        self.validator = DataValidator()
+
+    def test_report_collects_every_problem(self):
+        _, report = self.validator.inspect(self.data, self.required_columns)
+
+        self.assertFalse(report.is_valid)
+        self.assertEqual(report.null_counts, {"ax": 1})
+        self.assertEqual(report.duplicate_rows, 1)
+        self.assertEqual(report.non_monotonic_timestamps, 2)
+        self.assertEqual(report.sample_rate_gaps, 1)
+        self.assertEqual(report.median_interval, 75.0)
+
+    def test_rows_differing_only_in_a_string_column_are_kept(self):
+        data = self.data.copy()
+        data.loc[3, "timestamp_local"] = "10:00:03"
+
+        _, report = self.validator.inspect(data, self.required_columns)
+
+        self.assertEqual(report.duplicate_rows, 0)
+
+    def test_hash_collisions_are_confirmed_exactly(self):
+        with mock.patch(
+            "src.processing.data_validator.pd.util.hash_array",
+            side_effect=lambda values: np.zeros(len(values), dtype=np.uint64),
+        ):
+            repaired, report = self.validator.inspect(
+                self.data, self.required_columns, repair=True
+            )
+
+        self.assertEqual(report.duplicate_rows, 1)
+        self.assertEqual(report.dropped_rows["duplicate"], 1)
+        self.assertEqual(list(repaired["timestamp"]), [1000, 1075, 1150, 1675])
+
+    def test_missing_columns_are_reported(self):
+        _, report = self.validator.inspect(
+            self.data.drop(columns=["az"]), self.required_columns
+        )
+
+        self.assertEqual(report.missing_columns, ["az"])
+
+    def test_repair_drops_bad_rows(self):
+        repaired, report = self.validator.inspect(
+            self.data, self.required_columns, repair=True
+        )
+
+        self.assertEqual(list(repaired["timestamp"]), [1000, 1075, 1150, 1675])
+        self.assertEqual(
+            report.dropped_rows, {"null": 1, "duplicate": 1, "out_of_order": 1}
+        )
+
+    def test_validate_raises_without_repair(self):
+        with self.assertRaises(ValueError):
+            self.validator.validate(self.data.copy(), self.required_columns)
+
+    def test_validate_with_repair_prepares_timestamp(self):
+        validated = self.validator.validate(
+            self.data.copy(), self.required_columns, repair=True
+        )
+
+        self.assertNotIn("timestamp_local", validated.columns)
+        self.assertEqual(list(validated["timestamp"])[0], "10:00:00")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.processing.dtypes import apply_schema, read_csv_with_schema
+
+
+class TestDtypeSchema(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "processed.csv")
+        pd.DataFrame(
+            {
+                "timestamp": [1707213642430037000, 1707213642504867000],
+                "ax": [-0.562333, -0.737016],
+                "jerk": [0.0, 12.5],
+                "fall_state": [0, 1],
+                "impact_detection": [0, 0],
+            }
+        ).to_csv(self.path, index=False)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_reads_with_schema_dtypes(self):
+        data = read_csv_with_schema(self.path)
+
+        self.assertEqual(data["timestamp"].dtype, np.int64)
+        self.assertEqual(data["ax"].dtype, np.float32)
+        self.assertEqual(data["jerk"].dtype, np.float32)
+        self.assertEqual(data["fall_state"].dtype, np.int8)
+        self.assertEqual(data["impact_detection"].dtype, np.int8)
+
+    def test_reads_only_requested_columns(self):
+        data = read_csv_with_schema(self.path, usecols=["ax", "fall_state"])
+
+        self.assertEqual(list(data.columns), ["ax", "fall_state"])
+
+    def test_falls_back_when_labels_are_missing(self):
+        with open(self.path, "a") as file:
+            file.write("1707213642579836000,0.1,0.2,,0\n")
+
+        data = read_csv_with_schema(self.path)
+
+        self.assertEqual(data["ax"].dtype, np.float32)
+        self.assertTrue(data["fall_state"].isna().iloc[-1])
+
+    def test_apply_schema_leaves_text_columns(self):
+        data = pd.DataFrame(
+            {
+                "timestamp_local": ["2024-02-06 10:00:42"],
+                "ay": [9.81],
+                "fall_state": [1],
+            }
+        )
+
+        casted = apply_schema(data)
+
+        self.assertEqual(casted["timestamp_local"].dtype, object)
+        self.assertEqual(casted["ay"].dtype, np.float32)
+        self.assertEqual(casted["fall_state"].dtype, np.int8)
+
+
+if __name__ == "__main__":
+    unittest.main()
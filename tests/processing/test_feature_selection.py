@@ -0,0 +1,119 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.modelling.feature_schema import FeatureSchema
+from src.processing.feature_selection import (
+    FeatureSetSpec,
+    _labelled_sequences,
+    correlation_pruning,
+    permutation_importance,
+)
+from src.processing.motion_features import MotionFeatureCalculator
+
+
+def make_raw_data(rows: int = 50) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    timestamps = pd.date_range("2024-02-06 10:00:42", periods=rows, freq="75ms")
+    return pd.DataFrame(
+        {
+            "timestamp_local": timestamps.astype(str),
+            "ax": rng.normal(0, 1, rows),
+            "ay": rng.normal(0, 1, rows),
+            "az": rng.normal(0, 1, rows),
+            "fall_state": np.zeros(rows, dtype=int),
+        }
+    )
+
+
+class TestFeatureSelection(unittest.TestCase):
+    def test_correlation_pruning_drops_duplicate_columns(self):
+        features = MotionFeatureCalculator().calculate_all_features(
+            make_raw_data(), "timestamp_local", ["ax", "ay", "az"]
+        )
+
+        kept, dropped = correlation_pruning(features)
+
+        self.assertIn("g_force", kept)
+        self.assertIn("magnitude_acceleration", dropped)
+        self.assertIn("g_force", dropped["magnitude_acceleration"])
+
+    def test_feature_set_limits_computed_columns(self):
+        features = MotionFeatureCalculator().calculate_all_features(
+            make_raw_data(),
+            "timestamp_local",
+            ["ax", "ay", "az"],
+            feature_set=["ax", "ay", "az", "g_force"],
+        )
+
+        self.assertNotIn("vx", features.columns)
+        self.assertNotIn("angle_xy", features.columns)
+        self.assertIn("g_force", features.columns)
+        self.assertIn("jerk", features.columns)
+        self.assertIn("fall_state", features.columns)
+
+    def test_partial_feature_set_with_a_magnitude(self):
+        full = MotionFeatureCalculator().calculate_all_features(
+            make_raw_data(), "timestamp_local", ["ax", "ay", "az"]
+        )
+        for feature_set in (
+            ["ax", "magnitude_acceleration"],
+            ["ay", "magnitude_velocity"],
+            ["magnitude_displacement"],
+        ):
+            features = MotionFeatureCalculator().calculate_all_features(
+                make_raw_data(),
+                "timestamp_local",
+                ["ax", "ay", "az"],
+                feature_set=feature_set,
+            )
+
+            for column in feature_set:
+                np.testing.assert_allclose(features[column], full[column])
+            self.assertNotIn("magnitude_acceleration", set(features) - set(feature_set))
+
+    def test_spec_round_trip_and_projection(self):
+        spec = FeatureSetSpec(features=["az", "ax"], dropped={"ay": "constant"})
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "feature_set.json")
+            spec.save(path)
+            loaded = FeatureSetSpec.load(path)
+
+        self.assertEqual(loaded, spec)
+        projected = loaded.project(make_raw_data())
+        self.assertEqual(list(projected.columns), ["fall_state", "az", "ax"])
+
+    def test_permutation_importance_finds_the_informative_feature(self):
+        rng = np.random.default_rng(1)
+        labels = rng.integers(0, 2, 200)
+        sequences = rng.normal(size=(200, 5, 2)).astype(np.float32)
+        sequences[:, :, 0] = labels[:, None]
+
+        baseline, importances = permutation_importance(
+            lambda inputs: inputs[:, 0, 0], sequences, labels, ["signal", "noise"]
+        )
+
+        self.assertEqual(baseline, 1.0)
+        self.assertGreater(importances["signal"], 0.3)
+        self.assertEqual(importances["noise"], 0.0)
+
+    def test_sequences_follow_the_trained_schema(self):
+        schema = FeatureSchema(names=["ax", "jerk"], dtypes=["float64", "float64"])
+        with tempfile.TemporaryDirectory() as directory:
+            for name, content in (
+                ("fall_1.csv", "jerk,timestamp,fall_state,ay,ax\n3,0,1,2,1\n"),
+                ("non_fall_1.csv", "ax,ay,jerk,fall_state\n4,5,6,0\n"),
+                ("merged_data.csv", "ax,jerk\n7,8\n"),
+            ):
+                with open(os.path.join(directory, name), "w") as file:
+                    file.write(content)
+
+            sequences, labels, names = _labelled_sequences(directory, schema)
+
+        self.assertEqual(names, ["ax", "jerk"])
+        self.assertEqual(labels, [1, 0])
+        np.testing.assert_array_equal(sequences[0], [[1, 3]])
+        np.testing.assert_array_equal(sequences[1], [[4, 6]])
@@ -0,0 +1,85 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.processing.motion_features import (
+    MotionFeatureCalculator,
+    cumulative_trapezoid_uniform,
+)
+from src.processing.resampling import GAP_COLUMN, Resampler
+from src.processing.timestamps import device_ms_to_ns
+
+
+class TestResampler(unittest.TestCase):
+    def setUp(self):
+        self.data = pd.DataFrame(
+            {
+                "timestamp": device_ms_to_ns([0, 80, 140, 140, 600, 675]),
+                "ax": [0.0, 8.0, 14.0, 14.0, 60.0, 67.5],
+                "fall_state": [0, 0, 1, 1, 1, 0],
+            }
+        )
+
+    def test_resamples_onto_uniform_grid(self):
+        resampled = Resampler(period_ms=75).resample(self.data, "timestamp")
+
+        np.testing.assert_array_equal(
+            np.diff(resampled["timestamp"].to_numpy()), 75_000_000
+        )
+        np.testing.assert_allclose(resampled["ax"], resampled["timestamp"] / 1e7)
+
+    def test_labels_are_stepped_not_blended(self):
+        resampled = Resampler(period_ms=75).resample(self.data, "timestamp")
+
+        self.assertTrue(set(resampled["fall_state"]).issubset({0, 1}))
+        self.assertEqual(resampled["fall_state"].iloc[1], 0)
+        self.assertEqual(resampled["fall_state"].iloc[2], 1)
+
+    def test_flags_points_inside_delivery_gaps(self):
+        resampled = Resampler(period_ms=75).resample(self.data, "timestamp")
+
+        inside_gap = (resampled["timestamp"] > 140_000_000) & (
+            resampled["timestamp"] < 600_000_000
+        )
+        np.testing.assert_array_equal(resampled[GAP_COLUMN], inside_gap.astype(int))
+
+
+class TestResampledFeatures(unittest.TestCase):
+    def test_uniform_trapezoid_matches_numpy(self):
+        values = np.random.default_rng(0).normal(size=50)
+
+        expected = [np.trapz(values[: index + 1], dx=0.075) for index in range(50)]
+
+        np.testing.assert_allclose(
+            cumulative_trapezoid_uniform(values, 0.075), expected
+        )
+
+    def test_resampled_features_use_constant_step(self):
+        data = pd.DataFrame(
+            {
+                "timestamp": [
+                    "2024-02-06 10:00:42.000",
+                    "2024-02-06 10:00:42.070",
+                    "2024-02-06 10:00:42.160",
+                    "2024-02-06 10:00:42.225",
+                ],
+                "ax": [1.0, 1.0, 1.0, 1.0],
+                "ay": [0.0, 0.0, 0.0, 0.0],
+                "az": [0.0, 0.0, 0.0, 0.0],
+                "fall_state": [0, 0, 0, 0],
+            }
+        )
+
+        features = MotionFeatureCalculator().calculate_all_features(
+            data, "timestamp", ["ax", "ay", "az"], resampler=Resampler(period_ms=75)
+        )
+
+        self.assertEqual(len(features), 4)
+        self.assertTrue((features["time_interval"] == 0.075 / 1000).all())
+        np.testing.assert_allclose(features["vx"], np.arange(4) * 0.075 / 1000)
+        np.testing.assert_array_equal(features["jerk"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
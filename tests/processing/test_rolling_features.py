@@ -0,0 +1,69 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.processing.motion_features import MotionFeatureCalculator
+from src.processing.rolling_features import RollingFeatureEngine, rolling_statistics
+
+
+class TestRollingFeatures(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.data = pd.DataFrame(
+            {
+                "ax": rng.normal(0, 1, 300),
+                "ay": rng.normal(0, 1, 300),
+                "az": rng.normal(0, 1, 300),
+                "g_force": rng.gamma(2, 1, 300),
+            }
+        )
+
+    def test_matches_pandas_rolling(self):
+        values = self.data["ax"]
+
+        statistics = rolling_statistics(values.to_numpy(), 5)
+
+        window = values.rolling(5, min_periods=1)
+        np.testing.assert_allclose(statistics["mean"], window.mean())
+        np.testing.assert_allclose(statistics["std"], window.std(ddof=0), atol=1e-12)
+        np.testing.assert_allclose(statistics["min"], window.min())
+        np.testing.assert_allclose(statistics["max"], window.max())
+        np.testing.assert_allclose(
+            statistics["energy"], (values**2).rolling(5, 1).mean()
+        )
+
+    def test_counts_zero_crossings_in_window(self):
+        statistics = rolling_statistics(np.array([1.0, -1.0, -2.0, 3.0, 4.0]), 3)
+
+        np.testing.assert_array_equal(statistics["zero_crossings"], [0, 1, 1, 2, 1])
+
+    def test_stream_matches_batch(self):
+        engine = RollingFeatureEngine(windows=(4, 9))
+        batch = engine.calculate(self.data)
+
+        stream = engine.stream()
+        streamed = pd.concat(
+            [stream.process(chunk) for chunk in np.array_split(self.data, 6)]
+        )
+
+        pd.testing.assert_frame_equal(streamed, batch, atol=1e-9)
+
+    def test_opt_in_group_in_calculate_all_features(self):
+        data = self.data[["ax", "ay", "az"]].assign(
+            timestamp=pd.date_range("2024-02-06", periods=300, freq="75ms")
+            .astype(str)
+            .to_numpy()
+        )
+        engine = RollingFeatureEngine(windows=(8,))
+
+        features = MotionFeatureCalculator().calculate_all_features(
+            data, "timestamp", ["ax", "ay", "az"], rolling=engine
+        )
+
+        self.assertTrue(set(engine.columns).issubset(features.columns))
+        self.assertFalse(features[engine.columns].isna().any().any())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.processing.sequence_pipeline import SequencePipeline
+from src.processing.split_sequences import (
+    SplitSequences,
+    recording_name,
+    recording_rng,
+    split_recordings,
+)
+
+
+def raw_recording(rows: int, fall_start: int, fall_length: int, seed: int):
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range("2024-02-06 10:00:42", periods=rows, freq="75ms")
+    fall_state = np.zeros(rows, dtype=int)
+    fall_state[fall_start : fall_start + fall_length] = 1
+    return pd.DataFrame(
+        {
+            "timestamp": timestamps.astype("int64") / 1e9,
+            "timestamp_local": timestamps.astype(str),
+            "ax": rng.normal(0, 1, rows),
+            "ay": rng.normal(9.8, 1, rows),
+            "az": rng.normal(0, 1, rows),
+            "fall_state": fall_state,
+        }
+    )
+
+
+class TestSequencePipeline(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.raw = os.path.join(self.directory.name, "raw")
+        os.makedirs(self.raw)
+        raw_recording(150, 60, 20, seed=0).to_csv(
+            os.path.join(self.raw, "walk.csv"), index=False
+        )
+        raw_recording(120, 5, 30, seed=1).to_csv(
+            os.path.join(self.raw, "trip.csv"), index=False
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_pipeline(self, name: str, workers: int, debug: bool = False) -> str:
+        output = os.path.join(self.directory.name, name)
+        debug_directory = os.path.join(self.directory.name, "debug") if debug else None
+        self.summary = SequencePipeline(
+            self.raw, output, debug_directory=debug_directory, workers=workers
+        ).run()
+        return output
+
+    def test_sequences_are_named_after_their_recording(self):
+        output = self.run_pipeline("seq", workers=1)
+
+        files = sorted(os.listdir(output))
+        self.assertIn("fall_walk_1.csv", files)
+        self.assertIn("fall_trip_1.csv", files)
+        self.assertEqual(self.summary["failed"], [])
+        self.assertEqual(self.summary["fall"], 2)
+        self.assertEqual(self.summary["fall"] + self.summary["non_fall"], len(files))
+
+    def test_parallel_run_matches_serial_run(self):
+        serial = self.run_pipeline("serial", workers=1)
+        parallel = self.run_pipeline("parallel", workers=2)
+
+        self.assertEqual(sorted(os.listdir(serial)), sorted(os.listdir(parallel)))
+        for file in os.listdir(serial):
+            pd.testing.assert_frame_equal(
+                pd.read_csv(os.path.join(serial, file)),
+                pd.read_csv(os.path.join(parallel, file)),
+            )
+
+    def test_intermediates_are_debug_only(self):
+        self.run_pipeline("seq", workers=1)
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, "debug")))
+
+        self.run_pipeline("seq_debug", workers=1, debug=True)
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.directory.name, "debug"))),
+            [
+                "cleaned_trip.csv",
+                "cleaned_walk.csv",
+                "processed_trip.csv",
+                "processed_walk.csv",
+            ],
+        )
+
+
+class TestSplitSequences(unittest.TestCase):
+    def test_change_points_match_row_by_row_scan(self):
+        states = np.array([1, 1, 0, 0, 0, 1, 1, 0, 1])
+
+        row_by_row = [
+            i for i in range(1, len(states)) if states[i] != states[i - 1] or i == 1
+        ]
+
+        np.testing.assert_array_equal(
+            SplitSequences.state_change_indices(states), row_by_row
+        )
+
+    def test_recording_rng_depends_only_on_seed_and_name(self):
+        first = recording_rng(7, "walk").integers(0, 1000, 5)
+
+        np.testing.assert_array_equal(
+            first, recording_rng(7, "walk").integers(0, 1000, 5)
+        )
+        self.assertFalse(
+            np.array_equal(first, recording_rng(7, "trip").integers(0, 1000, 5))
+        )
+        self.assertEqual(recording_name("processed_walk.csv"), "walk")
+
+    def test_split_recordings_is_independent_of_worker_count(self):
+        with tempfile.TemporaryDirectory() as directory:
+            processed = os.path.join(directory, "processed")
+            os.makedirs(processed)
+            for seed, name in enumerate(["walk", "trip", "sit"]):
+                recording = raw_recording(140, 30 + 10 * seed, 15, seed)
+                recording.drop(columns=["timestamp_local"]).to_csv(
+                    os.path.join(processed, f"processed_{name}.csv"), index=False
+                )
+
+            outputs = {}
+            for workers in (1, 3):
+                output = os.path.join(directory, f"seq_{workers}")
+                split_recordings(processed, output, base_seed=3, workers=workers)
+                outputs[workers] = {
+                    file: pd.read_csv(os.path.join(output, file))
+                    for file in sorted(os.listdir(output))
+                }
+
+        self.assertEqual(list(outputs[1]), list(outputs[3]))
+        self.assertIn("fall_sit_1.csv", outputs[1])
+        for file, sequence in outputs[1].items():
+            pd.testing.assert_frame_equal(sequence, outputs[3][file])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.processing.motion_features import MotionFeatureCalculator
+from src.processing.signal_conditioning import SignalConditioner, condition_file
+
+
+class TestSignalConditioner(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        samples = 2000
+        self.data = pd.DataFrame(
+            {
+                "ax": rng.normal(0, 0.5, samples),
+                "ay": 9.81 + rng.normal(0, 0.5, samples),
+                "az": np.sin(np.arange(samples) / 10) + rng.normal(0, 0.5, samples),
+            }
+        )
+
+    def test_chunked_matches_batch(self):
+        conditioner = SignalConditioner()
+        smoothed, linear = conditioner.filter(self.data)
+
+        conditioner.reset()
+        chunks = [conditioner.process(chunk) for chunk in np.array_split(self.data, 7)]
+
+        pd.testing.assert_frame_equal(pd.concat(chunk[0] for chunk in chunks), smoothed)
+        pd.testing.assert_frame_equal(pd.concat(chunk[1] for chunk in chunks), linear)
+
+    def test_removes_gravity_and_noise(self):
+        smoothed, linear = SignalConditioner().filter(self.data)
+
+        self.assertAlmostEqual(smoothed["ay"].mean(), 9.81, delta=0.05)
+        self.assertLess(abs(linear["ay"].mean()), 0.05)
+        self.assertLess(smoothed["ax"].std(), self.data["ax"].std())
+
+    def test_condition_file_streams_chunks(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "raw.csv")
+            destination = os.path.join(directory, "conditioned.csv")
+            self.data.to_csv(source, index=False)
+
+            condition_file(source, destination, chunksize=300)
+
+            conditioned = pd.read_csv(destination)
+        _, linear = SignalConditioner().filter(self.data)
+        self.assertEqual(len(conditioned), len(self.data))
+        np.testing.assert_allclose(conditioned["linear_ay"], linear["ay"], atol=1e-9)
+
+    def test_integration_does_not_drift_with_gravity(self):
+        data = self.data.assign(
+            timestamp=pd.date_range("2024-02-06", periods=len(self.data), freq="75ms")
+            .astype(str)
+            .to_numpy(),
+        )
+
+        features = MotionFeatureCalculator().calculate_all_features(
+            data.copy(),
+            "timestamp",
+            ["ax", "ay", "az"],
+            conditioner=SignalConditioner(),
+        )
+        raw_features = MotionFeatureCalculator().calculate_all_features(
+            data.copy(), "timestamp", ["ax", "ay", "az"]
+        )
+
+        self.assertLess(features["vy"].abs().max(), raw_features["vy"].abs().max())
+
+
+if __name__ == "__main__":
+    unittest.main()
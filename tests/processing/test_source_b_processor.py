@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.processing.source_b_processor import SourceBPreprocessor, drop_columns
+
+
+class TestSourceBPreprocessor(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.input = Path(self.directory.name) / "processed"
+        self.input.mkdir()
+        rng = np.random.default_rng(0)
+        for name in ["processed_fall_b", "processed_non_fall_a", "processed_fall_a"]:
+            pd.DataFrame(
+                {
+                    "timestamp": np.arange(5) * 75_000_000,
+                    "ax": rng.normal(size=5),
+                    "time_interval": np.full(5, 0.075),
+                    "fall_state": [0, 1, 1, 0, 0],
+                }
+            ).to_csv(self.input / f"{name}.csv", index=False)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_drops_time_columns_without_reparsing(self):
+        source = self.input / "processed_fall_a.csv"
+        destination = Path(self.directory.name) / "out.csv"
+
+        drop_columns(source, destination)
+
+        expected = pd.read_csv(source, dtype=str).drop(
+            columns=["timestamp", "time_interval"]
+        )
+        pd.testing.assert_frame_equal(pd.read_csv(destination, dtype=str), expected)
+
+    def test_names_are_deterministic_under_parallelism(self):
+        output = Path(self.directory.name) / "seq"
+
+        SourceBPreprocessor(self.input, output).process_each_csv_file(workers=3)
+
+        self.assertEqual(
+            sorted(os.listdir(output)),
+            ["fall_1000.csv", "fall_1001.csv", "non_fall_1000.csv"],
+        )
+        pd.testing.assert_frame_equal(
+            pd.read_csv(output / "fall_1000.csv"),
+            pd.read_csv(self.input / "processed_fall_a.csv").drop(
+                columns=["timestamp", "time_interval"]
+            ),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
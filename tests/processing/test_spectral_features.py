@@ -0,0 +1,65 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.benchmarks.spectral_benchmark import per_window_spectra
+from src.processing.motion_features import MotionFeatureCalculator
+from src.processing.spectral_features import (
+    SpectralFeatureEngine,
+    power_spectra,
+    spectral_statistics,
+)
+
+
+class TestSpectralFeatures(unittest.TestCase):
+    def test_batched_spectra_match_per_window_loop(self):
+        values = np.random.default_rng(0).normal(size=500)
+
+        np.testing.assert_allclose(
+            power_spectra(values, 32), per_window_spectra(values, 32), atol=1e-10
+        )
+
+    def test_finds_dominant_frequency(self):
+        sample_rate = 1000 / 75
+        time = np.arange(400) / sample_rate
+        values = np.sin(2 * np.pi * 2.5 * time)
+
+        statistics = spectral_statistics(values, 32, sample_rate)
+
+        np.testing.assert_allclose(
+            statistics["dominant_frequency"][32:], 2.5, atol=sample_rate / 32
+        )
+        self.assertTrue(
+            (statistics["energy_1_3hz"][32:] > statistics["energy_3_7hz"][32:]).all()
+        )
+
+    def test_constant_signal_has_zero_entropy(self):
+        statistics = spectral_statistics(np.ones(100), 16)
+
+        np.testing.assert_array_equal(statistics["spectral_entropy"], 0.0)
+
+    def test_optional_group_in_calculate_all_features(self):
+        rng = np.random.default_rng(2)
+        data = pd.DataFrame(
+            {
+                "timestamp": pd.date_range("2024-02-06", periods=200, freq="75ms")
+                .astype(str)
+                .to_numpy(),
+                "ax": rng.normal(size=200),
+                "ay": rng.normal(size=200),
+                "az": rng.normal(size=200),
+            }
+        )
+        engine = SpectralFeatureEngine(window=16)
+
+        features = MotionFeatureCalculator().calculate_all_features(
+            data, "timestamp", ["ax", "ay", "az"], spectral=engine
+        )
+
+        self.assertEqual(len(features), 200)
+        self.assertFalse(features[engine.columns].isna().any().any())
+
+
+if __name__ == "__main__":
+    unittest.main()
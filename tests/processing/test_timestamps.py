@@ -0,0 +1,69 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.processing.motion_features import MotionFeatureCalculator
+from src.processing.timestamps import device_ms_to_ns, interval_seconds, to_epoch_ns
+
+
+class TestTimestamps(unittest.TestCase):
+    def test_parses_mixed_iso_formats(self):
+        timestamps = np.array(
+            [
+                "2024-02-06 10:00:42",
+                "2024-02-06T10:00:42.075300",
+                "2024-02-06 10:00:42.150300",
+            ],
+            dtype=object,
+        )
+
+        epoch_ns = to_epoch_ns(timestamps)
+
+        self.assertEqual(epoch_ns.dtype, np.int64)
+        np.testing.assert_array_equal(np.diff(epoch_ns), [75_300_000, 75_000_000])
+
+    def test_numeric_timestamps_need_a_unit(self):
+        with self.assertRaisesRegex(ValueError, "unit="):
+            to_epoch_ns(np.array([1707213642.43, 1707213642.50]))
+        with self.assertRaisesRegex(ValueError, "unit="):
+            to_epoch_ns(np.array([1707213642430, 1707213642505]))
+
+        # float64 seconds only resolve about a quarter of a microsecond
+        np.testing.assert_allclose(
+            to_epoch_ns(np.array([1707213642.43]), unit="s"),
+            to_epoch_ns(np.array(["2024-02-06T10:00:42.430"])),
+            rtol=0,
+            atol=1_000,
+        )
+        np.testing.assert_array_equal(
+            to_epoch_ns([1707213642430], unit="ms"), [1707213642430000000]
+        )
+        np.testing.assert_array_equal(
+            to_epoch_ns([1707213642430000000]), [1707213642430000000]
+        )
+
+    def test_interval_seconds_starts_at_zero(self):
+        epoch_ns = device_ms_to_ns([1000, 1075, 1150])
+
+        np.testing.assert_allclose(interval_seconds(epoch_ns), [0.0, 0.075, 0.075])
+
+    def test_time_interval_matches_legacy_computation(self):
+        timestamps = [
+            "2024-02-06 10:00:42.430037",
+            "2024-02-06 10:00:42.504867",
+            "2024-02-06 10:00:42.579836",
+        ]
+        legacy = (
+            pd.to_datetime(pd.Series(timestamps))
+            .diff()
+            .fillna(pd.Timedelta(seconds=0))
+            .dt.total_seconds()
+            / 1000
+        )
+        data = pd.DataFrame({"timestamp": timestamps})
+
+        MotionFeatureCalculator().calculate_time_interval(data, "timestamp", "ms")
+
+        self.assertEqual(data["timestamp"].dtype, np.int64)
+        np.testing.assert_allclose(data["time_interval"], legacy)